@@ -0,0 +1,100 @@
+package com.example.yasuwidget
+
+import android.content.Context
+import android.util.Log
+import com.example.yasuwidget.application.RefreshCoordinator
+import com.example.yasuwidget.application.RefreshEvent
+import com.example.yasuwidget.application.RefreshWidgetUseCase
+import com.example.yasuwidget.application.RenderTimelineHolder
+import com.example.yasuwidget.application.UpdatePlanner
+import com.example.yasuwidget.infrastructure.location.LocationPolicy
+import com.example.yasuwidget.infrastructure.location.LocationRepository
+import com.example.yasuwidget.infrastructure.scheduler.UpdateScheduler
+import com.example.yasuwidget.infrastructure.store.WidgetStateStore
+import com.example.yasuwidget.infrastructure.time.SystemTimeProvider
+import com.example.yasuwidget.infrastructure.time.TimeProvider
+import com.example.yasuwidget.infrastructure.timetable.TimetableCache
+import com.example.yasuwidget.infrastructure.timetable.TimetableRepository
+import com.example.yasuwidget.infrastructure.trace.AndroidTraceSections
+import com.example.yasuwidget.infrastructure.trace.TraceRecorder
+import com.example.yasuwidget.infrastructure.trace.TraceRingBuffer
+import com.example.yasuwidget.presentation.WidgetUpdater
+import kotlinx.coroutines.CoroutineScope
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.SupervisorJob
+import java.io.File
+
+/**
+ * アプリ全体で共有する依存関係
+ * 更新ごとにリポジトリ等を生成せず、プロセス生存中は同じインスタンスを使う
+ */
+class AppGraph(context: Context) {
+
+    companion object {
+        private const val TAG = "AppGraph"
+        private const val TRACE_FILE_NAME = "refresh_traces.bin"
+    }
+
+    private val appContext = context.applicationContext
+
+    /** 更新・事前読込を実行するスコープ（プロセス生存中） */
+    val scope = CoroutineScope(SupervisorJob() + Dispatchers.IO)
+
+    val timeProvider: TimeProvider = SystemTimeProvider()
+
+    val stateStore = WidgetStateStore(appContext)
+
+    /** 位置取得の方針（直近の位置の再利用・優先度の選択・タイムアウト） */
+    val locationPolicy = LocationPolicy(LocationRepository(appContext))
+
+    val scheduler = UpdateScheduler(appContext)
+
+    /** 更新ごとのトレース（段階ごとの所要時間・アラームの遅れ） */
+    val traceRecorder = TraceRecorder(
+        buffer = TraceRingBuffer(File(appContext.noBackupFilesDir, TRACE_FILE_NAME)),
+        sections = AndroidTraceSections()
+    )
+
+    /** 時刻表キャッシュ（更新ごとの読込・パースを避ける） */
+    val timetableCache = TimetableCache(TimetableRepository(appContext))
+
+    /** 先読みした描画タイムライン（毎分の更新で位置取得・時刻表参照を避ける） */
+    val renderTimeline = RenderTimelineHolder()
+
+    val refreshUseCase = RefreshWidgetUseCase(
+        timeProvider = timeProvider,
+        locationPolicy = locationPolicy,
+        timetableCache = timetableCache,
+        stateStore = stateStore,
+        timelineHolder = renderTimeline
+    )
+
+    val widgetUpdater = WidgetUpdater(
+        context = appContext,
+        timeProvider = timeProvider,
+        useCase = refreshUseCase,
+        planner = UpdatePlanner(timeProvider),
+        scheduler = scheduler,
+        stateStore = stateStore,
+        traceRecorder = traceRecorder
+    )
+
+    /** Widget更新の単一実行コーディネーター */
+    val refreshCoordinator = RefreshCoordinator(
+        scope = scope,
+        onDeadlineExceeded = { trigger ->
+            Log.w(TAG, "更新が上限時間を超えました: $trigger")
+            scheduler.scheduleNextUpdate()
+        },
+        // 合流率などを診断情報に表示するため累計を保存する
+        onEvent = { event ->
+            when (event) {
+                RefreshEvent.STARTED -> stateStore.recordRefreshStats(started = 1)
+                RefreshEvent.COALESCED -> stateStore.recordRefreshStats(coalesced = 1)
+                RefreshEvent.SUPERSEDED -> stateStore.recordRefreshStats(superseded = 1)
+                RefreshEvent.TIMED_OUT -> stateStore.recordRefreshStats(timedOut = 1)
+            }
+        },
+        refresh = widgetUpdater::update
+    )
+}
@@ -17,8 +17,19 @@ import androidx.compose.ui.text.font.FontWeight
 import androidx.compose.ui.unit.dp
 import androidx.compose.ui.unit.sp
 import androidx.core.content.ContextCompat
-import com.example.yasuwidget.infrastructure.scheduler.UpdateScheduler
+import androidx.lifecycle.lifecycleScope
+import com.example.yasuwidget.application.RefreshCoordinatorStats
+import com.example.yasuwidget.infrastructure.location.LocationPolicyStats
+import com.example.yasuwidget.infrastructure.location.LocationSource
+import com.example.yasuwidget.infrastructure.timetable.TimetableCacheStats
+import com.example.yasuwidget.infrastructure.trace.Percentiles
+import com.example.yasuwidget.infrastructure.trace.TraceStage
+import com.example.yasuwidget.infrastructure.trace.TraceSummary
 import com.example.yasuwidget.ui.theme.YasuWidgetTheme
+import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.launch
+import kotlinx.coroutines.withContext
+import java.io.IOException
 
 class MainActivity : ComponentActivity() {
 
@@ -29,6 +40,8 @@ class MainActivity : ComponentActivity() {
 
     private val permissionGranted = mutableStateOf(false)
 
+    private val diagnostics = mutableStateOf<Diagnostics?>(null)
+
     private val requestPermissionLauncher =
         registerForActivityResult(ActivityResultContracts.RequestMultiplePermissions()) { results ->
             permissionGranted.value = results.values.any { it }
@@ -50,7 +63,7 @@ class MainActivity : ComponentActivity() {
         permissionGranted.value = hasLocationPermission()
 
         // Widget更新スケジュールを開始
-        UpdateScheduler(this).scheduleNextUpdate()
+        graph().scheduler.scheduleNextUpdate()
 
         setContent {
             YasuWidgetTheme {
@@ -58,13 +71,49 @@ class MainActivity : ComponentActivity() {
                     SetupScreen(
                         modifier = Modifier.padding(innerPadding),
                         hasPermission = permissionGranted.value,
-                        onRequestPermission = { requestLocationPermission() }
+                        onRequestPermission = { requestLocationPermission() },
+                        diagnostics = diagnostics.value
                     )
                 }
             }
         }
     }
 
+    override fun onResume() {
+        super.onResume()
+        loadDiagnostics()
+    }
+
+    /**
+     * 診断情報を読み込む（トレースファイルの読込はバックグラウンドで行う）
+     */
+    private fun loadDiagnostics() {
+        val graph = graph()
+        lifecycleScope.launch {
+            diagnostics.value = withContext(Dispatchers.IO) {
+                try {
+                    Diagnostics(
+                        trace = graph.traceRecorder.summary(),
+                        timetableCache = graph.timetableCache.stats(),
+                        location = graph.locationPolicy.stats(),
+                        renderActionsSent = graph.stateStore.renderActionsSent,
+                        renderUpdatesSkipped = graph.stateStore.renderUpdatesSkipped,
+                        refresh = RefreshCoordinatorStats(
+                            started = graph.stateStore.refreshStarted,
+                            coalesced = graph.stateStore.refreshCoalesced,
+                            superseded = graph.stateStore.refreshSuperseded,
+                            timedOut = graph.stateStore.refreshTimedOut
+                        )
+                    )
+                } catch (e: IOException) {
+                    null
+                }
+            }
+        }
+    }
+
+    private fun graph(): AppGraph = (application as YasuWidgetApplication).graph
+
     private fun hasLocationPermission(): Boolean {
         return locationPermissions.any {
             ContextCompat.checkSelfPermission(this, it) == PackageManager.PERMISSION_GRANTED
@@ -85,11 +134,24 @@ class MainActivity : ComponentActivity() {
     }
 }
 
+/**
+ * 診断情報（更新の所要時間・アラームの遅れ・キャッシュ効率・位置の取得元・更新要求の合流）
+ */
+data class Diagnostics(
+    val trace: TraceSummary,
+    val timetableCache: TimetableCacheStats,
+    val location: LocationPolicyStats,
+    val renderActionsSent: Long,
+    val renderUpdatesSkipped: Long,
+    val refresh: RefreshCoordinatorStats
+)
+
 @Composable
 fun SetupScreen(
     modifier: Modifier = Modifier,
     hasPermission: Boolean,
-    onRequestPermission: () -> Unit
+    onRequestPermission: () -> Unit,
+    diagnostics: Diagnostics? = null
 ) {
     Column(
         modifier = modifier
@@ -184,5 +246,80 @@ fun SetupScreen(
                 )
             }
         }
+
+        // 診断情報
+        if (diagnostics != null) {
+            DiagnosticsCard(diagnostics)
+        }
+    }
+}
+
+/**
+ * 診断情報カード
+ * 段階ごと・全体の所要時間（p50/p95）、自動更新の遅れ、キャッシュのヒット率、位置の取得元、更新要求の合流率を表示する
+ */
+@Composable
+fun DiagnosticsCard(diagnostics: Diagnostics) {
+    val trace = diagnostics.trace
+    Card(modifier = Modifier.fillMaxWidth()) {
+        Column(modifier = Modifier.padding(16.dp)) {
+            Text(
+                text = "診断情報（直近${trace.count}回の更新）",
+                fontWeight = FontWeight.Bold,
+                fontSize = 16.sp
+            )
+            Spacer(modifier = Modifier.height(8.dp))
+
+            Text(text = "全体: ${formatMicros(trace.total)}", fontSize = 12.sp)
+            Text(text = "・失敗 ${trace.failed}回 / 打ち切り ${trace.cancelled}回", fontSize = 12.sp)
+            for (stage in TraceStage.entries) {
+                val percentiles = trace.stages[stage] ?: continue
+                Text(text = "・${stage.name.lowercase()}: ${formatMicros(percentiles)}", fontSize = 12.sp)
+            }
+
+            Spacer(modifier = Modifier.height(8.dp))
+            val drift = trace.alarmDrift
+            Text(
+                text = if (drift != null) {
+                    "自動更新の遅れ: p50 ${drift.p50} ms / p95 ${drift.p95} ms"
+                } else {
+                    "自動更新の遅れ: 記録なし"
+                },
+                fontSize = 12.sp
+            )
+
+            val cache = diagnostics.timetableCache
+            Text(
+                text = "時刻表キャッシュ: ヒット率 ${"%.1f".format(cache.hitRate * 100)}%" +
+                       "（${cache.hits}/${cache.hits + cache.misses}）",
+                fontSize = 12.sp
+            )
+            val location = diagnostics.location
+            Text(
+                text = "位置取得: 直近 ${location.sourceCounts[LocationSource.LAST_KNOWN] ?: 0L} / " +
+                       "能動 ${location.sourceCounts[LocationSource.ACTIVE] ?: 0L} / " +
+                       "保存済み ${location.sourceCounts[LocationSource.CACHED] ?: 0L} / " +
+                       "なし ${location.sourceCounts[LocationSource.NONE] ?: 0L}" +
+                       "（平均 ${"%.0f".format(location.averageLatencyMillis)} ms）",
+                fontSize = 12.sp
+            )
+            Text(
+                text = "描画: 送信アクション ${diagnostics.renderActionsSent} / " +
+                       "送信省略 ${diagnostics.renderUpdatesSkipped}",
+                fontSize = 12.sp
+            )
+            val refresh = diagnostics.refresh
+            Text(
+                text = "更新要求: 実行 ${refresh.started} / 合流 ${refresh.coalesced}" +
+                       "（${"%.1f".format(refresh.coalescedRate * 100)}%）/ " +
+                       "置き換え ${refresh.superseded} / 打ち切り ${refresh.timedOut}",
+                fontSize = 12.sp
+            )
+        }
     }
-}
\ No newline at end of file
+}
+
+private fun formatMicros(percentiles: Percentiles?): String {
+    if (percentiles == null) return "記録なし"
+    return "p50 ${"%.1f".format(percentiles.p50 / 1000.0)} ms / p95 ${"%.1f".format(percentiles.p95 / 1000.0)} ms"
+}
@@ -0,0 +1,12 @@
+package com.example.yasuwidget
+
+import android.app.Application
+
+/**
+ * アプリケーション
+ * プロセス生存中に更新をまたいで共有するオブジェクト（AppGraph）を保持する
+ */
+class YasuWidgetApplication : Application() {
+
+    val graph: AppGraph by lazy { AppGraph(this) }
+}
@@ -0,0 +1,182 @@
+package com.example.yasuwidget.application
+
+import kotlinx.coroutines.CoroutineScope
+import kotlinx.coroutines.Job
+import kotlinx.coroutines.cancelAndJoin
+import kotlinx.coroutines.launch
+import kotlinx.coroutines.withTimeoutOrNull
+
+/**
+ * Widget更新の単一実行コーディネーター（SYS-REQ-041/044）
+ *
+ * - 実行中の更新があれば、新しい要求はその更新に合流する（同時に複数の更新を走らせない）
+ * - ただし表示を初期化する要求（WIDGET_UPDATE）は、実行中の更新がすでに描画を始めていれば
+ *   その更新のあとにもう1回続けて実行する（初期化した表示が次の自動更新まで残らないように）
+ * - 手動更新は実行中の自動更新をキャンセルして置き換える（位置を取り直すため）
+ * - 1回の更新は deadlineMillis で打ち切り、onDeadlineExceeded を呼ぶ
+ *
+ * @param scope 更新を実行するスコープ（プロセス生存中）
+ * @param deadlineMillis 1回の更新の上限時間
+ * @param onDeadlineExceeded 上限時間を超えたときの処理（次回更新の再スケジュールなど）
+ * @param onEvent 要求の処理結果の通知（統計の永続化など）。ロックの外で呼ぶ
+ * @param refresh 更新処理本体
+ */
+class RefreshCoordinator(
+    private val scope: CoroutineScope,
+    private val deadlineMillis: Long = DEFAULT_DEADLINE_MILLIS,
+    private val onDeadlineExceeded: suspend (RefreshTrigger) -> Unit = {},
+    private val onEvent: (RefreshEvent) -> Unit = {},
+    private val refresh: suspend (RefreshTrigger) -> Unit
+) {
+
+    companion object {
+        /** goAsync() の猶予（約10秒）に収まる上限時間 */
+        const val DEFAULT_DEADLINE_MILLIS = 8_000L
+    }
+
+    private class InFlight(val trigger: RefreshTrigger) {
+        lateinit var job: Job
+
+        /** 更新処理を始めたか（始める前なら合流しても要求の内容は反映される） */
+        var running = false
+
+        /** このあと続けて実行する更新 */
+        var followUp: RefreshTrigger? = null
+
+        /** 続けて実行する更新もなく終わった（Job の完了前でも新しい要求は合流させない） */
+        var done = false
+    }
+
+    private val lock = Any()
+    private var inFlight: InFlight? = null
+
+    private var started = 0L
+    private var coalesced = 0L
+    private var superseded = 0L
+    private var timedOut = 0L
+
+    /**
+     * 更新を要求する
+     * @return 要求を処理する更新のJob（合流した場合は実行中の更新のJob）
+     */
+    fun request(trigger: RefreshTrigger): Job {
+        val events = ArrayList<RefreshEvent>(2)
+        val job = synchronized(lock) { requestLocked(trigger, events) }
+        events.forEach(onEvent)
+        return job
+    }
+
+    private fun requestLocked(trigger: RefreshTrigger, events: MutableList<RefreshEvent>): Job {
+        val current = inFlight?.takeIf { it.job.isActive && !it.done }
+        if (current != null) {
+            val supersedes = trigger.forceRecompute && !current.trigger.forceRecompute
+            if (!supersedes) {
+                if (trigger.resetsDisplay && current.running && current.followUp == null) {
+                    // 描画済みかもしれないので、続けてもう1回実行する
+                    current.followUp = trigger
+                    started++
+                    events.add(RefreshEvent.STARTED)
+                } else {
+                    coalesced++
+                    events.add(RefreshEvent.COALESCED)
+                }
+                return current.job
+            }
+            superseded++
+            events.add(RefreshEvent.SUPERSEDED)
+        }
+
+        started++
+        events.add(RefreshEvent.STARTED)
+        val flight = InFlight(trigger)
+        flight.job = scope.launch {
+            // 置き換えた更新の後始末（描画の途中など）を待ってから始める
+            current?.job?.cancelAndJoin()
+            var next: RefreshTrigger? = trigger
+            while (next != null) {
+                val run: RefreshTrigger = next
+                synchronized(lock) { flight.running = true }
+                runWithDeadline(run)
+                next = synchronized(lock) {
+                    flight.followUp.also {
+                        flight.followUp = null
+                        flight.done = it == null
+                    }
+                }
+            }
+        }
+        inFlight = flight
+        return flight.job
+    }
+
+    private suspend fun runWithDeadline(trigger: RefreshTrigger) {
+        val completed = withTimeoutOrNull(deadlineMillis) {
+            refresh(trigger)
+            true
+        }
+        if (completed == null) {
+            synchronized(lock) { timedOut++ }
+            onEvent(RefreshEvent.TIMED_OUT)
+            onDeadlineExceeded(trigger)
+        }
+    }
+
+    fun stats(): RefreshCoordinatorStats = synchronized(lock) {
+        RefreshCoordinatorStats(
+            started = started,
+            coalesced = coalesced,
+            superseded = superseded,
+            timedOut = timedOut
+        )
+    }
+}
+
+/**
+ * 更新の契機
+ * @property forceRecompute true なら先読み済みタイムラインを使わない
+ * @property resetsDisplay true なら要求の前に表示を初期化している（描画を始めた更新には合流しない）
+ */
+enum class RefreshTrigger(val forceRecompute: Boolean, val resetsDisplay: Boolean = false) {
+    /** AlarmManager による自動更新 */
+    SCHEDULED(false),
+    /** Widgetの追加・再起動などによる onUpdate（「読込中…」に初期化している） */
+    WIDGET_UPDATE(false, resetsDisplay = true),
+    /** 更新ボタン */
+    MANUAL(true)
+}
+
+/**
+ * 更新要求の処理結果
+ */
+enum class RefreshEvent {
+    /** 新しい更新を開始した（実行中の更新のあとに続けて実行する場合を含む） */
+    STARTED,
+    /** 実行中の更新に合流した */
+    COALESCED,
+    /** 手動更新で実行中の更新を置き換えた（続けて STARTED も通知する） */
+    SUPERSEDED,
+    /** 更新を上限時間で打ち切った */
+    TIMED_OUT
+}
+
+/**
+ * 更新コーディネーターの統計
+ *
+ * @property started 実行を開始した更新の回数
+ * @property coalesced 実行中の更新に合流した要求の回数
+ * @property superseded 手動更新で置き換えた更新の回数
+ * @property timedOut 上限時間で打ち切った更新の回数
+ */
+data class RefreshCoordinatorStats(
+    val started: Long,
+    val coalesced: Long,
+    val superseded: Long,
+    val timedOut: Long
+) {
+    /** 要求のうち実行中の更新に合流した割合（要求がなければ0） */
+    val coalescedRate: Double
+        get() {
+            val requests = started + coalesced
+            return if (requests == 0L) 0.0 else coalesced.toDouble() / requests
+        }
+}
@@ -3,126 +3,156 @@ package com.example.yasuwidget.application
 import com.example.yasuwidget.domain.constants.LocationConstants
 import com.example.yasuwidget.domain.model.*
 import com.example.yasuwidget.domain.service.*
-import com.example.yasuwidget.infrastructure.location.LocationRepository
-import com.example.yasuwidget.infrastructure.store.WidgetStateStore
+import com.example.yasuwidget.infrastructure.location.LocationPolicy
+import com.example.yasuwidget.infrastructure.store.RefreshStateStore
 import com.example.yasuwidget.infrastructure.time.TimeProvider
+import com.example.yasuwidget.infrastructure.trace.StageTimer
+import com.example.yasuwidget.infrastructure.trace.TraceStage
+import com.example.yasuwidget.infrastructure.timetable.TimetableCache
 import com.example.yasuwidget.infrastructure.timetable.TimetableParseException
-import com.example.yasuwidget.infrastructure.timetable.TimetableRepository
+import java.time.LocalDateTime
 import java.time.format.DateTimeFormatter
+import java.time.temporal.ChronoUnit
 
 /**
  * Widget更新ユースケース（SYS-REQ-040〜044, NFR-001）
  *
  * 更新フロー:
  * 1. 現在時刻取得
- * 2. 位置取得（失敗ならキャッシュフォールバック）
- * 3. JSON読込・バリデーション（失敗なら「データ未登録」）
- * 4. ドメイン判定（モード/方向/駅/曜日）
- * 5. 次便抽出
- * 6. WidgetUiState構築
+ * 2. 先読み済みタイムラインが有効ならその分のスナップショットを返す
+ * 3. 位置取得（LocationPolicy: 判定に足りる最も安い方法、失敗ならキャッシュフォールバック）
+ * 4. 時刻表読込・バリデーション（失敗なら「データ未登録」）
+ * 5. ドメイン判定（モード/方向/駅/曜日）
+ * 6. 先読み範囲の各分について次便抽出・WidgetUiState構築
  * 7. 永続化
+ *
+ * タイムラインは先読み範囲切れ・一定距離以上の移動・固定駅の変更・時刻表の変更で作り直す。
  */
 class RefreshWidgetUseCase(
     private val timeProvider: TimeProvider,
-    private val locationRepository: LocationRepository,
-    private val timetableRepository: TimetableRepository,
-    private val stateStore: WidgetStateStore
+    private val locationPolicy: LocationPolicy,
+    private val timetableCache: TimetableCache,
+    private val stateStore: RefreshStateStore,
+    private val timelineHolder: RenderTimelineHolder
 ) {
 
     companion object {
         private const val TRAIN_COUNT_PER_DIRECTION = 3
         private const val BUS_COUNT = 3
         private val TIME_DISPLAY_FORMATTER = DateTimeFormatter.ofPattern("HH:mm")
+
+        /** タイムラインの先読み範囲（分） */
+        const val TIMELINE_HORIZON_MINUTES = 60
+
+        /** タイムラインを作り直す移動距離（メートル） */
+        const val TIMELINE_MOVE_THRESHOLD_METERS = 200.0
     }
 
+    /** 表示対象の駅・路線（タイムライン構築中は固定） */
+    private class TrainTarget(val stationName: String, val lineTimetable: LineTimetable)
+
+    /** 表示対象のバス方向（タイムライン構築中は固定） */
+    private class BusTarget(
+        val direction: BusDirection,
+        val busStopName: String,
+        val timetable: DirectionTimetable
+    )
+
     /**
      * Widget更新処理を実行する
      * NFR-001: 例外は捕捉しクラッシュさせない
      *
+     * @param forceRecompute true なら先読み済みタイムラインを使わず作り直す（手動更新）
+     * @param timer 段階ごとの所要時間の計測
      * @return 構築された WidgetUiState
      */
-    suspend fun execute(): WidgetUiState {
+    suspend fun execute(forceRecompute: Boolean = false, timer: StageTimer = StageTimer()): WidgetUiState {
         val now = timeProvider.now()
-        val currentDate = now.toLocalDate()
-        val currentTime = now.toLocalTime()
         val currentEpochMillis = timeProvider.currentEpochMillis()
 
-        // 1. 位置取得（SYS-REQ-042: 失敗時はキャッシュ）
-        var locationFailed = false
-        var currentLocation: GeoPoint? = try {
-            locationRepository.getCurrentLocation()
-        } catch (e: Exception) {
-            null
+        // 1. 先読み済みタイムライン（位置取得・時刻表参照なし）
+        if (!forceRecompute) {
+            val snapshot = timer.measureSuspending(TraceStage.TIMELINE) {
+                timelineHolder.current?.let { reusableSnapshot(it, now) }
+            }
+            if (snapshot != null) {
+                stateStore.lastUpdatedAtEpochMillis = currentEpochMillis
+                return snapshot
+            }
         }
+        timelineHolder.current = null
 
-        if (currentLocation != null) {
-            stateStore.cacheLocation(currentLocation.latitude, currentLocation.longitude)
-        } else {
-            // キャッシュからフォールバック
-            val cachedLat = stateStore.getCachedLatitude()
-            val cachedLon = stateStore.getCachedLongitude()
-            if (cachedLat != null && cachedLon != null) {
-                currentLocation = GeoPoint(cachedLat, cachedLon)
-            }
-            locationFailed = true
+        // 2. 位置取得（SYS-REQ-042: 失敗時はキャッシュ）
+        // 固定駅なら最寄り駅の判定は不要なので、その分だけ粗い位置で足りる
+        val location = timer.measureSuspending(TraceStage.LOCATION) {
+            locationPolicy.acquire(
+                stations = if (stateStore.pinnedStationId != null) emptyList() else LocationConstants.TOKAIDO_STATIONS,
+                fallback = { recentCachedLocation(currentEpochMillis) }
+            )
+        }
+        val currentLocation = location.point
+        val locationFailed = !location.isFresh
+        if (currentLocation != null && location.isFresh) {
+            stateStore.cacheLocation(currentLocation.latitude, currentLocation.longitude, currentEpochMillis)
         }
 
-        // 2. 時刻表読込（SYS-REQ-043: データ欠損時は「データ未登録」）
-        val trainTimetable: TrainTimetable?
+        // 3. 時刻表読込（SYS-REQ-043: データ欠損時は「データ未登録」）
+        val trainStationIds: Set<String>?
         val busTimetable: BusTimetable?
+        val timetableStamp: Long
         var dataError = false
 
         try {
-            trainTimetable = timetableRepository.loadTrainTimetable()
-            busTimetable = timetableRepository.loadBusTimetable()
+            trainStationIds = timer.measure(TraceStage.TIMETABLE) { timetableCache.trainStationIds() }
+            busTimetable = timer.measure(TraceStage.TIMETABLE) { timetableCache.busTimetable() }
+            timetableStamp = timer.measure(TraceStage.TIMETABLE) { timetableCache.sourceStamp() }
         } catch (e: TimetableParseException) {
             return buildErrorState(
-                currentTime = currentTime,
+                currentTime = now.toLocalTime(),
                 statusMessage = "データ未登録",
                 locationFailed = locationFailed
             )
         }
 
-        // 3. ドメイン判定
+        // 4. ドメイン判定
         val displayMode = if (currentLocation != null) {
             DisplayModeResolver.resolve(currentLocation)
         } else {
             DisplayMode.TRAIN_ONLY
         }
 
-        val serviceDay = ServiceDayResolver.resolve(currentDate)
-
-        // 4. 電車セクション構築
-        var trainSection: TrainSection? = null
+        // 5. 電車の対象駅
+        var trainTarget: TrainTarget? = null
         if (displayMode == DisplayMode.TRAIN_ONLY || displayMode == DisplayMode.TRAIN_AND_BUS) {
-            if (trainTimetable == null || trainTimetable.stations.isEmpty()) {
+            if (trainStationIds == null || trainStationIds.isEmpty()) {
                 dataError = true
             } else {
-                trainSection = buildTrainSection(
-                    trainTimetable, currentLocation, serviceDay, currentTime
-                )
+                trainTarget = try {
+                    timer.measure(TraceStage.RESOLVE) { resolveTrainTarget(trainStationIds, currentLocation) }
+                } catch (e: TimetableParseException) {
+                    dataError = true
+                    null
+                }
             }
         }
 
-        // 5. バスセクション構築（全モードで常に表示）
-        var busSection: BusSection? = null
+        // 6. バスの対象方向（全モードで常に表示）
+        var busTarget: BusTarget? = null
         if (busTimetable == null) {
             dataError = true
         } else {
-            busSection = buildBusSection(
-                busTimetable, currentLocation, serviceDay, currentTime
-            )
+            busTarget = timer.measure(TraceStage.RESOLVE) { resolveBusTarget(busTimetable, currentLocation) }
         }
 
-        // 6. ステータスメッセージ
+        // 7. ステータスメッセージ
         val statusMessage = when {
             dataError -> "データ未登録"
             locationFailed -> "位置取得不可"
             else -> null
         }
 
-        // 7. ヘッダー構築
-        val stationName = trainSection?.stationName ?: ""
+        // 8. ヘッダー構築
+        val stationName = trainTarget?.stationName ?: ""
         val headerTitle = if (currentLocation != null) {
             val distToMurata = GeoUtils.distanceMeters(currentLocation, LocationConstants.MURATA_YASU)
             if (distToMurata <= LocationConstants.MURATA_RADIUS_METERS) {
@@ -134,34 +164,117 @@ class RefreshWidgetUseCase(
             if (stationName.isNotEmpty()) "最寄:${stationName}駅" else ""
         }
 
-        val lastUpdatedAtText = "更新 ${currentTime.format(TIME_DISPLAY_FORMATTER)}"
-
-        val uiState = WidgetUiState(
-            mode = displayMode,
-            headerTitle = headerTitle,
-            train = trainSection,
-            bus = busSection,
-            lastUpdatedAtText = lastUpdatedAtText,
-            statusMessage = statusMessage,
-            currentTime = currentTime
+        // 9. 先読み範囲の各分のスナップショット
+        // 分の境界ちょうどに発車した便はその分の間は発車済みとして扱う（UpdatePlannerと同じ）
+        val startsAt = now.truncatedTo(ChronoUnit.MINUTES)
+        val snapshots = timer.measure(TraceStage.SELECT) {
+            List(TIMELINE_HORIZON_MINUTES) { offset ->
+                val at = startsAt.plusMinutes(offset.toLong())
+                    .plusSeconds(UpdatePlanner.BOUNDARY_OFFSET_SECONDS)
+                val currentTime = at.toLocalTime()
+                WidgetUiState(
+                    mode = displayMode,
+                    headerTitle = headerTitle,
+                    train = trainTarget?.let { buildTrainSection(it, at) },
+                    bus = busTarget?.let { buildBusSection(it, at) },
+                    lastUpdatedAtText = "更新 ${currentTime.format(TIME_DISPLAY_FORMATTER)}",
+                    statusMessage = statusMessage,
+                    currentTime = currentTime
+                )
+            }
+        }
+        val timeline = RenderTimeline(
+            startsAt = startsAt,
+            snapshots = snapshots,
+            anchorLocation = currentLocation,
+            pinnedStationId = stateStore.pinnedStationId,
+            timetableStamp = timetableStamp
         )
 
-        // 8. 永続化
+        // 位置取得・データに失敗した場合は次回も作り直して再取得する
+        if (statusMessage == null) {
+            timelineHolder.current = timeline
+        }
+
+        // 10. 永続化
         stateStore.lastUpdatedAtEpochMillis = currentEpochMillis
 
-        return uiState
+        return snapshots.first()
+    }
+
+    /**
+     * 時刻表キャッシュを事前に読み込む（Widget追加時）
+     * 固定駅、なければキャッシュ位置の最寄り駅を対象にする
+     *
+     * @throws TimetableParseException パース失敗時
+     */
+    fun warmUpTimetables() {
+        val stationIds = timetableCache.trainStationIds() ?: return
+        val station = TrainStationResolver.resolve(
+            pinnedStationId = stateStore.pinnedStationId,
+            currentLocation = cachedLocation(),
+            availableStations = availableStations(stationIds)
+        )
+        timetableCache.warmUp(listOfNotNull(station?.id))
+    }
+
+    private fun cachedLocation(): GeoPoint? {
+        val cachedLat = stateStore.getCachedLatitude()
+        val cachedLon = stateStore.getCachedLongitude()
+        return if (cachedLat != null && cachedLon != null) GeoPoint(cachedLat, cachedLon) else null
+    }
+
+    /**
+     * 位置取得に失敗したときに使うキャッシュ位置
+     * 古い位置（LocationPolicy.MAX_FALLBACK_AGE_MILLIS 超・保存時刻なし）は現在地とみなさない
+     */
+    private fun recentCachedLocation(currentEpochMillis: Long): GeoPoint? {
+        val cachedAt = stateStore.getCachedAtEpochMillis() ?: return null
+        if (currentEpochMillis - cachedAt > LocationPolicy.MAX_FALLBACK_AGE_MILLIS) return null
+        return cachedLocation()
+    }
+
+    /** 利用可能な駅一覧（時刻表にある駅のみ） */
+    private fun availableStations(stationIds: Set<String>): List<StationInfo> {
+        return LocationConstants.TOKAIDO_STATIONS.filter { it.id in stationIds }
     }
 
-    private fun buildTrainSection(
-        timetable: TrainTimetable,
-        currentLocation: GeoPoint?,
-        serviceDay: ServiceDay,
-        currentTime: java.time.LocalTime
-    ): TrainSection? {
-        // 利用可能な駅一覧（時刻表にある駅のみ）
-        val availableStations = LocationConstants.TOKAIDO_STATIONS.filter {
-            timetable.stations.containsKey(it.id)
+    /**
+     * タイムラインを再利用できるならその分のスナップショットを返す
+     * @return WidgetUiState または null（作り直しが必要）
+     */
+    private suspend fun reusableSnapshot(timeline: RenderTimeline, now: LocalDateTime): WidgetUiState? {
+        // 先読み範囲切れ
+        val snapshot = timeline.snapshotAt(now) ?: return null
+        // 固定駅の変更
+        if (stateStore.pinnedStationId != timeline.pinnedStationId) return null
+        // 時刻表の変更
+        val stamp = try {
+            timetableCache.sourceStamp()
+        } catch (e: Exception) {
+            return null
         }
+        if (stamp != timeline.timetableStamp) return null
+        // 一定距離以上の移動
+        if (hasMovedFrom(timeline.anchorLocation)) return null
+        return snapshot
+    }
+
+    /**
+     * システムが保持する直近の位置で移動を判定する（GPSは起動しない）
+     * 直近の位置がなければ移動なしとみなし、先読み範囲切れで作り直す
+     */
+    private suspend fun hasMovedFrom(anchor: GeoPoint?): Boolean {
+        val lastKnown = locationPolicy.lastKnownPoint() ?: return false
+        if (anchor == null) return true
+        return GeoUtils.distanceMeters(anchor, lastKnown) > TIMELINE_MOVE_THRESHOLD_METERS
+    }
+
+    private fun resolveTrainTarget(
+        stationIds: Set<String>,
+        currentLocation: GeoPoint?
+    ): TrainTarget? {
+        val availableStations = availableStations(stationIds)
         if (availableStations.isEmpty()) return null
 
         val station = TrainStationResolver.resolve(
@@ -170,31 +283,35 @@ class RefreshWidgetUseCase(
             availableStations = availableStations
         ) ?: return null
 
-        val stationTimetable = timetable.stations[station.id] ?: return null
+        // 選択した1駅分だけを参照する
+        val stationTimetable = timetableCache.trainStation(station.id) ?: return null
         // v1ではTokaido線のみ
         val lineTimetable = stationTimetable.lines.values.firstOrNull() ?: return null
 
-        val upDepartures = NextDeparturesSelector.select(
-            lineTimetable.up, serviceDay, currentTime, TRAIN_COUNT_PER_DIRECTION
+        return TrainTarget(station.displayName, lineTimetable)
+    }
+
+    private fun buildTrainSection(target: TrainTarget, at: LocalDateTime): TrainSection {
+        // 深夜は0時台の便、終電後は翌運行日の始発まで表示する
+        val upDepartures = NextDeparturesSelector.selectAcrossServiceDays(
+            target.lineTimetable.up, at, TRAIN_COUNT_PER_DIRECTION
         )
-        val downDepartures = NextDeparturesSelector.select(
-            lineTimetable.down, serviceDay, currentTime, TRAIN_COUNT_PER_DIRECTION
+        val downDepartures = NextDeparturesSelector.selectAcrossServiceDays(
+            target.lineTimetable.down, at, TRAIN_COUNT_PER_DIRECTION
         )
 
         return TrainSection(
-            stationName = station.displayName,
-            lineName = lineTimetable.name,
+            stationName = target.stationName,
+            lineName = target.lineTimetable.name,
             up = upDepartures,
             down = downDepartures
         )
     }
 
-    private fun buildBusSection(
+    private fun resolveBusTarget(
         busTimetable: BusTimetable,
-        currentLocation: GeoPoint?,
-        serviceDay: ServiceDay,
-        currentTime: java.time.LocalTime
-    ): BusSection? {
+        currentLocation: GeoPoint?
+    ): BusTarget {
         val direction = if (currentLocation != null) {
             BusDirectionResolver.resolve(currentLocation)
         } else {
@@ -211,19 +328,23 @@ class RefreshWidgetUseCase(
             BusDirection.TO_MURATA -> "野洲駅発"
         }
 
+        return BusTarget(direction, busStopName, directionTimetable)
+    }
+
+    private fun buildBusSection(target: BusTarget, at: LocalDateTime): BusSection {
         // 全便を発時間順に統合し、行き先/発車場所ラベルを付与
-        val allDepartures = NextDeparturesSelector.select(
-            directionTimetable, serviceDay, currentTime, BUS_COUNT
+        val allDepartures = NextDeparturesSelector.selectAcrossServiceDays(
+            target.timetable, at, BUS_COUNT
         )
         val busDepartures = allDepartures.map { dep ->
             BusDeparture(
                 departure = dep,
-                label = toBusLabel(dep, direction)
+                label = toBusLabel(dep, target.direction)
             )
         }
 
         return BusSection(
-            busStopName = busStopName,
+            busStopName = target.busStopName,
             departures = busDepartures
         )
     }
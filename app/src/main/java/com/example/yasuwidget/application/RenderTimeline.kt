@@ -0,0 +1,48 @@
+package com.example.yasuwidget.application
+
+import com.example.yasuwidget.domain.model.GeoPoint
+import com.example.yasuwidget.domain.model.WidgetUiState
+import java.time.LocalDateTime
+import java.time.temporal.ChronoUnit
+
+/**
+ * 先読みした描画タイムライン（SYS-REQ-041）
+ *
+ * startsAt から1分ごとの WidgetUiState を保持する。
+ * 毎分の更新は該当する分のスナップショットを引くだけにし、
+ * 位置取得・時刻表参照は作り直すときだけ行う。
+ *
+ * @property startsAt 先頭スナップショットの分（秒以下は0）
+ * @property snapshots 1分ごとの表示状態
+ * @property anchorLocation 構築時に使った位置（なければnull）
+ * @property pinnedStationId 構築時の固定駅ID
+ * @property timetableStamp 構築時の時刻表の同一性
+ */
+data class RenderTimeline(
+    val startsAt: LocalDateTime,
+    val snapshots: List<WidgetUiState>,
+    val anchorLocation: GeoPoint?,
+    val pinnedStationId: String?,
+    val timetableStamp: Long
+) {
+    /** 先読み範囲の終端（この分以降はスナップショットがない） */
+    val endsAt: LocalDateTime
+        get() = startsAt.plusMinutes(snapshots.size.toLong())
+
+    /**
+     * 指定時刻を含む分のスナップショット
+     * @return WidgetUiState または null（先読み範囲外）
+     */
+    fun snapshotAt(time: LocalDateTime): WidgetUiState? {
+        if (time < startsAt || time >= endsAt) return null
+        return snapshots[ChronoUnit.MINUTES.between(startsAt, time).toInt()]
+    }
+}
+
+/**
+ * プロセス内で共有するタイムラインの保持先
+ */
+class RenderTimelineHolder {
+    @Volatile
+    var current: RenderTimeline? = null
+}
@@ -0,0 +1,140 @@
+package com.example.yasuwidget.application
+
+import com.example.yasuwidget.domain.model.DepartureIndex
+import com.example.yasuwidget.domain.model.WidgetUiState
+import com.example.yasuwidget.infrastructure.time.TimeProvider
+import java.time.Duration
+import java.time.LocalDateTime
+import java.time.LocalTime
+import java.time.temporal.ChronoUnit
+
+/**
+ * 次回更新時刻の計画（SYS-REQ-041）
+ *
+ * 表示内容が次に変わる時刻を求め、その時刻に更新する:
+ * - 表示中の便が発車して一覧から外れる
+ * - 直近の便が近いとき（NEAR_DEPARTURE_MINUTES 以内）は「N分後」が毎分変わる
+ * - 直近の便が遠いときは、その便が近づくまで SPARSE_INTERVAL_MINUTES ごとの疎な更新にする
+ * - 運行日の切り替わり（3:00）
+ *
+ * 表示中の便は次便抽出の結果（終電後は翌朝の始発を含む）なので、
+ * 始発までの間も始発が近づいた時点から毎分更新に戻る。
+ *
+ * 位置取得・時刻表読込に失敗した状態（statusMessage あり）は、表示内容に関係なく次の分に再試行する。
+ */
+class UpdatePlanner(private val timeProvider: TimeProvider) {
+
+    companion object {
+        /** 直近の便がこの分数以内なら毎分更新する */
+        const val NEAR_DEPARTURE_MINUTES = 15L
+
+        /** 直近の便が遠いときの最大更新間隔（位置の変化もこの間隔で拾う） */
+        const val SPARSE_INTERVAL_MINUTES = 10L
+
+        /** 比較対象の固定ループの更新間隔 */
+        const val FIXED_INTERVAL_MILLIS = 60_000L
+
+        /** 分の境界ちょうどに発車した便が確実に一覧から外れるよう、境界から少し遅らせる */
+        const val BOUNDARY_OFFSET_SECONDS = 1L
+    }
+
+    /**
+     * 表示中の状態から次回の更新を計画する
+     */
+    fun planNext(state: WidgetUiState): UpdatePlan {
+        val now = timeProvider.now()
+        val currentMinute = now.truncatedTo(ChronoUnit.MINUTES)
+        val nextMinute = currentMinute.plusMinutes(1)
+
+        if (state.statusMessage != null) {
+            return planAt(now, nextMinute, UpdateReason.RETRY)
+        }
+
+        val departureTimes = buildList {
+            state.train?.let { train ->
+                train.up.forEach { add(it.time) }
+                train.down.forEach { add(it.time) }
+            }
+            state.bus?.departures?.forEach { add(it.departure.time) }
+        }.map { toUpcomingDateTime(currentMinute, it) }
+
+        val candidates = mutableListOf(
+            currentMinute.plusMinutes(SPARSE_INTERVAL_MINUTES) to UpdateReason.SPARSE,
+            nextServiceDayStart(now) to UpdateReason.SERVICE_DAY_ROLLOVER
+        )
+        // 発車した便は一覧から外れる
+        departureTimes.forEach { candidates.add(it to UpdateReason.DEPARTURE_DROP) }
+
+        departureTimes.minOrNull()?.let { nearest ->
+            val nearWindowStart = nearest.minusMinutes(NEAR_DEPARTURE_MINUTES)
+            if (nearWindowStart <= currentMinute) {
+                candidates.add(nextMinute to UpdateReason.COUNTDOWN)
+            } else {
+                candidates.add(nearWindowStart to UpdateReason.NEAR_DEPARTURE)
+            }
+        }
+
+        val (boundary, reason) = candidates
+            .map { (at, reason) -> maxOf(at, nextMinute) to reason }
+            .minBy { it.first }
+        return planAt(now, boundary, reason)
+    }
+
+    private fun planAt(now: LocalDateTime, boundary: LocalDateTime, reason: UpdateReason): UpdatePlan {
+        val triggerAt = boundary.plusSeconds(BOUNDARY_OFFSET_SECONDS)
+        return UpdatePlan(
+            triggerAt = triggerAt,
+            delayMillis = Duration.between(now, triggerAt).toMillis(),
+            reason = reason
+        )
+    }
+
+    /**
+     * 発車時刻を現在以降の日時に変換する（現在より前の時刻は翌日の便）
+     */
+    private fun toUpcomingDateTime(currentMinute: LocalDateTime, time: LocalTime): LocalDateTime {
+        val sameDay = currentMinute.toLocalDate().atTime(time)
+        return if (sameDay < currentMinute) sameDay.plusDays(1) else sameDay
+    }
+
+    private fun nextServiceDayStart(now: LocalDateTime): LocalDateTime {
+        val startTime = LocalTime.ofSecondOfDay(DepartureIndex.SERVICE_DAY_START_MINUTE * 60L)
+        val today = now.toLocalDate().atTime(startTime)
+        return if (today > now) today else today.plusDays(1)
+    }
+}
+
+/**
+ * 次回更新の計画
+ *
+ * @property triggerAt 更新時刻
+ * @property delayMillis 現在から更新時刻までの待ち時間
+ * @property reason 更新時刻を決めた理由
+ */
+data class UpdatePlan(
+    val triggerAt: LocalDateTime,
+    val delayMillis: Long,
+    val reason: UpdateReason
+) {
+    /** 60秒固定ループと比べて省略できる起床回数 */
+    val wakeupsAvoided: Int
+        get() = maxOf(delayMillis / UpdatePlanner.FIXED_INTERVAL_MILLIS - 1, 0L).toInt()
+}
+
+/**
+ * 次回更新時刻を決めた理由
+ */
+enum class UpdateReason {
+    /** 位置取得・時刻表読込に失敗したため次の分に再試行する */
+    RETRY,
+    /** 直近の便が近く「N分後」が毎分変わる */
+    COUNTDOWN,
+    /** 表示中の便が発車して一覧から外れる */
+    DEPARTURE_DROP,
+    /** 直近の便が毎分更新の範囲に入る */
+    NEAR_DEPARTURE,
+    /** 運行日が切り替わる */
+    SERVICE_DAY_ROLLOVER,
+    /** 表示内容が当面変わらないため疎に更新する */
+    SPARSE
+}
@@ -0,0 +1,127 @@
+package com.example.yasuwidget.domain.model
+
+import java.time.LocalDate
+import java.time.LocalDateTime
+import java.time.LocalTime
+
+/**
+ * 1方向・1曜日種別分の発車インデックス（列指向）
+ *
+ * - 発車時刻は「運行日基準の分」で昇順に保持する
+ *   （SERVICE_DAY_START_MINUTE より前の深夜便は前日の運行日の続きとして +24時間する）
+ * - 行先/種別/経由は文字列表の索引で保持する
+ * - 次便の検索は二分探索で行い、結果のN件以外は割り当てない
+ */
+class DepartureIndex private constructor(
+    private val serviceMinutes: IntArray,
+    private val destinationIds: IntArray,
+    private val typeIds: IntArray,
+    private val viaIds: IntArray,
+    private val strings: Array<String>
+) {
+
+    companion object {
+        const val MINUTES_PER_DAY = 24 * 60
+
+        /** 運行日の区切り（3:00）。これより前の便・時刻は前日の運行日に属する */
+        const val SERVICE_DAY_START_MINUTE = 3 * 60
+
+        private const val NANOS_PER_MINUTE = 60_000_000_000L
+
+        /**
+         * 発車一覧からインデックスを構築する（入力の並び順は問わない）
+         */
+        fun build(departures: List<Departure>): DepartureIndex {
+            val order = departures.indices.sortedBy { toServiceMinute(departures[it].time) }
+            val stringIds = HashMap<String, Int>()
+            fun intern(value: String): Int = stringIds.getOrPut(value) { stringIds.size }
+
+            val serviceMinutes = IntArray(order.size)
+            val destinationIds = IntArray(order.size)
+            val typeIds = IntArray(order.size)
+            val viaIds = IntArray(order.size)
+            for ((i, source) in order.withIndex()) {
+                val departure = departures[source]
+                serviceMinutes[i] = toServiceMinute(departure.time)
+                destinationIds[i] = intern(departure.destination)
+                typeIds[i] = intern(departure.trainType)
+                viaIds[i] = intern(departure.via)
+            }
+
+            val strings = Array(stringIds.size) { "" }
+            stringIds.forEach { (value, id) -> strings[id] = value }
+            return DepartureIndex(serviceMinutes, destinationIds, typeIds, viaIds, strings)
+        }
+
+        /**
+         * 時刻を運行日基準の分に変換する（秒以下は切り捨て）
+         */
+        fun toServiceMinute(time: LocalTime): Int {
+            val minute = time.hour * 60 + time.minute
+            return if (minute < SERVICE_DAY_START_MINUTE) minute + MINUTES_PER_DAY else minute
+        }
+
+        /**
+         * 現在時刻以降に発車する便の下限となる運行日基準の分（秒以下は切り上げ）
+         * 例: 7:12:30 では 7:12 発は既に発車済みなので 7:13 を返す
+         */
+        fun ceilServiceMinute(time: LocalTime): Int {
+            val minute = ((time.toNanoOfDay() + NANOS_PER_MINUTE - 1) / NANOS_PER_MINUTE).toInt()
+            val isBeforeServiceDayStart = time.hour * 60 + time.minute < SERVICE_DAY_START_MINUTE
+            return if (isBeforeServiceDayStart) minute + MINUTES_PER_DAY else minute
+        }
+
+        /**
+         * 日時が属する運行日（3:00 より前は前日）
+         */
+        fun serviceDateOf(dateTime: LocalDateTime): LocalDate {
+            val minute = dateTime.hour * 60 + dateTime.minute
+            return if (minute < SERVICE_DAY_START_MINUTE) {
+                dateTime.toLocalDate().minusDays(1)
+            } else {
+                dateTime.toLocalDate()
+            }
+        }
+    }
+
+    val size: Int get() = serviceMinutes.size
+
+    /**
+     * 運行日基準の分が serviceMinute 以上となる最初の位置（なければ size）
+     */
+    fun firstIndexAtOrAfter(serviceMinute: Int): Int {
+        var low = 0
+        var high = serviceMinutes.size
+        while (low < high) {
+            val mid = (low + high) ushr 1
+            if (serviceMinutes[mid] < serviceMinute) low = mid + 1 else high = mid
+        }
+        return low
+    }
+
+    /** 指定位置の運行日基準の分 */
+    fun serviceMinuteAt(position: Int): Int = serviceMinutes[position]
+
+    /** 指定位置の発車情報 */
+    fun departureAt(position: Int): Departure {
+        val minuteOfDay = serviceMinutes[position] % MINUTES_PER_DAY
+        return Departure(
+            time = LocalTime.of(minuteOfDay / 60, minuteOfDay % 60),
+            destination = strings[destinationIds[position]],
+            trainType = strings[typeIds[position]],
+            via = strings[viaIds[position]]
+        )
+    }
+
+    /**
+     * position 以降の便を最大 count 本 out に追加する
+     * @return 追加した本数
+     */
+    fun collectFrom(position: Int, count: Int, out: MutableList<Departure>): Int {
+        val end = minOf(position + count, serviceMinutes.size)
+        for (i in position until end) {
+            out.add(departureAt(i))
+        }
+        return maxOf(end - position, 0)
+    }
+}
@@ -21,4 +21,16 @@ data class LineTimetable(
 data class DirectionTimetable(
     val weekday: List<Departure>,
     val holiday: List<Departure>
-)
+) {
+    // 初回参照時に1度だけ構築し、以降の次便抽出で使い回す
+    private val weekdayIndex: DepartureIndex by lazy { DepartureIndex.build(weekday) }
+    private val holidayIndex: DepartureIndex by lazy { DepartureIndex.build(holiday) }
+
+    /**
+     * 曜日種別に対応する発車インデックス
+     */
+    fun index(serviceDay: ServiceDay): DepartureIndex = when (serviceDay) {
+        ServiceDay.WEEKDAY -> weekdayIndex
+        ServiceDay.HOLIDAY -> holidayIndex
+    }
+}
@@ -0,0 +1,48 @@
+package com.example.yasuwidget.domain.service
+
+import com.example.yasuwidget.domain.constants.LocationConstants
+import com.example.yasuwidget.domain.model.GeoPoint
+import com.example.yasuwidget.domain.model.StationInfo
+import kotlin.math.abs
+import kotlin.math.min
+
+/**
+ * 判定境界までの余裕距離（SYS-REQ-010/011/020/030）
+ *
+ * 現在地がこの距離未満しか動かなければ、表示モード・バス方向・最寄り駅の判定は変わらない。
+ * - 村田2km・野洲1kmの円の境界までの距離
+ * - 最寄り駅と2番目に近い駅の距離差の半分（2駅の垂直二等分線までの距離の下限）
+ * Android非依存の純粋関数
+ */
+object DecisionMarginCalculator {
+
+    /**
+     * @param location 現在地
+     * @param stations 最寄り駅の判定対象（固定駅なら空）
+     * @return 余裕距離（メートル）
+     */
+    fun marginMeters(location: GeoPoint, stations: List<StationInfo>): Double {
+        val distToMurata = GeoUtils.distanceMeters(location, LocationConstants.MURATA_YASU)
+        val distToYasu = GeoUtils.distanceMeters(location, LocationConstants.YASU_STATION)
+        var margin = min(
+            abs(distToMurata - LocationConstants.MURATA_RADIUS_METERS),
+            abs(distToYasu - LocationConstants.YASU_RADIUS_METERS)
+        )
+
+        if (stations.size >= 2) {
+            var nearest = Double.MAX_VALUE
+            var second = Double.MAX_VALUE
+            for (station in stations) {
+                val distance = GeoUtils.distanceMeters(location, station.location)
+                if (distance < nearest) {
+                    second = nearest
+                    nearest = distance
+                } else if (distance < second) {
+                    second = distance
+                }
+            }
+            margin = min(margin, (second - nearest) / 2)
+        }
+        return margin
+    }
+}
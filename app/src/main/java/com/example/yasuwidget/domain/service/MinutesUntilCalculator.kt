@@ -9,6 +9,8 @@ import java.time.temporal.ChronoUnit
  */
 object MinutesUntilCalculator {
 
+    private const val SECONDS_PER_DAY = 24 * 60 * 60
+
     /**
      * 現在時刻から発車時刻までの残り分数を計算する
      * 発車時刻が現在時刻より前の場合は0を返す
@@ -22,6 +24,20 @@ object MinutesUntilCalculator {
         return maxOf(minutes, 0)
     }
 
+    /**
+     * 次便として抽出された発車時刻までの残り分数を計算する
+     * 発車時刻が現在時刻より前の場合は日付を跨いだ翌日の便とみなす
+     * 秒単位の差から求めるので、現在時刻に秒の端数があっても日付を跨ぐ便を1分多く数えない
+     *
+     * @param currentTime 現在時刻
+     * @param departureTime 発車時刻（現在時刻以降の便）
+     * @return 残り分数（切り捨て、0以上）
+     */
+    fun calculateUpcoming(currentTime: LocalTime, departureTime: LocalTime): Long {
+        val seconds = Math.floorMod(departureTime.toSecondOfDay() - currentTime.toSecondOfDay(), SECONDS_PER_DAY)
+        return seconds / 60L
+    }
+
     /**
      * 残り分数を表示用テキストに変換する
      *
@@ -1,19 +1,23 @@
 package com.example.yasuwidget.domain.service
 
 import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DepartureIndex
 import com.example.yasuwidget.domain.model.ServiceDay
 import com.example.yasuwidget.domain.model.DirectionTimetable
+import java.time.LocalDateTime
 import java.time.LocalTime
 
 /**
  * 次便抽出（SYS-REQ-001/002/003）
  *
  * 現在時刻以降の便を抽出し、指定本数に満たない場合は取得できた範囲で返す
+ * 検索は DirectionTimetable の発車インデックスに対する二分探索で行う
  */
 object NextDeparturesSelector {
 
     /**
      * 指定方向の時刻表から、現在時刻以降の便をcount本まで抽出する
+     * 対象は指定した曜日種別の1運行日のみ（0時台の深夜便は当日の最後に並ぶ）
      */
     fun select(
         timetable: DirectionTimetable,
@@ -21,13 +25,35 @@ object NextDeparturesSelector {
         currentTime: LocalTime,
         count: Int
     ): List<Departure> {
-        val departures = when (serviceDay) {
-            ServiceDay.WEEKDAY -> timetable.weekday
-            ServiceDay.HOLIDAY -> timetable.holiday
-        }
+        val index = timetable.index(serviceDay)
+        val position = index.firstIndexAtOrAfter(DepartureIndex.ceilServiceMinute(currentTime))
+        val result = ArrayList<Departure>(count)
+        index.collectFrom(position, count, result)
+        return result
+    }
+
+    /**
+     * 運行日を跨いで次便をcount本まで抽出する
+     *
+     * - 3時より前は前日の運行日として扱う（0時台の深夜便を表示できる）
+     * - 当日の便がcount本に満たなければ、翌運行日の始発から補う
+     */
+    fun selectAcrossServiceDays(
+        timetable: DirectionTimetable,
+        now: LocalDateTime,
+        count: Int
+    ): List<Departure> {
+        val serviceDate = DepartureIndex.serviceDateOf(now)
+        val result = ArrayList<Departure>(count)
 
-        return departures
-            .filter { it.time >= currentTime }
-            .take(count)
+        val today = timetable.index(ServiceDayResolver.resolve(serviceDate))
+        val position = today.firstIndexAtOrAfter(DepartureIndex.ceilServiceMinute(now.toLocalTime()))
+        val collected = today.collectFrom(position, count, result)
+
+        if (collected < count) {
+            val nextDay = timetable.index(ServiceDayResolver.resolve(serviceDate.plusDays(1)))
+            nextDay.collectFrom(0, count - collected, result)
+        }
+        return result
     }
 }
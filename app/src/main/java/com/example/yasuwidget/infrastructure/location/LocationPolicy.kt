@@ -0,0 +1,220 @@
+package com.example.yasuwidget.infrastructure.location
+
+import com.example.yasuwidget.domain.model.GeoPoint
+import com.example.yasuwidget.domain.model.StationInfo
+import com.example.yasuwidget.domain.service.DecisionMarginCalculator
+import kotlinx.coroutines.CancellationException
+import kotlinx.coroutines.withTimeoutOrNull
+
+/**
+ * 位置取得の方針（SYS-REQ-042）
+ *
+ * Widgetに必要なのは「どの判定境界の内側か」だけなので、判定が変わらない範囲で最も安く取得する:
+ * 1. 直近の位置が新しく（MAX_FIX_AGE_MILLIS 以内）、精度が足りればそのまま使う
+ *    （MAX_ACCURACY_METERS 以内、または誤差が判定境界までの余裕距離より小さい）
+ * 2. 足りなければ、余裕距離に見合う最も安い優先度で能動的に取得する（activeTimeoutMillis で打ち切り）
+ *    取得した位置の精度が足りなければ、残り時間の範囲で1段高い優先度で1回だけ取り直す
+ *    取り直しても精度が足りなければその位置を使う（保存済みの位置より新しいので、判定が外れる可能性はより小さい）
+ * 3. 取得できなければ fallback（MAX_FALLBACK_AGE_MILLIS 以内に保存した位置）を使う
+ *
+ * 取得元と所要時間を記録する。
+ */
+class LocationPolicy(
+    private val provider: LocationProvider,
+    private val activeTimeoutMillis: Long = ACTIVE_REQUEST_TIMEOUT_MILLIS,
+    private val nanoTime: () -> Long = System::nanoTime
+) {
+
+    companion object {
+        /** そのまま使う直近の位置の最大経過時間 */
+        const val MAX_FIX_AGE_MILLIS = 2 * 60_000L
+
+        /** 判定境界に関係なく使ってよい精度 */
+        const val MAX_ACCURACY_METERS = 200.0
+
+        /** 能動的な取得の上限時間 */
+        const val ACTIVE_REQUEST_TIMEOUT_MILLIS = 5_000L
+
+        /** 優先度の判断に使う直近の位置の最大経過時間（これより古ければ参考にしない） */
+        const val PRIORITY_REFERENCE_MAX_AGE_MILLIS = 30 * 60_000L
+
+        /** fallback に使う保存済みの位置の最大経過時間 */
+        const val MAX_FALLBACK_AGE_MILLIS = 30 * 60_000L
+
+        /** 経過時間1分あたりの想定移動距離（電車 約60km/h） */
+        const val DRIFT_METERS_PER_MINUTE = 1_000.0
+
+        /** BALANCED の想定精度（街区レベル） */
+        const val BALANCED_ACCURACY_METERS = 100.0
+
+        /** LOW_POWER の想定精度（市区レベル） */
+        const val LOW_POWER_ACCURACY_METERS = 10_000.0
+    }
+
+    private val sourceCounts = LongArray(LocationSource.entries.size)
+    private var totalLatencyMillis = 0L
+    private var lastResult: LocationResult? = null
+
+    /**
+     * 位置を取得する
+     *
+     * @param stations 最寄り駅の判定対象（固定駅なら空）
+     * @param fallback 取得できなかったときの位置（MAX_FALLBACK_AGE_MILLIS 以内に保存した位置）
+     */
+    suspend fun acquire(stations: List<StationInfo>, fallback: () -> GeoPoint?): LocationResult {
+        val start = nanoTime()
+        val lastKnown = lastKnownFix()
+
+        val (point, source, priority) = if (lastKnown != null && isUsable(lastKnown, stations)) {
+            Triple(lastKnown.point, LocationSource.LAST_KNOWN, null)
+        } else {
+            var priority = choosePriority(lastKnown, stations)
+            var active = requestFix(priority, activeTimeoutMillis)
+            val higher = priority.higher()
+            val remainingMillis = activeTimeoutMillis - (nanoTime() - start) / 1_000_000
+            if (active != null && !isAccurateEnough(active, stations) && higher != null && remainingMillis > 0) {
+                requestFix(higher, remainingMillis)?.let {
+                    active = it
+                    priority = higher
+                }
+            }
+            val fix = active
+            when {
+                fix != null -> Triple(fix.point, LocationSource.ACTIVE, priority)
+                else -> fallback()?.let { Triple(it, LocationSource.CACHED, priority) }
+                    ?: Triple(null, LocationSource.NONE, priority)
+            }
+        }
+
+        val result = LocationResult(
+            point = point,
+            source = source,
+            priority = priority,
+            latencyMillis = (nanoTime() - start) / 1_000_000
+        )
+        record(result)
+        return result
+    }
+
+    /**
+     * システムが保持する直近の位置（移動の判定用、GPSは起動しない）
+     */
+    suspend fun lastKnownPoint(): GeoPoint? = lastKnownFix()?.point
+
+    /**
+     * 能動的な取得の優先度を決める
+     * 直近の位置から見た余裕距離に、その優先度の想定精度が収まる最も安い優先度にする
+     *
+     * @param reference 直近の位置（なければnull）
+     */
+    fun choosePriority(reference: LocationFix?, stations: List<StationInfo>): LocationPriority {
+        if (reference == null || reference.ageMillis > PRIORITY_REFERENCE_MAX_AGE_MILLIS) {
+            return LocationPriority.BALANCED
+        }
+        val margin = DecisionMarginCalculator.marginMeters(reference.point, stations) - uncertaintyMeters(reference)
+        return when {
+            margin >= LOW_POWER_ACCURACY_METERS -> LocationPriority.LOW_POWER
+            margin >= BALANCED_ACCURACY_METERS -> LocationPriority.BALANCED
+            else -> LocationPriority.HIGH_ACCURACY
+        }
+    }
+
+    @Synchronized
+    fun stats(): LocationPolicyStats = LocationPolicyStats(
+        sourceCounts = LocationSource.entries.associateWith { sourceCounts[it.ordinal] },
+        totalLatencyMillis = totalLatencyMillis,
+        lastResult = lastResult
+    )
+
+    private fun isUsable(fix: LocationFix, stations: List<StationInfo>): Boolean =
+        fix.ageMillis <= MAX_FIX_AGE_MILLIS && isAccurateEnough(fix, stations)
+
+    private fun isAccurateEnough(fix: LocationFix, stations: List<StationInfo>): Boolean =
+        fix.accuracyMeters <= MAX_ACCURACY_METERS ||
+            uncertaintyMeters(fix) < DecisionMarginCalculator.marginMeters(fix.point, stations)
+
+    /** 精度と、測位後に移動した可能性のある距離の和 */
+    private fun uncertaintyMeters(fix: LocationFix): Double =
+        fix.accuracyMeters + fix.ageMillis / 60_000.0 * DRIFT_METERS_PER_MINUTE
+
+    private suspend fun lastKnownFix(): LocationFix? = try {
+        provider.lastKnownFix()
+    } catch (e: CancellationException) {
+        throw e
+    } catch (e: Exception) {
+        null
+    }
+
+    private suspend fun requestFix(priority: LocationPriority, timeoutMillis: Long): LocationFix? = try {
+        withTimeoutOrNull(timeoutMillis) {
+            provider.requestFix(priority, timeoutMillis)
+        }
+    } catch (e: CancellationException) {
+        throw e
+    } catch (e: Exception) {
+        null
+    }
+
+    /** 1段高い優先度（最高ならnull） */
+    private fun LocationPriority.higher(): LocationPriority? = when (this) {
+        LocationPriority.LOW_POWER -> LocationPriority.BALANCED
+        LocationPriority.BALANCED -> LocationPriority.HIGH_ACCURACY
+        LocationPriority.HIGH_ACCURACY -> null
+    }
+
+    @Synchronized
+    private fun record(result: LocationResult) {
+        sourceCounts[result.source.ordinal]++
+        totalLatencyMillis += result.latencyMillis
+        lastResult = result
+    }
+}
+
+/**
+ * 位置の取得元
+ */
+enum class LocationSource {
+    /** システムが保持する直近の位置 */
+    LAST_KNOWN,
+    /** 能動的に取得した位置 */
+    ACTIVE,
+    /** 保存済みの位置（取得失敗時） */
+    CACHED,
+    /** 位置なし */
+    NONE
+}
+
+/**
+ * 位置取得の結果
+ *
+ * @property point 緯度経度（位置なしならnull）
+ * @property source 取得元
+ * @property priority 能動的に取得した場合の優先度
+ * @property latencyMillis 所要時間
+ */
+data class LocationResult(
+    val point: GeoPoint?,
+    val source: LocationSource,
+    val priority: LocationPriority?,
+    val latencyMillis: Long
+) {
+    /** 今回取得できた位置か（false なら保存済みの位置か位置なし） */
+    val isFresh: Boolean
+        get() = source == LocationSource.LAST_KNOWN || source == LocationSource.ACTIVE
+}
+
+/**
+ * 位置取得の統計
+ */
+data class LocationPolicyStats(
+    val sourceCounts: Map<LocationSource, Long>,
+    val totalLatencyMillis: Long,
+    val lastResult: LocationResult?
+) {
+    /** 1回あたりの平均所要時間（取得していなければ0） */
+    val averageLatencyMillis: Double
+        get() {
+            val attempts = sourceCounts.values.sum()
+            return if (attempts == 0L) 0.0 else totalLatencyMillis.toDouble() / attempts
+        }
+}
@@ -0,0 +1,46 @@
+package com.example.yasuwidget.infrastructure.location
+
+import com.example.yasuwidget.domain.model.GeoPoint
+
+/**
+ * 位置の取得元（FusedLocationProviderClient などを抽象化する）
+ * テスト時に差し替え可能にする
+ */
+interface LocationProvider {
+
+    /**
+     * システムが保持する直近の位置（GPSは起動しない）
+     * @return LocationFix または null（権限不足/位置なし）
+     */
+    suspend fun lastKnownFix(): LocationFix?
+
+    /**
+     * 位置を能動的に取得する
+     * @param priority 取得の優先度（精度と電力のトレードオフ）
+     * @param timeoutMillis 取得を打ち切るまでの時間
+     * @return LocationFix または null（権限不足/取得失敗/時間切れ）
+     */
+    suspend fun requestFix(priority: LocationPriority, timeoutMillis: Long): LocationFix?
+}
+
+/**
+ * 取得した位置
+ *
+ * @property point 緯度経度
+ * @property accuracyMeters 水平精度（メートル、不明なら無限大）
+ * @property ageMillis 測位からの経過時間
+ */
+data class LocationFix(
+    val point: GeoPoint,
+    val accuracyMeters: Double,
+    val ageMillis: Long
+)
+
+/**
+ * 能動的な位置取得の優先度（上ほど高精度・高消費電力）
+ */
+enum class LocationPriority {
+    HIGH_ACCURACY,
+    BALANCED,
+    LOW_POWER
+}
@@ -4,20 +4,23 @@ import android.Manifest
 import android.content.Context
 import android.content.pm.PackageManager
 import android.location.Location
+import android.os.SystemClock
 import android.util.Log
 import androidx.core.content.ContextCompat
 import com.example.yasuwidget.domain.model.GeoPoint
+import com.google.android.gms.location.CurrentLocationRequest
 import com.google.android.gms.location.LocationServices
 import com.google.android.gms.location.Priority
 import com.google.android.gms.tasks.CancellationTokenSource
 import kotlinx.coroutines.suspendCancellableCoroutine
+import kotlinx.coroutines.withTimeoutOrNull
 import kotlin.coroutines.resume
 
 /**
  * 位置情報の取得（FusedLocationProviderClient）
- * SYS-REQ-042: 取得失敗時はnullを返す（呼び出し側でキャッシュフォールバック）
+ * SYS-REQ-042: 取得失敗時はnullを返す（LocationPolicy でキャッシュフォールバック）
  */
-class LocationRepository(private val context: Context) {
+class LocationRepository(private val context: Context) : LocationProvider {
 
     companion object {
         private const val TAG = "LocationRepository"
@@ -28,29 +31,46 @@ class LocationRepository(private val context: Context) {
     }
 
     /**
-     * 現在地を取得する
-     * @return GeoPoint または null（権限不足/取得失敗時）
+     * lastLocation はシステムにキャッシュされた直近の位置を返すため、
+     * 他アプリ（Google Maps等）が起動していなくても取得できる。
      */
-    suspend fun getCurrentLocation(): GeoPoint? {
+    override suspend fun lastKnownFix(): LocationFix? {
         if (!hasLocationPermission()) {
             Log.w(TAG, "位置情報の権限がありません")
             return null
         }
 
         return try {
-            val location = getLastOrCurrentLocation()
+            getLastLocation()?.let(::toFix)
+        } catch (e: SecurityException) {
+            Log.e(TAG, "SecurityException during lastLocation fetch", e)
+            null
+        }
+    }
+
+    /**
+     * getCurrentLocation でGPS等を能動的に起動して新しい位置を取得する。
+     * アクティブな位置プロバイダがない場合は null を返すことがある。
+     */
+    override suspend fun requestFix(priority: LocationPriority, timeoutMillis: Long): LocationFix? {
+        if (!hasLocationPermission()) {
+            Log.w(TAG, "位置情報の権限がありません")
+            return null
+        }
+
+        return try {
+            val location = withTimeoutOrNull(timeoutMillis) {
+                requestCurrentLocation(priority, timeoutMillis)
+            }
             if (location != null) {
-                Log.d(TAG, "位置取得成功: lat=${location.latitude}, lon=${location.longitude}")
+                Log.d(TAG, "位置取得成功($priority): lat=${location.latitude}, lon=${location.longitude}")
             } else {
-                Log.w(TAG, "位置取得結果がnullです")
+                Log.w(TAG, "位置取得結果がnullです($priority)")
             }
-            location?.let { GeoPoint(it.latitude, it.longitude) }
+            location?.let(::toFix)
         } catch (e: SecurityException) {
             Log.e(TAG, "SecurityException during location fetch", e)
             null
-        } catch (e: Exception) {
-            Log.e(TAG, "Exception during location fetch", e)
-            null
         }
     }
 
@@ -65,27 +85,11 @@ class LocationRepository(private val context: Context) {
         ) == PackageManager.PERMISSION_GRANTED
     }
 
-    /**
-     * lastLocation → getCurrentLocation の順で位置を取得する。
-     *
-     * lastLocation はシステムにキャッシュされた直近の位置を返すため、
-     * 他アプリ（Google Maps等）が起動していなくても取得できる。
-     * getCurrentLocation はGPSを能動的に起動して新しい位置を取得するが、
-     * アクティブな位置プロバイダがない場合は null を返すことがある。
-     */
-    @Suppress("MissingPermission")
-    private suspend fun getLastOrCurrentLocation(): Location? {
-        // まず lastLocation を試行（高速・省電力）
-        val lastLocation = getLastLocation()
-        if (lastLocation != null) {
-            Log.d(TAG, "lastLocation取得成功")
-            return lastLocation
-        }
-
-        // lastLocation が null の場合、getCurrentLocation で能動的に取得
-        Log.d(TAG, "lastLocationがnull、getCurrentLocationを試行")
-        return requestCurrentLocation()
-    }
+    private fun toFix(location: Location): LocationFix = LocationFix(
+        point = GeoPoint(location.latitude, location.longitude),
+        accuracyMeters = if (location.hasAccuracy()) location.accuracy.toDouble() else Double.POSITIVE_INFINITY,
+        ageMillis = (SystemClock.elapsedRealtimeNanos() - location.elapsedRealtimeNanos) / 1_000_000
+    )
 
     @Suppress("MissingPermission")
     private suspend fun getLastLocation(): Location? {
@@ -102,7 +106,18 @@ class LocationRepository(private val context: Context) {
     }
 
     @Suppress("MissingPermission")
-    private suspend fun requestCurrentLocation(): Location? {
+    private suspend fun requestCurrentLocation(priority: LocationPriority, durationMillis: Long): Location? {
+        val request = CurrentLocationRequest.Builder()
+            .setPriority(
+                when (priority) {
+                    LocationPriority.HIGH_ACCURACY -> Priority.PRIORITY_HIGH_ACCURACY
+                    LocationPriority.BALANCED -> Priority.PRIORITY_BALANCED_POWER_ACCURACY
+                    LocationPriority.LOW_POWER -> Priority.PRIORITY_LOW_POWER
+                }
+            )
+            .setDurationMillis(durationMillis)
+            .build()
+
         return suspendCancellableCoroutine { continuation ->
             val cancellationTokenSource = CancellationTokenSource()
 
@@ -111,7 +126,7 @@ class LocationRepository(private val context: Context) {
             }
 
             fusedLocationClient.getCurrentLocation(
-                Priority.PRIORITY_HIGH_ACCURACY,
+                request,
                 cancellationTokenSource.token
             ).addOnSuccessListener { location ->
                 continuation.resume(location)
@@ -11,21 +11,26 @@ import com.example.yasuwidget.presentation.TransitWidgetProvider
  * 更新スケジューリング（SYS-REQ-041）
  * AlarmManagerを用いた自己再スケジュール型
  * exact alarmが保証されない前提で設計する
+ * 更新間隔は UpdatePlanner が表示内容の変化に合わせて決める（既定は約1分）
  */
 class UpdateScheduler(private val context: Context) {
 
     companion object {
         private const val REQUEST_CODE = 1001
         private const val UPDATE_INTERVAL_MS = 60_000L // 約1分
+
+        /** 予定時刻（epoch millis）。発火時の遅れの計測に使う */
+        const val EXTRA_SCHEDULED_AT = "com.example.yasuwidget.EXTRA_SCHEDULED_AT"
     }
 
     /**
-     * 次回更新を約1分後にスケジュールする
+     * 次回更新をスケジュールする
+     * @param delayMillis 現在からの待ち時間（既定は約1分）
      */
-    fun scheduleNextUpdate() {
+    fun scheduleNextUpdate(delayMillis: Long = UPDATE_INTERVAL_MS) {
         val alarmManager = context.getSystemService(Context.ALARM_SERVICE) as? AlarmManager ?: return
-        val intent = createUpdateIntent()
-        val triggerAt = System.currentTimeMillis() + UPDATE_INTERVAL_MS
+        val triggerAt = System.currentTimeMillis() + delayMillis
+        val intent = createUpdateIntent(triggerAt)
 
         try {
             if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.M) {
@@ -59,9 +64,13 @@ class UpdateScheduler(private val context: Context) {
         alarmManager.cancel(createUpdateIntent())
     }
 
-    private fun createUpdateIntent(): PendingIntent {
+    /**
+     * @param scheduledAt 予定時刻（キャンセル時は不要。PendingIntentの照合にextraは使われない）
+     */
+    private fun createUpdateIntent(scheduledAt: Long = 0L): PendingIntent {
         val intent = Intent(context, TransitWidgetProvider::class.java).apply {
             action = TransitWidgetProvider.ACTION_SCHEDULED_UPDATE
+            putExtra(EXTRA_SCHEDULED_AT, scheduledAt)
         }
         return PendingIntent.getBroadcast(
             context,
@@ -0,0 +1,28 @@
+package com.example.yasuwidget.infrastructure.store
+
+/**
+ * 更新処理が参照・保存する状態（NFR-002）
+ * WidgetStateStore が実装し、テスト・ベンチマーク時は差し替え可能にする
+ */
+interface RefreshStateStore {
+    /** 最終更新時刻 */
+    var lastUpdatedAtEpochMillis: Long
+
+    /** 固定駅（未設定なら null） */
+    val pinnedStationId: String?
+
+    /** キャッシュ位置の緯度（未保存なら null） */
+    fun getCachedLatitude(): Double?
+
+    /** キャッシュ位置の経度（未保存なら null） */
+    fun getCachedLongitude(): Double?
+
+    /** キャッシュ位置を保存した時刻（未保存・時刻なしで保存された位置なら null） */
+    fun getCachedAtEpochMillis(): Long?
+
+    /**
+     * 取得できた位置をキャッシュする
+     * @param atEpochMillis 取得した時刻
+     */
+    fun cacheLocation(lat: Double, lon: Double, atEpochMillis: Long)
+}
@@ -3,6 +3,7 @@ package com.example.yasuwidget.infrastructure.store
 import android.content.Context
 import android.content.SharedPreferences
 import com.example.yasuwidget.domain.model.WidgetUiState
+import java.time.LocalDate
 
 /**
  * Widget状態の永続化（NFR-002）
@@ -11,8 +12,11 @@ import com.example.yasuwidget.domain.model.WidgetUiState
  * - last_updated_at_epoch_millis
  * - last_rendered_ui_state_json
  * - pinned_station_id
+ * - cached_latitude / cached_longitude / cached_at_epoch_millis
+ * - render_fingerprint_<appWidgetId>
+ * - refresh_started / refresh_coalesced / refresh_superseded / refresh_timed_out
  */
-class WidgetStateStore(context: Context) {
+class WidgetStateStore(context: Context) : RefreshStateStore {
 
     companion object {
         private const val PREFS_NAME = "yasu_widget_prefs"
@@ -21,13 +25,23 @@ class WidgetStateStore(context: Context) {
         private const val KEY_PINNED_STATION_ID = "pinned_station_id"
         private const val KEY_CACHED_LAT = "cached_latitude"
         private const val KEY_CACHED_LON = "cached_longitude"
+        private const val KEY_CACHED_AT = "cached_at_epoch_millis"
+        private const val KEY_WAKEUPS_AVOIDED_EPOCH_DAY = "wakeups_avoided_epoch_day"
+        private const val KEY_WAKEUPS_AVOIDED_COUNT = "wakeups_avoided_count"
+        private const val KEY_RENDER_FINGERPRINT_PREFIX = "render_fingerprint_"
+        private const val KEY_RENDER_ACTIONS_SENT = "render_actions_sent"
+        private const val KEY_RENDER_UPDATES_SKIPPED = "render_updates_skipped"
+        private const val KEY_REFRESH_STARTED = "refresh_started"
+        private const val KEY_REFRESH_COALESCED = "refresh_coalesced"
+        private const val KEY_REFRESH_SUPERSEDED = "refresh_superseded"
+        private const val KEY_REFRESH_TIMED_OUT = "refresh_timed_out"
     }
 
     private val prefs: SharedPreferences =
         context.getSharedPreferences(PREFS_NAME, Context.MODE_PRIVATE)
 
     // --- 最終更新時刻 ---
-    var lastUpdatedAtEpochMillis: Long
+    override var lastUpdatedAtEpochMillis: Long
         get() = prefs.getLong(KEY_LAST_UPDATED_AT, 0L)
         set(value) = prefs.edit().putLong(KEY_LAST_UPDATED_AT, value).apply()
 
@@ -37,27 +51,95 @@ class WidgetStateStore(context: Context) {
         set(value) = prefs.edit().putString(KEY_LAST_UI_STATE_JSON, value).apply()
 
     // --- 固定駅 ---
-    var pinnedStationId: String?
+    override var pinnedStationId: String?
         get() = prefs.getString(KEY_PINNED_STATION_ID, null)
         set(value) = prefs.edit().putString(KEY_PINNED_STATION_ID, value).apply()
 
     // --- キャッシュ位置情報 ---
-    fun getCachedLatitude(): Double? {
+    override fun getCachedLatitude(): Double? {
         return if (prefs.contains(KEY_CACHED_LAT)) {
             java.lang.Double.longBitsToDouble(prefs.getLong(KEY_CACHED_LAT, 0L))
         } else null
     }
 
-    fun getCachedLongitude(): Double? {
+    override fun getCachedLongitude(): Double? {
         return if (prefs.contains(KEY_CACHED_LON)) {
             java.lang.Double.longBitsToDouble(prefs.getLong(KEY_CACHED_LON, 0L))
         } else null
     }
 
-    fun cacheLocation(lat: Double, lon: Double) {
+    override fun getCachedAtEpochMillis(): Long? {
+        return if (prefs.contains(KEY_CACHED_AT)) prefs.getLong(KEY_CACHED_AT, 0L) else null
+    }
+
+    override fun cacheLocation(lat: Double, lon: Double, atEpochMillis: Long) {
         prefs.edit()
             .putLong(KEY_CACHED_LAT, java.lang.Double.doubleToRawLongBits(lat))
             .putLong(KEY_CACHED_LON, java.lang.Double.doubleToRawLongBits(lon))
+            .putLong(KEY_CACHED_AT, atEpochMillis)
+            .apply()
+    }
+
+    // --- 60秒固定ループと比べて省略した起床回数（日別） ---
+    fun getWakeupsAvoided(date: LocalDate): Int {
+        return if (prefs.getLong(KEY_WAKEUPS_AVOIDED_EPOCH_DAY, -1L) == date.toEpochDay()) {
+            prefs.getInt(KEY_WAKEUPS_AVOIDED_COUNT, 0)
+        } else 0
+    }
+
+    fun recordWakeupsAvoided(date: LocalDate, count: Int) {
+        prefs.edit()
+            .putLong(KEY_WAKEUPS_AVOIDED_EPOCH_DAY, date.toEpochDay())
+            .putInt(KEY_WAKEUPS_AVOIDED_COUNT, getWakeupsAvoided(date) + count)
+            .apply()
+    }
+
+    // --- 前回描画の指紋（Widgetごと） ---
+    fun getRenderFingerprint(appWidgetId: Int): String? {
+        return prefs.getString(KEY_RENDER_FINGERPRINT_PREFIX + appWidgetId, null)
+    }
+
+    fun setRenderFingerprint(appWidgetId: Int, fingerprint: String) {
+        prefs.edit().putString(KEY_RENDER_FINGERPRINT_PREFIX + appWidgetId, fingerprint).apply()
+    }
+
+    fun clearRenderFingerprint(appWidgetId: Int) {
+        prefs.edit().remove(KEY_RENDER_FINGERPRINT_PREFIX + appWidgetId).apply()
+    }
+
+    // --- 描画の送信量（累計） ---
+    val renderActionsSent: Long
+        get() = prefs.getLong(KEY_RENDER_ACTIONS_SENT, 0L)
+
+    val renderUpdatesSkipped: Long
+        get() = prefs.getLong(KEY_RENDER_UPDATES_SKIPPED, 0L)
+
+    fun recordRenderStats(actionsSent: Int, updatesSkipped: Int) {
+        prefs.edit()
+            .putLong(KEY_RENDER_ACTIONS_SENT, renderActionsSent + actionsSent)
+            .putLong(KEY_RENDER_UPDATES_SKIPPED, renderUpdatesSkipped + updatesSkipped)
+            .apply()
+    }
+
+    // --- 更新要求の処理結果（累計） ---
+    val refreshStarted: Long
+        get() = prefs.getLong(KEY_REFRESH_STARTED, 0L)
+
+    val refreshCoalesced: Long
+        get() = prefs.getLong(KEY_REFRESH_COALESCED, 0L)
+
+    val refreshSuperseded: Long
+        get() = prefs.getLong(KEY_REFRESH_SUPERSEDED, 0L)
+
+    val refreshTimedOut: Long
+        get() = prefs.getLong(KEY_REFRESH_TIMED_OUT, 0L)
+
+    fun recordRefreshStats(started: Int = 0, coalesced: Int = 0, superseded: Int = 0, timedOut: Int = 0) {
+        prefs.edit()
+            .putLong(KEY_REFRESH_STARTED, refreshStarted + started)
+            .putLong(KEY_REFRESH_COALESCED, refreshCoalesced + coalesced)
+            .putLong(KEY_REFRESH_SUPERSEDED, refreshSuperseded + superseded)
+            .putLong(KEY_REFRESH_TIMED_OUT, refreshTimedOut + timedOut)
             .apply()
     }
 }
@@ -0,0 +1,147 @@
+package com.example.yasuwidget.infrastructure.timetable
+
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DirectionTimetable
+import com.example.yasuwidget.domain.model.LineTimetable
+import com.example.yasuwidget.domain.model.StationTimetable
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler.DIRECTION_LIST_COUNT
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler.HEADER_SIZE
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler.LINE_ENTRY_SIZE
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler.STATION_ENTRY_SIZE
+import java.io.File
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+import java.nio.channels.FileChannel
+import java.time.LocalTime
+
+/**
+ * コンパイル済み電車時刻表の読み出し（DATA-REQ-001）
+ *
+ * TimetableCompiler が出力したバイナリを参照し、必要な駅だけをデコードする。
+ * 開いた時点で読むのはヘッダーと駅表のみで、発車データは loadStation() で初めて読む。
+ *
+ * @throws TimetableParseException magic/version 不一致・データ破損時
+ */
+class CompiledTrainTimetable(private val buffer: ByteBuffer) {
+
+    companion object {
+        /**
+         * コンパイル済みファイルをメモリマップして開く
+         * @throws TimetableParseException データ破損時
+         */
+        fun open(file: File): CompiledTrainTimetable {
+            val mapped = RandomAccessFile(file, "r").use { raf ->
+                raf.channel.map(FileChannel.MapMode.READ_ONLY, 0, raf.length())
+            }
+            return CompiledTrainTimetable(mapped)
+        }
+    }
+
+    init {
+        guarded {
+            if (buffer.getInt(0) != TimetableCompiler.MAGIC) {
+                throw TimetableParseException("コンパイル済み時刻表の形式が不正です")
+            }
+            if (buffer.getShort(4) != TimetableCompiler.VERSION) {
+                throw TimetableParseException("コンパイル済み時刻表のバージョンが異なります")
+            }
+        }
+    }
+
+    /** コンパイル元ファイルの同一性を表す値 */
+    val sourceStamp: Long = guarded { buffer.getLong(8) }
+
+    private val stringTableOffset: Int = guarded { buffer.getInt(16) }
+
+    private val strings: Array<String?> = guarded {
+        arrayOfNulls(buffer.getShort(stringTableOffset).toInt())
+    }
+
+    private val stationEntryOffsets: Map<String, Int> = guarded {
+        val stationCount = buffer.getShort(6).toInt()
+        val offsets = LinkedHashMap<String, Int>()
+        for (i in 0 until stationCount) {
+            val entryOffset = HEADER_SIZE + i * STATION_ENTRY_SIZE
+            offsets[string(buffer.getShort(entryOffset))] = entryOffset
+        }
+        offsets
+    }
+
+    /** 時刻表に含まれる駅IDの一覧（駅表の順） */
+    val stationIds: Set<String> = stationEntryOffsets.keys
+
+    /**
+     * 指定駅の時刻表をデコードする
+     *
+     * @return StationTimetable または null（駅が存在しない場合）
+     * @throws TimetableParseException データ破損時
+     */
+    fun loadStation(stationId: String): StationTimetable? {
+        val entryOffset = stationEntryOffsets[stationId] ?: return null
+        return guarded {
+            val name = string(buffer.getShort(entryOffset + 2))
+            val lineCount = buffer.getShort(entryOffset + 4).toInt()
+            val lineTableOffset = buffer.getInt(entryOffset + 8)
+
+            val lines = LinkedHashMap<String, LineTimetable>()
+            for (i in 0 until lineCount) {
+                val lineOffset = lineTableOffset + i * LINE_ENTRY_SIZE
+                val lists = List(DIRECTION_LIST_COUNT) { k ->
+                    val listOffset = lineOffset + 4 + k * 8
+                    readDepartures(buffer.getInt(listOffset), buffer.getInt(listOffset + 4))
+                }
+                lines[string(buffer.getShort(lineOffset))] = LineTimetable(
+                    name = string(buffer.getShort(lineOffset + 2)),
+                    up = DirectionTimetable(weekday = lists[0], holiday = lists[1]),
+                    down = DirectionTimetable(weekday = lists[2], holiday = lists[3])
+                )
+            }
+            StationTimetable(name = name, lines = lines)
+        }
+    }
+
+    private fun readDepartures(offset: Int, count: Int): List<Departure> {
+        // 列順: 分, 行先, 種別, 経由（各列 count 個の short）
+        fun column(column: Int, i: Int): Short =
+            buffer.getShort(offset + (column * count + i) * Short.SIZE_BYTES)
+
+        return List(count) { i ->
+            val minuteOfDay = column(0, i).toInt()
+            Departure(
+                time = LocalTime.of(minuteOfDay / 60, minuteOfDay % 60),
+                destination = string(column(1, i)),
+                trainType = string(column(2, i)),
+                via = string(column(3, i))
+            )
+        }
+    }
+
+    /**
+     * 文字列表の索引から文字列を取り出す（初回のみデコードしてキャッシュ）
+     */
+    private fun string(index: Short): String {
+        val i = index.toInt()
+        strings[i]?.let { return it }
+
+        val offset = buffer.getInt(stringTableOffset + Short.SIZE_BYTES + i * Int.SIZE_BYTES)
+        val length = buffer.getShort(offset).toInt() and 0xFFFF
+        val bytes = ByteArray(length)
+        for (b in 0 until length) {
+            bytes[b] = buffer.get(offset + Short.SIZE_BYTES + b)
+        }
+        return String(bytes, Charsets.UTF_8).also { strings[i] = it }
+    }
+
+    /**
+     * バッファ読み出し中の例外を TimetableParseException に揃える
+     */
+    private inline fun <T> guarded(block: () -> T): T {
+        try {
+            return block()
+        } catch (e: TimetableParseException) {
+            throw e
+        } catch (e: Exception) {
+            throw TimetableParseException("コンパイル済み時刻表の読込に失敗: ${e.message}", e)
+        }
+    }
+}
@@ -0,0 +1,182 @@
+package com.example.yasuwidget.infrastructure.timetable
+
+import com.example.yasuwidget.domain.model.BusTimetable
+import com.example.yasuwidget.domain.model.StationTimetable
+
+/**
+ * プロセス内で共有する時刻表キャッシュ（DATA-REQ-001/002）
+ *
+ * - 入力ファイルの同一性（TimetableIdentity.stamp）が変わったときだけ再読込する
+ * - 電車は駅単位で保持し、推定メモリ量が上限を超えたら最も古く参照された駅から破棄する（LRU）
+ * - ヒット/ミス/読込時間を記録する
+ *
+ * 複数の更新から同時に呼ばれても良いよう、公開メソッドは同期化する。
+ */
+class TimetableCache(
+    private val source: TimetableSource,
+    private val maxBytes: Long = DEFAULT_MAX_BYTES,
+    private val nanoTime: () -> Long = System::nanoTime
+) {
+
+    companion object {
+        /** 駅エントリの推定メモリ量の上限 */
+        const val DEFAULT_MAX_BYTES = 256L * 1024
+
+        /** 発車1件あたりの推定メモリ量（Departure + LocalTime + 参照） */
+        private const val BYTES_PER_DEPARTURE = 64L
+
+        /** 駅1件あたりの固定オーバーヘッド */
+        private const val BYTES_PER_STATION = 512L
+    }
+
+    private class StationEntry(val timetable: StationTimetable, val bytes: Long)
+
+    private var trainIdentity: TimetableIdentity? = null
+    private var compiledTrain: CompiledTrainTimetable? = null
+    private val stations = LinkedHashMap<String, StationEntry>(16, 0.75f, true)
+    private var stationBytes = 0L
+
+    private var busIdentity: TimetableIdentity? = null
+    private var bus: BusTimetable? = null
+
+    private var hits = 0L
+    private var misses = 0L
+    private var evictions = 0L
+    private var loadTimeNanos = 0L
+
+    /**
+     * 電車時刻表に含まれる駅IDの一覧
+     * @return 駅ID一覧 または null（データ不在時）
+     * @throws TimetableParseException パース失敗時
+     */
+    @Synchronized
+    fun trainStationIds(): Set<String>? = openTrainTimetable()?.stationIds
+
+    /**
+     * 指定駅の電車時刻表
+     * @return StationTimetable または null（データ不在・駅なし）
+     * @throws TimetableParseException パース失敗時
+     */
+    @Synchronized
+    fun trainStation(stationId: String): StationTimetable? {
+        val compiled = openTrainTimetable() ?: return null
+        stations[stationId]?.let { entry ->
+            hits++
+            return entry.timetable
+        }
+
+        val station = measureLoad { compiled.loadStation(stationId) } ?: return null
+        putStation(stationId, station)
+        return station
+    }
+
+    /**
+     * バス時刻表
+     * @return BusTimetable または null（データ不在時）
+     * @throws TimetableParseException パース失敗時
+     */
+    @Synchronized
+    fun busTimetable(): BusTimetable? {
+        val identity = source.busTimetableIdentity()
+        val cached = bus
+        if (cached != null && identity.stamp == busIdentity?.stamp) {
+            hits++
+            return cached
+        }
+
+        val loaded = measureLoad { source.loadBusTimetable() } ?: return null
+        bus = loaded
+        busIdentity = identity
+        return loaded
+    }
+
+    /**
+     * バス時刻表と指定駅を事前に読み込む
+     * @throws TimetableParseException パース失敗時
+     */
+    fun warmUp(stationIds: Collection<String>) {
+        busTimetable()
+        stationIds.forEach { trainStation(it) }
+    }
+
+    /**
+     * 電車・バス時刻表の入力の同一性をまとめた値（どちらかの内容が変わると変わる）
+     * 読込は行わないので、表示を作り直すべきかの判定に使う
+     */
+    @Synchronized
+    fun sourceStamp(): Long =
+        source.trainTimetableIdentity().stamp * 31 + source.busTimetableIdentity().stamp
+
+    @Synchronized
+    fun stats(): TimetableCacheStats = TimetableCacheStats(
+        hits = hits,
+        misses = misses,
+        evictions = evictions,
+        loadTimeNanos = loadTimeNanos,
+        residentStations = stations.size,
+        residentBytes = stationBytes
+    )
+
+    /**
+     * コンパイル済み電車時刻表を開く（入力が変わったときだけ開き直す）
+     */
+    private fun openTrainTimetable(): CompiledTrainTimetable? {
+        val identity = source.trainTimetableIdentity()
+        val cached = compiledTrain
+        if (cached != null && identity.stamp == trainIdentity?.stamp) return cached
+
+        // 入力が変わったので駅エントリを全て破棄する
+        stations.clear()
+        stationBytes = 0L
+        compiledTrain = null
+
+        val compiled = measureLoad { source.loadCompiledTrainTimetable(identity) } ?: return null
+        compiledTrain = compiled
+        trainIdentity = identity
+        return compiled
+    }
+
+    private fun putStation(stationId: String, station: StationTimetable) {
+        val departureCount = station.lines.values.sumOf { line ->
+            line.up.weekday.size + line.up.holiday.size + line.down.weekday.size + line.down.holiday.size
+        }
+        val entry = StationEntry(station, BYTES_PER_STATION + departureCount * BYTES_PER_DEPARTURE)
+        stations.put(stationId, entry)?.let { stationBytes -= it.bytes }
+        stationBytes += entry.bytes
+
+        // 参照順の先頭から破棄する（直近に追加した駅は末尾なので上限を超えていても残る）
+        val iterator = stations.entries.iterator()
+        while (stationBytes > maxBytes && stations.size > 1) {
+            val eldest = iterator.next()
+            stationBytes -= eldest.value.bytes
+            iterator.remove()
+            evictions++
+        }
+    }
+
+    private inline fun <T> measureLoad(load: () -> T): T {
+        val start = nanoTime()
+        try {
+            return load()
+        } finally {
+            misses++
+            loadTimeNanos += nanoTime() - start
+        }
+    }
+}
+
+/**
+ * 時刻表キャッシュの統計
+ */
+data class TimetableCacheStats(
+    val hits: Long,
+    val misses: Long,
+    val evictions: Long,
+    val loadTimeNanos: Long,
+    val residentStations: Int,
+    val residentBytes: Long
+) {
+    /** ヒット率（参照がなければ0） */
+    val hitRate: Double
+        get() = if (hits + misses == 0L) 0.0 else hits.toDouble() / (hits + misses)
+}
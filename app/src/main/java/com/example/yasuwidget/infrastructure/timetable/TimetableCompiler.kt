@@ -0,0 +1,171 @@
+package com.example.yasuwidget.infrastructure.timetable
+
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.TrainTimetable
+import java.nio.ByteBuffer
+
+/**
+ * 電車時刻表のバイナリコンパイラ（DATA-REQ-001）
+ *
+ * JSONのバリデーションは TimetableParser に任せ、パース済みの TrainTimetable を
+ * 駅単位で部分読込できるコンパクトなバイナリ形式に変換する。
+ *
+ * レイアウト（ビッグエンディアン）:
+ * - ヘッダー: magic(int), version(short), 駅数(short), sourceStamp(long), 文字列表オフセット(int)
+ * - 駅表: 駅ID(short), 駅名(short), 路線数(short), 予約(short), 路線表オフセット(int)
+ * - 路線表: 路線ID(short), 路線名(short), 上り平日/上り休日/下り平日/下り休日 の (オフセット(int), 本数(int))
+ * - 発車ブロック: 分(short)×n, 行先(short)×n, 種別(short)×n, 経由(short)×n の列指向配列
+ * - 文字列表: 件数(short), 各文字列のオフセット(int)×件数, 長さ(short)+UTF-8 本体
+ *
+ * 文字列は全て文字列表にインターンし、本体からは索引(short)で参照する。
+ */
+object TimetableCompiler {
+
+    internal const val MAGIC = 0x59545442 // "YTTB"
+    internal const val VERSION: Short = 1
+
+    internal const val HEADER_SIZE = 20
+    internal const val STATION_ENTRY_SIZE = 12
+    internal const val LINE_ENTRY_SIZE = 4 + DIRECTION_LIST_COUNT * 8
+    internal const val DIRECTION_LIST_COUNT = 4
+
+    /** 発車1件あたりの列数（分, 行先, 種別, 経由） */
+    internal const val DEPARTURE_COLUMN_COUNT = 4
+
+    /**
+     * 電車時刻表JSONをバイナリ形式にコンパイルする
+     *
+     * @param sourceStamp 入力ファイルの同一性を表す値（再コンパイル要否の判定に使う）
+     * @throws TimetableParseException JSON構造不正・必須キー欠落時
+     */
+    fun compileTrainTimetable(json: String, sourceStamp: Long): ByteArray {
+        return compileTrainTimetable(TimetableParser.parseTrainTimetable(json), sourceStamp)
+    }
+
+    /**
+     * パース済みの電車時刻表をバイナリ形式にコンパイルする
+     */
+    fun compileTrainTimetable(timetable: TrainTimetable, sourceStamp: Long): ByteArray {
+        val strings = StringPool()
+        val stations = timetable.stations.entries.toList()
+        if (stations.size > Short.MAX_VALUE) {
+            throw TimetableParseException("駅数が多すぎます: ${stations.size}")
+        }
+
+        // 文字列をインターンしながら各ブロックのサイズを確定する
+        val stationIdRefs = stations.map { strings.intern(it.key) }
+        val stationNameRefs = stations.map { strings.intern(it.value.name) }
+        val lines = stations.map { it.value.lines.entries.toList() }
+        val lineRefs = lines.map { stationLines ->
+            stationLines.map { strings.intern(it.key) to strings.intern(it.value.name) }
+        }
+        val departureLists = lines.map { stationLines ->
+            stationLines.map { line ->
+                listOf(line.value.up.weekday, line.value.up.holiday, line.value.down.weekday, line.value.down.holiday)
+                    .map { list -> list.map { it.toRefs(strings) } }
+            }
+        }
+
+        val stationTableOffset = HEADER_SIZE
+        var cursor = stationTableOffset + stations.size * STATION_ENTRY_SIZE
+        val lineTableOffsets = IntArray(stations.size)
+        for (i in stations.indices) {
+            lineTableOffsets[i] = cursor
+            cursor += lines[i].size * LINE_ENTRY_SIZE
+        }
+        val departureOffsets = departureLists.map { stationLists ->
+            stationLists.map { directionLists ->
+                directionLists.map { list ->
+                    val offset = cursor
+                    cursor += list.size * DEPARTURE_COLUMN_COUNT * Short.SIZE_BYTES
+                    offset
+                }
+            }
+        }
+        val stringTableOffset = cursor
+        val encodedStrings = strings.values.map { it.toByteArray(Charsets.UTF_8) }
+        cursor += Short.SIZE_BYTES + encodedStrings.size * Int.SIZE_BYTES
+        val stringOffsets = encodedStrings.map { bytes ->
+            val offset = cursor
+            cursor += Short.SIZE_BYTES + bytes.size
+            offset
+        }
+
+        val buffer = ByteBuffer.allocate(cursor)
+
+        // ヘッダー
+        buffer.putInt(MAGIC)
+        buffer.putShort(VERSION)
+        buffer.putShort(stations.size.toShort())
+        buffer.putLong(sourceStamp)
+        buffer.putInt(stringTableOffset)
+
+        // 駅表
+        for (i in stations.indices) {
+            buffer.putShort(stationIdRefs[i])
+            buffer.putShort(stationNameRefs[i])
+            buffer.putShort(lines[i].size.toShort())
+            buffer.putShort(0.toShort())
+            buffer.putInt(lineTableOffsets[i])
+        }
+
+        // 路線表
+        for (i in stations.indices) {
+            for ((j, refs) in lineRefs[i].withIndex()) {
+                buffer.putShort(refs.first)
+                buffer.putShort(refs.second)
+                for ((k, list) in departureLists[i][j].withIndex()) {
+                    buffer.putInt(departureOffsets[i][j][k])
+                    buffer.putInt(list.size)
+                }
+            }
+        }
+
+        // 発車ブロック（列指向）
+        for (stationLists in departureLists) {
+            for (directionLists in stationLists) {
+                for (list in directionLists) {
+                    for (column in 0 until DEPARTURE_COLUMN_COUNT) {
+                        list.forEach { buffer.putShort(it[column]) }
+                    }
+                }
+            }
+        }
+
+        // 文字列表
+        buffer.putShort(encodedStrings.size.toShort())
+        stringOffsets.forEach { buffer.putInt(it) }
+        for (bytes in encodedStrings) {
+            buffer.putShort(bytes.size.toShort())
+            buffer.put(bytes)
+        }
+
+        return buffer.array()
+    }
+
+    private fun Departure.toRefs(strings: StringPool): ShortArray = shortArrayOf(
+        (time.hour * 60 + time.minute).toShort(),
+        strings.intern(destination),
+        strings.intern(trainType),
+        strings.intern(via)
+    )
+
+    /**
+     * 文字列のインターン表（出現順に索引を振る）
+     */
+    private class StringPool {
+        private val indexes = LinkedHashMap<String, Short>()
+
+        val values: List<String>
+            get() = indexes.keys.toList()
+
+        fun intern(value: String): Short {
+            return indexes.getOrPut(value) {
+                if (indexes.size >= Short.MAX_VALUE) {
+                    throw TimetableParseException("文字列が多すぎます: ${indexes.size}")
+                }
+                indexes.size.toShort()
+            }
+        }
+    }
+}
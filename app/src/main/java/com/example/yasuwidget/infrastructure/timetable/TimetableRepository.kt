@@ -1,49 +1,135 @@
 package com.example.yasuwidget.infrastructure.timetable
 
 import android.content.Context
+import android.util.Log
+import androidx.core.content.pm.PackageInfoCompat
 import com.example.yasuwidget.domain.model.BusTimetable
-import com.example.yasuwidget.domain.model.TrainTimetable
 import java.io.File
+import java.io.IOException
+import java.util.zip.CRC32
 
 /**
  * 時刻表データの読み込み（DATA-REQ-001/002）
  *
  * - 電車: 内部ストレージ優先 → assets フォールバック（ユーザー投入）
+ *   JSONは初回のみバイナリにコンパイルし、以降はコンパイル済みファイルをメモリマップして読む
  * - バス: assets から読み込み（アプリ同梱）
  */
-class TimetableRepository(private val context: Context) {
+class TimetableRepository(private val context: Context) : TimetableSource {
 
     companion object {
+        private const val TAG = "TimetableRepository"
         const val TRAIN_TIMETABLE_FILENAME = "train_timetable.json"
         const val BUS_TIMETABLE_FILENAME = "bus_timetable.json"
+        const val COMPILED_TRAIN_TIMETABLE_FILENAME = "train_timetable.bin"
+    }
+
+    /** APKのバージョン + インストール時刻（プロセス生存中は変わらない） */
+    private val apkVersion: Long by lazy {
+        val packageInfo = context.packageManager.getPackageInfo(context.packageName, 0)
+        PackageInfoCompat.getLongVersionCode(packageInfo) * 31 + packageInfo.lastUpdateTime
+    }
+
+    /** 直近に内容ハッシュを計算したユーザー投入ファイル */
+    private var lastInternalIdentity: TimetableIdentity.InternalFile? = null
+
+    /**
+     * 電車時刻表の入力ファイルの同一性
+     * サイズ・更新時刻が前回と同じならハッシュを再計算しない
+     */
+    override fun trainTimetableIdentity(): TimetableIdentity {
+        val file = File(context.filesDir, TRAIN_TIMETABLE_FILENAME)
+        if (!file.exists()) return TimetableIdentity.Asset(apkVersion)
+
+        val sizeBytes = file.length()
+        val lastModifiedMillis = file.lastModified()
+        lastInternalIdentity?.let { cached ->
+            if (cached.sizeBytes == sizeBytes && cached.lastModifiedMillis == lastModifiedMillis) {
+                return cached
+            }
+        }
+        return TimetableIdentity.InternalFile(sizeBytes, lastModifiedMillis, contentHash(file))
+            .also { lastInternalIdentity = it }
     }
 
     /**
-     * 電車時刻表を読み込む
-     * 内部ストレージに存在すればそちらを優先し、なければassetsから読み込む
+     * コンパイル済み電車時刻表を開く
+     * 入力が変わっていなければ既存のコンパイル済みファイルをそのまま使う。
      *
-     * @return TrainTimetable または null（データ不在時）
+     * @return CompiledTrainTimetable または null（データ不在時）
      * @throws TimetableParseException パース失敗時
      */
-    fun loadTrainTimetable(): TrainTimetable? {
-        val json = readFromInternalStorage(TRAIN_TIMETABLE_FILENAME)
-            ?: readFromAssets(TRAIN_TIMETABLE_FILENAME)
-            ?: return null
+    override fun loadCompiledTrainTimetable(identity: TimetableIdentity): CompiledTrainTimetable? {
+        val compiledFile = File(context.noBackupFilesDir, COMPILED_TRAIN_TIMETABLE_FILENAME)
+        openCompiled(compiledFile)?.let { compiled ->
+            if (compiled.sourceStamp == identity.stamp) return compiled
+        }
+
+        val json = when (identity) {
+            is TimetableIdentity.InternalFile -> readFromInternalStorage(TRAIN_TIMETABLE_FILENAME)
+            is TimetableIdentity.Asset -> readFromAssets(TRAIN_TIMETABLE_FILENAME)
+        } ?: return null
 
-        return TimetableParser.parseTrainTimetable(json)
+        writeAtomically(compiledFile, TimetableCompiler.compileTrainTimetable(json, identity.stamp))
+        return CompiledTrainTimetable.open(compiledFile)
     }
 
+    override fun busTimetableIdentity(): TimetableIdentity = TimetableIdentity.Asset(apkVersion)
+
     /**
      * バス時刻表を読み込む（アプリ同梱assets）
      *
      * @return BusTimetable または null（データ不在時）
      * @throws TimetableParseException パース失敗時
      */
-    fun loadBusTimetable(): BusTimetable? {
+    override fun loadBusTimetable(): BusTimetable? {
         val json = readFromAssets(BUS_TIMETABLE_FILENAME) ?: return null
         return TimetableParser.parseBusTimetable(json)
     }
 
+    /**
+     * 既存のコンパイル済みファイルを開く（存在しない・破損時はnull）
+     */
+    private fun openCompiled(file: File): CompiledTrainTimetable? {
+        if (!file.exists()) return null
+        return try {
+            CompiledTrainTimetable.open(file)
+        } catch (e: TimetableParseException) {
+            Log.w(TAG, "コンパイル済み時刻表が破損しているため再生成します", e)
+            null
+        }
+    }
+
+    /** ファイル内容のCRC32 */
+    private fun contentHash(file: File): Long {
+        val crc = CRC32()
+        file.inputStream().buffered().use { input ->
+            val buffer = ByteArray(8192)
+            while (true) {
+                val read = input.read(buffer)
+                if (read < 0) break
+                crc.update(buffer, 0, read)
+            }
+        }
+        return crc.value
+    }
+
+    /**
+     * 一時ファイルに書いてからリネームする（書込途中のファイルを読ませない）
+     */
+    private fun writeAtomically(file: File, bytes: ByteArray) {
+        val tmpFile = File(file.parentFile, "${file.name}.tmp")
+        try {
+            tmpFile.writeBytes(bytes)
+        } catch (e: IOException) {
+            throw TimetableParseException("コンパイル済み時刻表の保存に失敗しました", e)
+        }
+        if (!tmpFile.renameTo(file)) {
+            tmpFile.delete()
+            throw TimetableParseException("コンパイル済み時刻表の保存に失敗しました")
+        }
+    }
+
     private fun readFromInternalStorage(filename: String): String? {
         val file = File(context.filesDir, filename)
         return if (file.exists()) {
@@ -0,0 +1,57 @@
+package com.example.yasuwidget.infrastructure.timetable
+
+import com.example.yasuwidget.domain.model.BusTimetable
+
+/**
+ * 時刻表データの供給元（DATA-REQ-001/002）
+ * TimetableCache から参照され、テスト時は差し替え可能にする
+ */
+interface TimetableSource {
+    /** 電車時刻表の入力ファイルの同一性 */
+    fun trainTimetableIdentity(): TimetableIdentity
+
+    /**
+     * 指定した入力のコンパイル済み電車時刻表を開く
+     * @return CompiledTrainTimetable または null（データ不在時）
+     * @throws TimetableParseException パース失敗時
+     */
+    fun loadCompiledTrainTimetable(identity: TimetableIdentity): CompiledTrainTimetable?
+
+    /** バス時刻表の入力ファイルの同一性 */
+    fun busTimetableIdentity(): TimetableIdentity
+
+    /**
+     * バス時刻表を読み込む
+     * @return BusTimetable または null（データ不在時）
+     * @throws TimetableParseException パース失敗時
+     */
+    fun loadBusTimetable(): BusTimetable?
+}
+
+/**
+ * 時刻表ファイルの同一性
+ * stamp が等しければ内容が同じとみなし、再読込・再コンパイルを行わない
+ */
+sealed class TimetableIdentity {
+    abstract val stamp: Long
+
+    /**
+     * ユーザー投入ファイル（filesDir）
+     * サイズ・更新時刻は変更検知用、stamp は内容ハッシュから作る
+     */
+    data class InternalFile(
+        val sizeBytes: Long,
+        val lastModifiedMillis: Long,
+        val contentHash: Long
+    ) : TimetableIdentity() {
+        override val stamp: Long get() = (sizeBytes shl 32) xor contentHash
+    }
+
+    /**
+     * アプリ同梱assets（APKが同じなら内容も同じ）
+     * ユーザー投入ファイルの stamp と衝突しないよう負値にする
+     */
+    data class Asset(val apkVersion: Long) : TimetableIdentity() {
+        override val stamp: Long get() = -(apkVersion and Long.MAX_VALUE) - 1
+    }
+}
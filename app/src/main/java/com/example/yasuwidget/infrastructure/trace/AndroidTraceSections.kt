@@ -0,0 +1,21 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import android.os.Build
+import android.os.Trace
+
+/**
+ * android.os.Trace にトレース区間を出力する（Perfetto/systrace で確認できる）
+ * 非同期区間は API 29 以降のみ出力する（それより前は区間なし、所要時間の記録は行う）
+ */
+class AndroidTraceSections : TraceSections {
+    override fun begin(name: String) = Trace.beginSection(name)
+    override fun end() = Trace.endSection()
+
+    override fun beginAsync(name: String, cookie: Int) {
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.Q) Trace.beginAsyncSection(name, cookie)
+    }
+
+    override fun endAsync(name: String, cookie: Int) {
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.Q) Trace.endAsyncSection(name, cookie)
+    }
+}
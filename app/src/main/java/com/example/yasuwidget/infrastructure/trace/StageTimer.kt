@@ -0,0 +1,136 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import java.util.concurrent.atomic.AtomicInteger
+
+/**
+ * 更新処理の段階
+ * @property sectionName システムトレース上の区間名
+ */
+enum class TraceStage(val sectionName: String) {
+    /** 先読み済みタイムラインの参照 */
+    TIMELINE("YasuWidget:timeline"),
+    /** 位置取得 */
+    LOCATION("YasuWidget:location"),
+    /** 時刻表の読込（ファイル読込・パース） */
+    TIMETABLE("YasuWidget:timetable"),
+    /** 駅・バス方向の判定 */
+    RESOLVE("YasuWidget:resolve"),
+    /** 次便抽出・WidgetUiState構築 */
+    SELECT("YasuWidget:select"),
+    /** RemoteViews の構築 */
+    RENDER("YasuWidget:render"),
+    /** Widgetへの送信 */
+    PUSH("YasuWidget:push")
+}
+
+/**
+ * トレース区間の出力先（Android では android.os.Trace、JVM では何もしない）
+ *
+ * begin/end は同じスレッドで呼ぶ区間、beginAsync/endAsync は中断をまたいで
+ * 別のスレッドで閉じてよい区間（cookie で begin と end を対応させる）。
+ */
+interface TraceSections {
+    fun begin(name: String)
+    fun end()
+    fun beginAsync(name: String, cookie: Int)
+    fun endAsync(name: String, cookie: Int)
+
+    companion object {
+        val NONE: TraceSections = object : TraceSections {
+            override fun begin(name: String) = Unit
+            override fun end() = Unit
+            override fun beginAsync(name: String, cookie: Int) = Unit
+            override fun endAsync(name: String, cookie: Int) = Unit
+        }
+    }
+}
+
+/**
+ * 1回の更新の段階ごとの所要時間を計測する
+ * 同じ段階を複数回計測した場合は合計する
+ *
+ * @param sections トレース区間の出力先
+ * @param nanoTime 時計（テスト時に差し替え可能）
+ */
+class StageTimer(
+    private val sections: TraceSections = TraceSections.NONE,
+    private val nanoTime: () -> Long = System::nanoTime
+) {
+    private val stageNanos = LongArray(TraceStage.entries.size)
+    private val measured = BooleanArray(TraceStage.entries.size)
+    private val startedAtNanos = nanoTime()
+
+    companion object {
+        /** 非同期区間の cookie（同名の区間が重なっても対応が取れるよう一意にする） */
+        private val cookies = AtomicInteger()
+    }
+
+    /**
+     * 中断しない block の所要時間を stage に加算する
+     * トレース区間は同じスレッドで閉じる必要があるため、suspend 関数を呼ぶ block には measureSuspending を使う
+     */
+    inline fun <T> measure(stage: TraceStage, block: () -> T): T {
+        val start = begin(stage)
+        try {
+            return block()
+        } finally {
+            end(stage, start)
+        }
+    }
+
+    /**
+     * 中断する（suspend 関数を呼ぶ）block の所要時間を stage に加算する
+     * 再開後は別のスレッドで動くことがあるため、非同期区間として出力する
+     */
+    inline fun <T> measureSuspending(stage: TraceStage, block: () -> T): T {
+        val cookie = nextCookie()
+        val start = beginAsync(stage, cookie)
+        try {
+            return block()
+        } finally {
+            endAsync(stage, start, cookie)
+        }
+    }
+
+    @PublishedApi
+    internal fun begin(stage: TraceStage): Long {
+        sections.begin(stage.sectionName)
+        return nanoTime()
+    }
+
+    @PublishedApi
+    internal fun end(stage: TraceStage, startNanos: Long) {
+        add(stage, startNanos)
+        sections.end()
+    }
+
+    @PublishedApi
+    internal fun nextCookie(): Int = cookies.incrementAndGet()
+
+    @PublishedApi
+    internal fun beginAsync(stage: TraceStage, cookie: Int): Long {
+        sections.beginAsync(stage.sectionName, cookie)
+        return nanoTime()
+    }
+
+    @PublishedApi
+    internal fun endAsync(stage: TraceStage, startNanos: Long, cookie: Int) {
+        add(stage, startNanos)
+        sections.endAsync(stage.sectionName, cookie)
+    }
+
+    private fun add(stage: TraceStage, startNanos: Long) {
+        stageNanos[stage.ordinal] += nanoTime() - startNanos
+        measured[stage.ordinal] = true
+    }
+
+    /**
+     * 段階の所要時間
+     * @return ナノ秒 または null（実行されなかった段階）
+     */
+    fun stageNanos(stage: TraceStage): Long? =
+        if (measured[stage.ordinal]) stageNanos[stage.ordinal] else null
+
+    /** 計測開始からの経過時間 */
+    fun elapsedNanos(): Long = nanoTime() - startedAtNanos
+}
@@ -0,0 +1,86 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import kotlin.math.ceil
+
+/**
+ * 1回の更新のトレース
+ *
+ * @property startedAtEpochMillis 更新の開始時刻
+ * @property alarmDriftMillis 自動更新の予定時刻からの遅れ（自動更新でなければnull）
+ * @property totalMicros 更新全体の所要時間
+ * @property stageMicros 段階ごとの所要時間（実行されなかった段階は含まない）
+ * @property outcome 更新の結果
+ */
+data class TraceRecord(
+    val startedAtEpochMillis: Long,
+    val alarmDriftMillis: Long?,
+    val totalMicros: Long,
+    val stageMicros: Map<TraceStage, Long>,
+    val outcome: TraceOutcome = TraceOutcome.SUCCESS
+)
+
+/**
+ * 更新の結果
+ */
+enum class TraceOutcome {
+    /** Widgetへの送信まで完了した */
+    SUCCESS,
+    /** 例外で失敗した */
+    FAILED,
+    /** 手動更新による置き換え・上限時間で打ち切られた */
+    CANCELLED
+}
+
+/**
+ * 分位点（最近接順位法）
+ */
+data class Percentiles(val p50: Long, val p95: Long) {
+
+    companion object {
+        /**
+         * @return Percentiles または null（値がない場合）
+         */
+        fun of(values: List<Long>): Percentiles? {
+            if (values.isEmpty()) return null
+            val sorted = values.sorted()
+            return Percentiles(p50 = rank(sorted, 50.0), p95 = rank(sorted, 95.0))
+        }
+
+        private fun rank(sorted: List<Long>, percent: Double): Long {
+            val index = ceil(percent / 100 * sorted.size).toInt() - 1
+            return sorted[index.coerceIn(0, sorted.size - 1)]
+        }
+    }
+}
+
+/**
+ * トレースの集計
+ *
+ * @property count 集計したトレース数（失敗・打ち切りを含む）
+ * @property failed 失敗した更新の数
+ * @property cancelled 打ち切られた更新の数
+ * @property total 更新全体の所要時間（マイクロ秒、失敗・打ち切りを含む）
+ * @property stages 段階ごとの所要時間（マイクロ秒、実行された更新のみで集計）
+ * @property alarmDrift 自動更新の遅れ（ミリ秒）
+ */
+data class TraceSummary(
+    val count: Int,
+    val failed: Int,
+    val cancelled: Int,
+    val total: Percentiles?,
+    val stages: Map<TraceStage, Percentiles>,
+    val alarmDrift: Percentiles?
+) {
+    companion object {
+        fun of(records: List<TraceRecord>): TraceSummary = TraceSummary(
+            count = records.size,
+            failed = records.count { it.outcome == TraceOutcome.FAILED },
+            cancelled = records.count { it.outcome == TraceOutcome.CANCELLED },
+            total = Percentiles.of(records.map { it.totalMicros }),
+            stages = TraceStage.entries.mapNotNull { stage ->
+                Percentiles.of(records.mapNotNull { it.stageMicros[stage] })?.let { stage to it }
+            }.toMap(),
+            alarmDrift = Percentiles.of(records.mapNotNull { it.alarmDriftMillis })
+        )
+    }
+}
@@ -0,0 +1,71 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import android.util.Log
+import java.io.IOException
+
+/**
+ * 更新ごとのトレースを記録する
+ *
+ * - 更新ごとに StageTimer を払い出し、終了時（成功・失敗・打ち切り）にリングバッファへ1レコード追記する
+ * - 自動更新のアラームが発火したときの遅れは、次に記録する更新に付ける
+ *   （実行中の更新に合流した場合はその更新に付く）
+ */
+class TraceRecorder(
+    private val buffer: TraceRingBuffer,
+    private val sections: TraceSections = TraceSections.NONE,
+    private val nanoTime: () -> Long = System::nanoTime
+) {
+
+    companion object {
+        private const val TAG = "TraceRecorder"
+        private const val NANOS_PER_MICRO = 1_000L
+    }
+
+    @Volatile
+    private var pendingAlarmDriftMillis: Long? = null
+
+    /** 1回の更新分の計測を始める */
+    fun newTimer(): StageTimer = StageTimer(sections, nanoTime)
+
+    /**
+     * 自動更新のアラームが発火した
+     * @param driftMillis 予定時刻からの遅れ
+     */
+    fun markAlarmFired(driftMillis: Long) {
+        pendingAlarmDriftMillis = driftMillis
+    }
+
+    /**
+     * 更新のトレースを記録する（記録に失敗しても更新は失敗させない）
+     * 失敗・打ち切りの更新も所要時間の分布に含めるため、結果にかかわらず記録する
+     */
+    fun record(
+        timer: StageTimer,
+        startedAtEpochMillis: Long,
+        outcome: TraceOutcome = TraceOutcome.SUCCESS
+    ): TraceRecord {
+        val drift = pendingAlarmDriftMillis
+        pendingAlarmDriftMillis = null
+        val record = TraceRecord(
+            startedAtEpochMillis = startedAtEpochMillis,
+            alarmDriftMillis = drift,
+            totalMicros = timer.elapsedNanos() / NANOS_PER_MICRO,
+            stageMicros = TraceStage.entries.mapNotNull { stage ->
+                timer.stageNanos(stage)?.let { stage to it / NANOS_PER_MICRO }
+            }.toMap(),
+            outcome = outcome
+        )
+        try {
+            buffer.append(record)
+        } catch (e: IOException) {
+            Log.w(TAG, "トレースの書込に失敗しました", e)
+        }
+        return record
+    }
+
+    /**
+     * 記録済みトレースの集計
+     * @throws IOException 読込失敗時
+     */
+    fun summary(): TraceSummary = TraceSummary.of(buffer.readAll())
+}
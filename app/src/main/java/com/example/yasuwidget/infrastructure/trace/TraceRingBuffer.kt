@@ -0,0 +1,141 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import java.io.File
+import java.io.IOException
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+
+/**
+ * トレースの固定長リングバッファ（バイナリファイル）
+ *
+ * ファイル形式（ビッグエンディアン）:
+ * - ヘッダー: magic(int) / version(short) / 段階数(short) / 容量(int) / 次の書込位置(int) / 件数(int)
+ * - レコード×容量: 開始時刻(long) / 遅れms(int) / 全体μs(int) / 結果(int) / 段階ごとのμs(int×段階数)
+ *
+ * 追記はヘッダーと1レコード分の書込だけで、容量を超えたら最も古いレコードを上書きする。
+ * ヘッダーが一致しない（形式・段階数・容量の変更）ファイルは空として扱い、次の追記で作り直す。
+ */
+class TraceRingBuffer(
+    private val file: File,
+    private val capacity: Int = DEFAULT_CAPACITY
+) {
+
+    companion object {
+        const val DEFAULT_CAPACITY = 256
+
+        private const val MAGIC = 0x59545452 // "YTTR"
+        private const val VERSION: Short = 2
+        private const val HEADER_SIZE = 20
+        private const val NEXT_OFFSET = 12L
+        private const val RECORD_FIXED_SIZE = 20
+
+        /** 自動更新でない（遅れなし） */
+        private const val NO_DRIFT = Int.MIN_VALUE
+
+        /** 実行されなかった段階 */
+        private const val NOT_MEASURED = -1
+    }
+
+    private val stageCount = TraceStage.entries.size
+    private val recordSize = RECORD_FIXED_SIZE + 4 * stageCount
+
+    /**
+     * レコードを追記する
+     * @throws IOException 書込失敗時
+     */
+    @Synchronized
+    fun append(record: TraceRecord) {
+        RandomAccessFile(file, "rw").use { raf ->
+            var (next, count) = readPosition(raf) ?: (0 to 0).also { initialize(raf) }
+
+            val buffer = ByteBuffer.allocate(recordSize)
+            buffer.putLong(record.startedAtEpochMillis)
+            buffer.putInt(record.alarmDriftMillis?.let(::clampToInt) ?: NO_DRIFT)
+            buffer.putInt(clampToInt(record.totalMicros))
+            buffer.putInt(record.outcome.ordinal)
+            for (stage in TraceStage.entries) {
+                buffer.putInt(record.stageMicros[stage]?.let(::clampToInt) ?: NOT_MEASURED)
+            }
+            raf.seek(HEADER_SIZE + next.toLong() * recordSize)
+            raf.write(buffer.array())
+
+            next = (next + 1) % capacity
+            count = minOf(count + 1, capacity)
+            raf.seek(NEXT_OFFSET)
+            raf.writeInt(next)
+            raf.writeInt(count)
+        }
+    }
+
+    /**
+     * 全レコードを古い順に読み込む
+     * @return レコード一覧（ファイルがない・形式が違う場合は空）
+     * @throws IOException 読込失敗時
+     */
+    @Synchronized
+    fun readAll(): List<TraceRecord> {
+        if (!file.exists()) return emptyList()
+        return RandomAccessFile(file, "r").use { raf ->
+            val (next, count) = readPosition(raf) ?: return emptyList()
+            val first = if (count < capacity) 0 else next
+            val bytes = ByteArray(recordSize)
+            List(count) { i ->
+                raf.seek(HEADER_SIZE + ((first + i) % capacity).toLong() * recordSize)
+                raf.readFully(bytes)
+                decode(ByteBuffer.wrap(bytes))
+            }
+        }
+    }
+
+    /**
+     * ヘッダーを検証し、次の書込位置と件数を返す
+     * @return (次の書込位置, 件数) または null（形式不一致）
+     */
+    private fun readPosition(raf: RandomAccessFile): Pair<Int, Int>? {
+        if (raf.length() < HEADER_SIZE + capacity.toLong() * recordSize) return null
+        raf.seek(0)
+        if (raf.readInt() != MAGIC) return null
+        if (raf.readShort() != VERSION) return null
+        if (raf.readShort().toInt() != stageCount) return null
+        if (raf.readInt() != capacity) return null
+        val next = raf.readInt()
+        val count = raf.readInt()
+        if (next !in 0 until capacity || count !in 0..capacity) return null
+        return next to count
+    }
+
+    private fun initialize(raf: RandomAccessFile) {
+        raf.setLength(0)
+        raf.setLength(HEADER_SIZE + capacity.toLong() * recordSize)
+        raf.seek(0)
+        raf.writeInt(MAGIC)
+        raf.writeShort(VERSION.toInt())
+        raf.writeShort(stageCount)
+        raf.writeInt(capacity)
+        raf.writeInt(0)
+        raf.writeInt(0)
+    }
+
+    private fun decode(buffer: ByteBuffer): TraceRecord {
+        val startedAt = buffer.getLong()
+        val drift = buffer.getInt()
+        val total = buffer.getInt()
+        val outcome = TraceOutcome.entries.getOrElse(buffer.getInt()) { TraceOutcome.FAILED }
+        val stages = buildMap {
+            for (stage in TraceStage.entries) {
+                val micros = buffer.getInt()
+                if (micros != NOT_MEASURED) put(stage, micros.toLong())
+            }
+        }
+        return TraceRecord(
+            startedAtEpochMillis = startedAt,
+            alarmDriftMillis = if (drift == NO_DRIFT) null else drift.toLong(),
+            totalMicros = total.toLong(),
+            stageMicros = stages,
+            outcome = outcome
+        )
+    }
+
+    private fun clampToInt(value: Long): Int =
+        value.coerceIn(Int.MIN_VALUE + 1L, Int.MAX_VALUE.toLong()).toInt()
+}
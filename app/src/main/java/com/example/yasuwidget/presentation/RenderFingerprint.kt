@@ -0,0 +1,122 @@
+package com.example.yasuwidget.presentation
+
+import com.example.yasuwidget.domain.model.WidgetUiState
+import com.example.yasuwidget.domain.service.MinutesUntilCalculator
+import java.time.LocalTime
+
+/**
+ * 差分描画の単位
+ * 各スロットは描画結果の一部（ヘッダー・ステータス・1行分など）に対応する
+ *
+ * @property rowIndex 行スロットの行番号（行でなければ -1）
+ * @property isTimestamp 更新時刻の表示（これだけが変わった場合は送らない）
+ */
+enum class RenderSlot(val rowIndex: Int = -1, val isTimestamp: Boolean = false) {
+    HEADER,
+    LAST_UPDATED(isTimestamp = true),
+    STATUS,
+    TRAIN_HEADER,
+    TRAIN_UP_1(0),
+    TRAIN_UP_2(1),
+    TRAIN_UP_3(2),
+    TRAIN_DOWN_1(0),
+    TRAIN_DOWN_2(1),
+    TRAIN_DOWN_3(2),
+    BUS_HEADER,
+    BUS_1(0),
+    BUS_2(1),
+    BUS_3(2)
+}
+
+/**
+ * 描画結果の構造的な指紋
+ *
+ * - layout: 表示/非表示に影響する値（表示モード・ステータス有無・行数）のハッシュ
+ * - slots: スロットごとの表示内容（残り分数を含む）のハッシュ
+ *
+ * layout が変わったら全体を描画し直し、同じならハッシュが変わったスロットだけを描画する。
+ * Widgetごとに永続化するため、ハッシュはプロセスをまたいで安定な String.hashCode を使う。
+ */
+class RenderFingerprint private constructor(
+    val layout: Int,
+    private val slots: IntArray
+) {
+
+    companion object {
+        private const val LAYOUT_SEPARATOR = ':'
+        private const val SLOT_SEPARATOR = ','
+
+        /**
+         * WidgetUiState の描画結果の指紋を求める
+         */
+        fun of(state: WidgetUiState): RenderFingerprint {
+            val train = state.train
+            val bus = state.bus
+            val layout = listOf(
+                state.mode,
+                state.statusMessage != null,
+                train != null,
+                train?.up?.size,
+                train?.down?.size,
+                bus != null
+            ).joinToString("|").hashCode()
+
+            val slots = IntArray(RenderSlot.entries.size) { ordinal ->
+                when (val slot = RenderSlot.entries[ordinal]) {
+                    RenderSlot.HEADER -> state.headerTitle
+                    RenderSlot.LAST_UPDATED -> state.lastUpdatedAtText
+                    RenderSlot.STATUS -> state.statusMessage.orEmpty()
+                    RenderSlot.TRAIN_HEADER -> train?.let { "${it.stationName}|${it.lineName}" }.orEmpty()
+                    RenderSlot.TRAIN_UP_1, RenderSlot.TRAIN_UP_2, RenderSlot.TRAIN_UP_3 ->
+                        train?.up?.getOrNull(slot.rowIndex)?.let {
+                            "${it.trainType}|${it.time}|${it.destination}|${minutesUntil(state, it.time)}"
+                        }.orEmpty()
+                    RenderSlot.TRAIN_DOWN_1, RenderSlot.TRAIN_DOWN_2, RenderSlot.TRAIN_DOWN_3 ->
+                        train?.down?.getOrNull(slot.rowIndex)?.let {
+                            "${it.trainType}|${it.time}|${it.destination}|${minutesUntil(state, it.time)}"
+                        }.orEmpty()
+                    RenderSlot.BUS_HEADER -> bus?.busStopName.orEmpty()
+                    RenderSlot.BUS_1, RenderSlot.BUS_2, RenderSlot.BUS_3 ->
+                        bus?.departures?.getOrNull(slot.rowIndex)?.let {
+                            "${it.departure.time}|${it.label}|${minutesUntil(state, it.departure.time)}"
+                        }.orEmpty()
+                }.hashCode()
+            }
+            return RenderFingerprint(layout, slots)
+        }
+
+        /**
+         * 永続化した文字列から復元する
+         * @return RenderFingerprint または null（形式不正・スロット構成の変更時）
+         */
+        fun decode(encoded: String): RenderFingerprint? {
+            val layout = encoded.substringBefore(LAYOUT_SEPARATOR, "").toIntOrNull() ?: return null
+            val values = encoded.substringAfter(LAYOUT_SEPARATOR).split(SLOT_SEPARATOR)
+            if (values.size != RenderSlot.entries.size) return null
+            val slots = IntArray(values.size) { values[it].toIntOrNull() ?: return null }
+            return RenderFingerprint(layout, slots)
+        }
+
+        private fun minutesUntil(state: WidgetUiState, time: LocalTime): Long =
+            MinutesUntilCalculator.calculateUpcoming(state.currentTime, time)
+    }
+
+    /**
+     * 前回の描画から変わったスロット
+     * @return 変わったスロット（同一なら空） または null（レイアウトが変わり全体の描画が必要）
+     */
+    fun changedSlots(previous: RenderFingerprint): List<RenderSlot>? {
+        if (layout != previous.layout) return null
+        return RenderSlot.entries.filter { slots[it.ordinal] != previous.slots[it.ordinal] }
+    }
+
+    /**
+     * 表示内容に変化があるか（更新時刻の表示だけの変化は含めない）
+     * @param changedSlots changedSlots() の結果
+     */
+    fun hasContentChanges(changedSlots: List<RenderSlot>): Boolean =
+        changedSlots.any { !it.isTimestamp }
+
+    /** 永続化用の文字列 */
+    fun encode(): String = "$layout$LAYOUT_SEPARATOR${slots.joinToString(SLOT_SEPARATOR.toString())}"
+}
@@ -1,24 +1,18 @@
 package com.example.yasuwidget.presentation
 
-import android.app.PendingIntent
 import android.appwidget.AppWidgetManager
 import android.appwidget.AppWidgetProvider
-import android.content.ComponentName
 import android.content.Context
 import android.content.Intent
 import android.util.Log
 import android.widget.RemoteViews
+import com.example.yasuwidget.AppGraph
 import com.example.yasuwidget.R
-import com.example.yasuwidget.application.RefreshWidgetUseCase
-import com.example.yasuwidget.infrastructure.location.LocationRepository
+import com.example.yasuwidget.YasuWidgetApplication
+import com.example.yasuwidget.application.RefreshTrigger
 import com.example.yasuwidget.infrastructure.scheduler.UpdateScheduler
-import com.example.yasuwidget.infrastructure.store.WidgetStateStore
-import com.example.yasuwidget.infrastructure.time.SystemTimeProvider
-import com.example.yasuwidget.infrastructure.timetable.TimetableRepository
-import kotlinx.coroutines.CoroutineScope
-import kotlinx.coroutines.Dispatchers
-import kotlinx.coroutines.SupervisorJob
 import kotlinx.coroutines.launch
+import kotlinx.coroutines.withTimeoutOrNull
 
 /**
  * Widget AppWidgetProvider（エントリーポイント）
@@ -26,6 +20,9 @@ import kotlinx.coroutines.launch
  * - SYS-REQ-041: 自己再スケジュール更新
  * - SYS-REQ-044: 手動更新
  * - NFR-001: クラッシュ防止
+ *
+ * 更新は AppGraph の RefreshCoordinator に要求し、goAsync() で完了（または上限時間）まで
+ * ブロードキャストを保持する。
  */
 class TransitWidgetProvider : AppWidgetProvider() {
 
@@ -33,35 +30,56 @@ class TransitWidgetProvider : AppWidgetProvider() {
         private const val TAG = "TransitWidgetProvider"
         const val ACTION_SCHEDULED_UPDATE = "com.example.yasuwidget.ACTION_SCHEDULED_UPDATE"
         const val ACTION_MANUAL_REFRESH = "com.example.yasuwidget.ACTION_MANUAL_REFRESH"
-    }
 
-    private val scope = CoroutineScope(SupervisorJob() + Dispatchers.IO)
+        /** 置き換え待ちを含めて goAsync() の猶予に収まる待ち時間 */
+        private const val ASYNC_WAIT_MILLIS = 9_000L
+    }
 
     override fun onUpdate(
         context: Context,
         appWidgetManager: AppWidgetManager,
         appWidgetIds: IntArray
     ) {
+        val graph = graph(context)
         // 即座に初期レイアウトを設定（Null RemoteViews 防止）
         for (id in appWidgetIds) {
             val views = RemoteViews(context.packageName, R.layout.widget_transit)
             views.setTextViewText(R.id.text_header_title, "読込中…")
-            setupClickListeners(context, views)
+            graph.widgetUpdater.setupClickListeners(views)
             appWidgetManager.updateAppWidget(id, views)
+            // 描画内容を置き換えたので次回は全体を描画する
+            graph.stateStore.clearRenderFingerprint(id)
         }
-        performUpdate(context)
+        // 実行中の更新が初期化の前の指紋を保存しても、次の送信では全体を描画する
+        graph.widgetUpdater.requestFullRender(appWidgetIds)
+        requestRefresh(graph, RefreshTrigger.WIDGET_UPDATE)
     }
 
     override fun onEnabled(context: Context) {
         super.onEnabled(context)
+        val graph = graph(context)
         // 最初のWidgetが追加されたとき、スケジュール開始
-        UpdateScheduler(context).scheduleNextUpdate()
+        graph.scheduler.scheduleNextUpdate()
+        // 時刻表キャッシュをバックグラウンドで事前に読み込む
+        graph.scope.launch {
+            try {
+                graph.refreshUseCase.warmUpTimetables()
+            } catch (e: Exception) {
+                Log.e(TAG, "warmUp error", e)
+            }
+        }
+    }
+
+    override fun onDeleted(context: Context, appWidgetIds: IntArray) {
+        super.onDeleted(context, appWidgetIds)
+        val stateStore = graph(context).stateStore
+        appWidgetIds.forEach { stateStore.clearRenderFingerprint(it) }
     }
 
     override fun onDisabled(context: Context) {
         super.onDisabled(context)
         // 最後のWidgetが削除されたとき、スケジュール停止
-        UpdateScheduler(context).cancelSchedule()
+        graph(context).scheduler.cancelSchedule()
     }
 
     override fun onReceive(context: Context, intent: Intent) {
@@ -71,70 +89,39 @@ class TransitWidgetProvider : AppWidgetProvider() {
         try {
             when (intent.action) {
                 ACTION_SCHEDULED_UPDATE -> {
-                    performUpdate(context)
-                    UpdateScheduler(context).scheduleNextUpdate()
-                }
-                ACTION_MANUAL_REFRESH -> {
-                    performUpdate(context)
-                    UpdateScheduler(context).scheduleNextUpdate()
+                    val graph = graph(context)
+                    // 予定時刻からの遅れを記録する
+                    val scheduledAt = intent.getLongExtra(UpdateScheduler.EXTRA_SCHEDULED_AT, 0L)
+                    if (scheduledAt > 0L) {
+                        graph.traceRecorder.markAlarmFired(graph.timeProvider.currentEpochMillis() - scheduledAt)
+                    }
+                    requestRefresh(graph, RefreshTrigger.SCHEDULED)
                 }
+                // 手動更新は実行中の自動更新を置き換え、位置を取り直す
+                ACTION_MANUAL_REFRESH -> requestRefresh(graph(context), RefreshTrigger.MANUAL)
             }
         } catch (e: Exception) {
             Log.e(TAG, "onReceive error", e)
         }
     }
 
-    private fun performUpdate(context: Context) {
-        scope.launch {
+    /**
+     * 更新を要求し、完了するまでブロードキャストを保持する
+     * 実行中の更新があれば合流する（RefreshCoordinator）
+     */
+    private fun requestRefresh(graph: AppGraph, trigger: RefreshTrigger) {
+        val pendingResult = goAsync()
+        val job = graph.refreshCoordinator.request(trigger)
+        graph.scope.launch {
             try {
-                val timeProvider = SystemTimeProvider()
-                val locationRepository = LocationRepository(context)
-                val timetableRepository = TimetableRepository(context)
-                val stateStore = WidgetStateStore(context)
-
-                val useCase = RefreshWidgetUseCase(
-                    timeProvider = timeProvider,
-                    locationRepository = locationRepository,
-                    timetableRepository = timetableRepository,
-                    stateStore = stateStore
-                )
-
-                val uiState = useCase.execute()
-                val views = WidgetRenderer.render(context.packageName, uiState)
-
-                // クリックイベントの設定
-                setupClickListeners(context, views)
-
-                // すべてのWidgetインスタンスを更新
-                val appWidgetManager = AppWidgetManager.getInstance(context)
-                val componentName = ComponentName(context, TransitWidgetProvider::class.java)
-                val widgetIds = appWidgetManager.getAppWidgetIds(componentName)
-                for (id in widgetIds) {
-                    appWidgetManager.updateAppWidget(id, views)
-                }
-            } catch (e: Exception) {
-                Log.e(TAG, "performUpdate error", e)
+                withTimeoutOrNull(ASYNC_WAIT_MILLIS) { job.join() }
+            } finally {
+                pendingResult.finish()
             }
         }
+        Log.d(TAG, "更新要求: $trigger")
     }
 
-    private fun setupClickListeners(context: Context, views: android.widget.RemoteViews) {
-        // 手動更新ボタン（UI-REQ-003）
-        views.setOnClickPendingIntent(
-            com.example.yasuwidget.R.id.btn_refresh,
-            createPendingIntent(context, ACTION_MANUAL_REFRESH, 2001)
-        )
-    }
-
-    private fun createPendingIntent(context: Context, action: String, requestCode: Int): PendingIntent {
-        val intent = Intent(context, TransitWidgetProvider::class.java).apply {
-            this.action = action
-        }
-        return PendingIntent.getBroadcast(
-            context,
-            requestCode,
-            intent,
-            PendingIntent.FLAG_UPDATE_CURRENT or PendingIntent.FLAG_IMMUTABLE
-        )
-    }
+    private fun graph(context: Context): AppGraph =
+        (context.applicationContext as YasuWidgetApplication).graph
 }
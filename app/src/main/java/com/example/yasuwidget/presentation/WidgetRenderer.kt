@@ -15,6 +15,8 @@ import java.time.format.DateTimeFormatter
  * WidgetUiState から RemoteViews への描画
  * 描画はWidgetUiStateのみを入力とし、業務判定を行わない
  * 電光掲示板風: 左=上り / 右=下り、1列車1行、種別バッジ付き
+ *
+ * 全体描画と、RenderSlot 単位の差分描画を提供する。
  */
 object WidgetRenderer {
 
@@ -59,94 +61,162 @@ object WidgetRenderer {
     )
 
     /**
-     * WidgetUiState を RemoteViews に描画する
+     * 描画結果
+     * @property views 描画アクションを積んだ RemoteViews
+     * @property actionCount 積んだ描画アクション数
      */
-    fun render(packageName: String, state: WidgetUiState): RemoteViews {
-        val views = RemoteViews(packageName, R.layout.widget_transit)
+    class RenderResult(val views: RemoteViews, val actionCount: Int)
 
-        // ヘッダー
-        views.setTextViewText(R.id.text_header_title, state.headerTitle)
-        views.setTextViewText(R.id.text_last_updated, state.lastUpdatedAtText)
+    /** アクション数を数えながら RemoteViews に積む */
+    private class ActionWriter(val views: RemoteViews) {
+        var count = 0
+            private set
 
-        // ステータスメッセージ（SYS-REQ-042/043）
-        if (state.statusMessage != null) {
-            views.setTextViewText(R.id.text_status_message, state.statusMessage)
-            views.setViewVisibility(R.id.text_status_message, View.VISIBLE)
-        } else {
-            views.setViewVisibility(R.id.text_status_message, View.GONE)
+        fun setText(viewId: Int, text: CharSequence) {
+            views.setTextViewText(viewId, text)
+            count++
+        }
+
+        fun setVisibility(viewId: Int, visibility: Int) {
+            views.setViewVisibility(viewId, visibility)
+            count++
+        }
+
+        fun setBackgroundResource(viewId: Int, resId: Int) {
+            views.setInt(viewId, "setBackgroundResource", resId)
+            count++
         }
 
+        fun result(): RenderResult = RenderResult(views, count)
+    }
+
+    /**
+     * WidgetUiState を RemoteViews に全体描画する（updateAppWidget 用）
+     */
+    fun render(packageName: String, state: WidgetUiState): RenderResult {
+        val writer = ActionWriter(RemoteViews(packageName, R.layout.widget_transit))
+        renderLayout(writer, state)
+        RenderSlot.entries.forEach { renderSlot(writer, state, it) }
+        return writer.result()
+    }
+
+    /**
+     * 指定スロットだけを描画する（partiallyUpdateAppWidget 用）
+     * レイアウト（表示/非表示）は前回の全体描画から変わっていない前提
+     */
+    fun renderSlots(packageName: String, state: WidgetUiState, slots: Collection<RenderSlot>): RenderResult {
+        val writer = ActionWriter(RemoteViews(packageName, R.layout.widget_transit))
+        slots.forEach { renderSlot(writer, state, it) }
+        return writer.result()
+    }
+
+    /**
+     * 表示/非表示を描画する（RenderFingerprint.layout に対応）
+     */
+    private fun renderLayout(writer: ActionWriter, state: WidgetUiState) {
+        // ステータスメッセージ（SYS-REQ-042/043）
+        writer.setVisibility(
+            R.id.text_status_message,
+            if (state.statusMessage != null) View.VISIBLE else View.GONE
+        )
+
         // 表示モードに応じたセクション表示/非表示
         // バスは全モードで常に表示
-        views.setViewVisibility(R.id.section_bus, View.VISIBLE)
+        writer.setVisibility(R.id.section_bus, View.VISIBLE)
         when (state.mode) {
             DisplayMode.TRAIN_ONLY -> {
-                views.setViewVisibility(R.id.section_train, View.VISIBLE)
-                views.setViewVisibility(R.id.text_line_name, View.VISIBLE)
-                views.setViewVisibility(R.id.section_divider, View.VISIBLE)
+                writer.setVisibility(R.id.section_train, View.VISIBLE)
+                writer.setVisibility(R.id.text_line_name, View.VISIBLE)
+                writer.setVisibility(R.id.section_divider, View.VISIBLE)
             }
             DisplayMode.TRAIN_AND_BUS -> {
-                views.setViewVisibility(R.id.section_train, View.VISIBLE)
-                views.setViewVisibility(R.id.text_line_name, View.GONE)
-                views.setViewVisibility(R.id.section_divider, View.VISIBLE)
+                writer.setVisibility(R.id.section_train, View.VISIBLE)
+                writer.setVisibility(R.id.text_line_name, View.GONE)
+                writer.setVisibility(R.id.section_divider, View.VISIBLE)
             }
             DisplayMode.BUS_ONLY -> {
-                views.setViewVisibility(R.id.section_train, View.GONE)
-                views.setViewVisibility(R.id.text_line_name, View.GONE)
-                views.setViewVisibility(R.id.section_divider, View.GONE)
+                writer.setVisibility(R.id.section_train, View.GONE)
+                writer.setVisibility(R.id.text_line_name, View.GONE)
+                writer.setVisibility(R.id.section_divider, View.GONE)
             }
         }
 
-        // 電車セクション: 各行に1列車ずつ描画
-        val train = state.train
-        if (train != null) {
-            views.setTextViewText(R.id.text_train_section_label, "${train.stationName}駅発")
-            views.setTextViewText(R.id.text_line_name, train.lineName)
-            renderTrainRows(views, train.up, UP_ROW_IDS, state.currentTime)
-            renderTrainRows(views, train.down, DOWN_ROW_IDS, state.currentTime)
-        } else {
-            renderTrainRows(views, emptyList(), UP_ROW_IDS, state.currentTime)
-            renderTrainRows(views, emptyList(), DOWN_ROW_IDS, state.currentTime)
+        // 列車行: departures のサイズに応じて行の表示/非表示を制御
+        val upCount = state.train?.up?.size ?: 0
+        val downCount = state.train?.down?.size ?: 0
+        UP_ROW_IDS.forEachIndexed { index, ids ->
+            writer.setVisibility(ids.rowId, if (index < upCount) View.VISIBLE else View.INVISIBLE)
+        }
+        DOWN_ROW_IDS.forEachIndexed { index, ids ->
+            writer.setVisibility(ids.rowId, if (index < downCount) View.VISIBLE else View.INVISIBLE)
         }
 
-        // バスセクション（ヘッダー + 1カラム: 発時間順）
+        // バス行は便がなくても「---」を表示する
+        BUS_ROW_IDS.forEach { writer.setVisibility(it.rowId, View.VISIBLE) }
+    }
+
+    /**
+     * 1スロット分の内容を描画する（RenderFingerprint のスロットに対応）
+     */
+    private fun renderSlot(writer: ActionWriter, state: WidgetUiState, slot: RenderSlot) {
+        val train = state.train
         val bus = state.bus
-        if (bus != null) {
-            views.setTextViewText(R.id.text_bus_stop_name, bus.busStopName)
-            renderBusRows(views, bus.departures, BUS_ROW_IDS, state.currentTime)
-        } else {
-            views.setTextViewText(R.id.text_bus_stop_name, "")
-            renderBusRows(views, emptyList(), BUS_ROW_IDS, state.currentTime)
+        when (slot) {
+            RenderSlot.HEADER -> {
+                writer.setText(R.id.text_header_title, state.headerTitle)
+            }
+            RenderSlot.LAST_UPDATED -> {
+                writer.setText(R.id.text_last_updated, state.lastUpdatedAtText)
+            }
+            RenderSlot.STATUS -> {
+                state.statusMessage?.let { writer.setText(R.id.text_status_message, it) }
+            }
+            RenderSlot.TRAIN_HEADER -> {
+                if (train != null) {
+                    writer.setText(R.id.text_train_section_label, "${train.stationName}駅発")
+                    writer.setText(R.id.text_line_name, train.lineName)
+                }
+            }
+            RenderSlot.TRAIN_UP_1, RenderSlot.TRAIN_UP_2, RenderSlot.TRAIN_UP_3 -> {
+                train?.up?.getOrNull(slot.rowIndex)?.let {
+                    renderTrainRow(writer, it, UP_ROW_IDS[slot.rowIndex], state.currentTime)
+                }
+            }
+            RenderSlot.TRAIN_DOWN_1, RenderSlot.TRAIN_DOWN_2, RenderSlot.TRAIN_DOWN_3 -> {
+                train?.down?.getOrNull(slot.rowIndex)?.let {
+                    renderTrainRow(writer, it, DOWN_ROW_IDS[slot.rowIndex], state.currentTime)
+                }
+            }
+            RenderSlot.BUS_HEADER -> {
+                writer.setText(R.id.text_bus_stop_name, bus?.busStopName ?: "")
+            }
+            RenderSlot.BUS_1, RenderSlot.BUS_2, RenderSlot.BUS_3 -> {
+                renderBusRow(
+                    writer,
+                    bus?.departures?.getOrNull(slot.rowIndex),
+                    BUS_ROW_IDS[slot.rowIndex],
+                    state.currentTime
+                )
+            }
         }
-
-        return views
     }
 
     /**
-     * 列車行を描画する
-     * departures のサイズに応じて行の表示/非表示を制御
+     * 列車1行を描画する
      * 時刻と行先を別々のTextViewに描画し、残り分数を表示する
      */
-    private fun renderTrainRows(
-        views: RemoteViews,
-        departures: List<Departure>,
-        rowIds: List<TrainRowIds>,
+    private fun renderTrainRow(
+        writer: ActionWriter,
+        dep: Departure,
+        ids: TrainRowIds,
         currentTime: LocalTime
     ) {
-        for ((index, ids) in rowIds.withIndex()) {
-            if (index < departures.size) {
-                val dep = departures[index]
-                views.setViewVisibility(ids.rowId, View.VISIBLE)
-                views.setTextViewText(ids.typeId, dep.trainType.ifEmpty { "　" })
-                views.setInt(ids.typeId, "setBackgroundResource", badgeDrawable(dep.trainType))
-                views.setTextViewText(ids.timeId, dep.time.format(TIME_FORMATTER))
-                views.setTextViewText(ids.destId, dep.destination.ifEmpty { "" })
-                val minutesUntil = MinutesUntilCalculator.calculate(currentTime, dep.time)
-                views.setTextViewText(ids.minutesId, MinutesUntilCalculator.formatText(minutesUntil))
-            } else {
-                views.setViewVisibility(ids.rowId, View.INVISIBLE)
-            }
-        }
+        writer.setText(ids.typeId, dep.trainType.ifEmpty { "　" })
+        writer.setBackgroundResource(ids.typeId, badgeDrawable(dep.trainType))
+        writer.setText(ids.timeId, dep.time.format(TIME_FORMATTER))
+        writer.setText(ids.destId, dep.destination.ifEmpty { "" })
+        val minutesUntil = MinutesUntilCalculator.calculateUpcoming(currentTime, dep.time)
+        writer.setText(ids.minutesId, MinutesUntilCalculator.formatText(minutesUntil))
     }
 
     /**
@@ -160,31 +230,24 @@ object WidgetRenderer {
     }
 
     /**
-     * バス行を描画する
-     * departures のサイズに応じて行の表示/非表示を制御
-     * 行き先/発車場所ラベルと残り分数を表示する
+     * バス1行を描画する
+     * 行き先/発車場所ラベルと残り分数を表示し、便がなければ「---」を表示する
      */
-    private fun renderBusRows(
-        views: RemoteViews,
-        departures: List<BusDeparture>,
-        rowIds: List<BusRowIds>,
+    private fun renderBusRow(
+        writer: ActionWriter,
+        busDep: BusDeparture?,
+        ids: BusRowIds,
         currentTime: LocalTime
     ) {
-        for ((index, ids) in rowIds.withIndex()) {
-            if (index < departures.size) {
-                val busDep = departures[index]
-                val time = busDep.departure.time.format(TIME_FORMATTER)
-                views.setTextViewText(ids.timeId, time)
-                views.setTextViewText(ids.labelId, busDep.label)
-                val minutesUntil = MinutesUntilCalculator.calculate(currentTime, busDep.departure.time)
-                views.setTextViewText(ids.minutesId, MinutesUntilCalculator.formatText(minutesUntil))
-                views.setViewVisibility(ids.rowId, View.VISIBLE)
-            } else {
-                views.setTextViewText(ids.timeId, "---")
-                views.setTextViewText(ids.labelId, "")
-                views.setTextViewText(ids.minutesId, "")
-                views.setViewVisibility(ids.rowId, View.VISIBLE)
-            }
+        if (busDep != null) {
+            writer.setText(ids.timeId, busDep.departure.time.format(TIME_FORMATTER))
+            writer.setText(ids.labelId, busDep.label)
+            val minutesUntil = MinutesUntilCalculator.calculateUpcoming(currentTime, busDep.departure.time)
+            writer.setText(ids.minutesId, MinutesUntilCalculator.formatText(minutesUntil))
+        } else {
+            writer.setText(ids.timeId, "---")
+            writer.setText(ids.labelId, "")
+            writer.setText(ids.minutesId, "")
         }
     }
 }
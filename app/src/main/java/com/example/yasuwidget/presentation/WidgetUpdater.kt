@@ -0,0 +1,175 @@
+package com.example.yasuwidget.presentation
+
+import android.app.PendingIntent
+import android.appwidget.AppWidgetManager
+import android.content.ComponentName
+import android.content.Context
+import android.content.Intent
+import android.util.Log
+import android.widget.RemoteViews
+import com.example.yasuwidget.R
+import com.example.yasuwidget.application.RefreshTrigger
+import com.example.yasuwidget.application.RefreshWidgetUseCase
+import com.example.yasuwidget.application.UpdatePlanner
+import com.example.yasuwidget.domain.model.WidgetUiState
+import com.example.yasuwidget.infrastructure.scheduler.UpdateScheduler
+import com.example.yasuwidget.infrastructure.store.WidgetStateStore
+import com.example.yasuwidget.infrastructure.time.TimeProvider
+import com.example.yasuwidget.infrastructure.trace.StageTimer
+import com.example.yasuwidget.infrastructure.trace.TraceOutcome
+import com.example.yasuwidget.infrastructure.trace.TraceRecorder
+import com.example.yasuwidget.infrastructure.trace.TraceStage
+import kotlinx.coroutines.CancellationException
+import java.util.concurrent.ConcurrentHashMap
+import java.util.concurrent.atomic.AtomicLong
+
+/**
+ * Widgetの更新処理（ユースケース実行 → 描画 → 次回更新のスケジュール）
+ * RefreshCoordinator から1つずつ呼ばれる
+ *
+ * - SYS-REQ-041: 表示内容が次に変わる時刻に自己再スケジュール
+ * - 前回描画との差分だけを送る（RenderFingerprint）
+ * - 段階ごとの所要時間を記録する（TraceRecorder）
+ */
+class WidgetUpdater(
+    private val context: Context,
+    private val timeProvider: TimeProvider,
+    private val useCase: RefreshWidgetUseCase,
+    private val planner: UpdatePlanner,
+    private val scheduler: UpdateScheduler,
+    private val stateStore: WidgetStateStore,
+    private val traceRecorder: TraceRecorder
+) {
+
+    companion object {
+        private const val TAG = "WidgetUpdater"
+        private const val MANUAL_REFRESH_REQUEST_CODE = 2001
+    }
+
+    /**
+     * 表示を初期化したため次の送信で全体を描画する Widget（ID → 要求の世代）
+     * 実行中の更新が初期化の前の指紋を保存しても、要求が残っている間は指紋を使わない
+     */
+    private val fullRenderRequests = ConcurrentHashMap<Int, Long>()
+    private val fullRenderGeneration = AtomicLong()
+
+    /**
+     * 更新を実行し、表示内容が次に変わる時刻に次回更新をスケジュールする
+     * 失敗時も約1分後に再スケジュールする（SYS-REQ-041）
+     * キャンセル（手動更新による置き換え・上限時間）は呼び出し側に伝える
+     */
+    suspend fun update(trigger: RefreshTrigger) {
+        val startedAt = timeProvider.currentEpochMillis()
+        val timer = traceRecorder.newTimer()
+        var outcome = TraceOutcome.FAILED
+        try {
+            val uiState = useCase.execute(trigger.forceRecompute, timer)
+
+            // すべてのWidgetインスタンスを更新
+            val appWidgetManager = AppWidgetManager.getInstance(context)
+            val componentName = ComponentName(context, TransitWidgetProvider::class.java)
+            val widgetIds = appWidgetManager.getAppWidgetIds(componentName)
+            pushToWidgets(appWidgetManager, widgetIds, uiState, timer)
+            outcome = TraceOutcome.SUCCESS
+
+            val plan = planner.planNext(uiState)
+            scheduler.scheduleNextUpdate(plan.delayMillis)
+            stateStore.recordWakeupsAvoided(timeProvider.currentDate(), plan.wakeupsAvoided)
+            Log.d(TAG, "次回更新: ${plan.triggerAt} (${plan.reason})")
+        } catch (e: CancellationException) {
+            outcome = TraceOutcome.CANCELLED
+            throw e
+        } catch (e: Exception) {
+            Log.e(TAG, "update error", e)
+            scheduler.scheduleNextUpdate()
+        } finally {
+            // 遅い更新ほど打ち切られやすいので、失敗・打ち切りも記録する
+            traceRecorder.record(timer, startedAt, outcome)
+        }
+    }
+
+    /**
+     * 次の送信で全体を描画するよう要求する（onUpdate で表示を初期化したとき）
+     */
+    fun requestFullRender(appWidgetIds: IntArray) {
+        val generation = fullRenderGeneration.incrementAndGet()
+        appWidgetIds.forEach { fullRenderRequests[it] = generation }
+    }
+
+    /**
+     * クリックイベントを設定する
+     */
+    fun setupClickListeners(views: RemoteViews) {
+        // 手動更新ボタン（UI-REQ-003）
+        val intent = Intent(context, TransitWidgetProvider::class.java).apply {
+            action = TransitWidgetProvider.ACTION_MANUAL_REFRESH
+        }
+        views.setOnClickPendingIntent(
+            R.id.btn_refresh,
+            PendingIntent.getBroadcast(
+                context,
+                MANUAL_REFRESH_REQUEST_CODE,
+                intent,
+                PendingIntent.FLAG_UPDATE_CURRENT or PendingIntent.FLAG_IMMUTABLE
+            )
+        )
+    }
+
+    /**
+     * 前回描画との差分だけを各Widgetに送る
+     * - レイアウトが変わった（または前回が不明な・全体の描画を要求された）Widgetは全体を描画する
+     * - 内容が変わったスロットだけを partiallyUpdateAppWidget で送る
+     * - 何も変わっていない、または更新時刻の表示だけが変わった場合は送らない
+     *   （指紋も保存せず、更新時刻は次に内容が変わったときに合わせて送る）
+     */
+    private fun pushToWidgets(
+        appWidgetManager: AppWidgetManager,
+        widgetIds: IntArray,
+        uiState: WidgetUiState,
+        timer: StageTimer
+    ) {
+        val fingerprint = timer.measure(TraceStage.RENDER) { RenderFingerprint.of(uiState) }
+        val encoded = fingerprint.encode()
+        val fullRender by lazy {
+            timer.measure(TraceStage.RENDER) {
+                WidgetRenderer.render(context.packageName, uiState).also {
+                    // クリックイベントの設定
+                    setupClickListeners(it.views)
+                }
+            }
+        }
+
+        var actionsSent = 0
+        var updatesSkipped = 0
+        for (id in widgetIds) {
+            val fullRenderRequest = fullRenderRequests[id]
+            val stored = if (fullRenderRequest == null) stateStore.getRenderFingerprint(id) else null
+            val previous = stored?.let(RenderFingerprint::decode)
+            val changedSlots = previous?.let { fingerprint.changedSlots(it) }
+            when {
+                changedSlots == null -> {
+                    val views = fullRender.views
+                    timer.measure(TraceStage.PUSH) { appWidgetManager.updateAppWidget(id, views) }
+                    actionsSent += fullRender.actionCount
+                }
+                !fingerprint.hasContentChanges(changedSlots) -> {
+                    updatesSkipped++
+                    continue
+                }
+                else -> {
+                    val partial = timer.measure(TraceStage.RENDER) {
+                        WidgetRenderer.renderSlots(context.packageName, uiState, changedSlots)
+                    }
+                    timer.measure(TraceStage.PUSH) { appWidgetManager.partiallyUpdateAppWidget(id, partial.views) }
+                    actionsSent += partial.actionCount
+                }
+            }
+            if (stored != encoded) {
+                stateStore.setRenderFingerprint(id, encoded)
+            }
+            // 送信中に再び初期化された場合は要求を残す
+            fullRenderRequest?.let { fullRenderRequests.remove(id, it) }
+        }
+        stateStore.recordRenderStats(actionsSent, updatesSkipped)
+    }
+}
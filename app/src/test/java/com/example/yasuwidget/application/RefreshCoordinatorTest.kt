@@ -0,0 +1,178 @@
+package com.example.yasuwidget.application
+
+import kotlinx.coroutines.CompletableDeferred
+import kotlinx.coroutines.awaitCancellation
+import kotlinx.coroutines.runBlocking
+import kotlinx.coroutines.yield
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertNotSame
+import org.junit.Assert.assertSame
+import org.junit.Assert.assertTrue
+import org.junit.Test
+
+/**
+ * 更新コーディネーターのテスト
+ *
+ * - 実行中の更新への合流
+ * - 表示を初期化する要求は、描画を始めた更新のあとに続けて実行する
+ * - 手動更新による自動更新の置き換え
+ * - 上限時間での打ち切り
+ * - 処理結果の通知（統計の永続化用）
+ */
+class RefreshCoordinatorTest {
+
+    @Test
+    fun `実行中の更新があれば合流し更新は1回だけ実行する`() = runBlocking {
+        val gate = CompletableDeferred<Unit>()
+        val triggers = mutableListOf<RefreshTrigger>()
+        val coordinator = RefreshCoordinator(this) { trigger ->
+            triggers.add(trigger)
+            gate.await()
+        }
+
+        val first = coordinator.request(RefreshTrigger.SCHEDULED)
+        yield()
+        val second = coordinator.request(RefreshTrigger.SCHEDULED)
+        gate.complete(Unit)
+        first.join()
+
+        assertSame(first, second)
+        assertEquals(listOf(RefreshTrigger.SCHEDULED), triggers)
+        assertEquals(RefreshCoordinatorStats(started = 1, coalesced = 1, superseded = 0, timedOut = 0), coordinator.stats())
+    }
+
+    @Test
+    fun `表示を初期化する要求は実行中の更新のあとに続けて実行する`() = runBlocking {
+        val gate = CompletableDeferred<Unit>()
+        val triggers = mutableListOf<RefreshTrigger>()
+        val coordinator = RefreshCoordinator(this) { trigger ->
+            triggers.add(trigger)
+            if (trigger == RefreshTrigger.SCHEDULED) gate.await()
+        }
+
+        val scheduled = coordinator.request(RefreshTrigger.SCHEDULED)
+        yield()
+        val widgetUpdate = coordinator.request(RefreshTrigger.WIDGET_UPDATE)
+        // 続けて実行する更新が決まっていれば、それに合流する
+        assertSame(scheduled, coordinator.request(RefreshTrigger.WIDGET_UPDATE))
+        gate.complete(Unit)
+        scheduled.join()
+
+        assertSame(scheduled, widgetUpdate)
+        assertEquals(listOf(RefreshTrigger.SCHEDULED, RefreshTrigger.WIDGET_UPDATE), triggers)
+        assertEquals(RefreshCoordinatorStats(started = 2, coalesced = 1, superseded = 0, timedOut = 0), coordinator.stats())
+    }
+
+    @Test
+    fun `開始前の更新には表示を初期化する要求も合流する`() = runBlocking {
+        val triggers = mutableListOf<RefreshTrigger>()
+        val coordinator = RefreshCoordinator(this) { triggers.add(it) }
+
+        val scheduled = coordinator.request(RefreshTrigger.SCHEDULED)
+        val widgetUpdate = coordinator.request(RefreshTrigger.WIDGET_UPDATE)
+        scheduled.join()
+
+        assertSame(scheduled, widgetUpdate)
+        assertEquals(listOf(RefreshTrigger.SCHEDULED), triggers)
+    }
+
+    @Test
+    fun `手動更新は実行中の自動更新をキャンセルして置き換える`() = runBlocking {
+        val triggers = mutableListOf<RefreshTrigger>()
+        val coordinator = RefreshCoordinator(this) { trigger ->
+            triggers.add(trigger)
+            if (trigger == RefreshTrigger.SCHEDULED) awaitCancellation()
+        }
+
+        val scheduled = coordinator.request(RefreshTrigger.SCHEDULED)
+        yield()
+        val manual = coordinator.request(RefreshTrigger.MANUAL)
+        manual.join()
+
+        assertNotSame(scheduled, manual)
+        assertTrue(scheduled.isCancelled)
+        assertEquals(listOf(RefreshTrigger.SCHEDULED, RefreshTrigger.MANUAL), triggers)
+        assertEquals(1L, coordinator.stats().superseded)
+    }
+
+    @Test
+    fun `実行中の手動更新には自動更新も手動更新も合流する`() = runBlocking {
+        val gate = CompletableDeferred<Unit>()
+        var count = 0
+        val coordinator = RefreshCoordinator(this) {
+            count++
+            gate.await()
+        }
+
+        val manual = coordinator.request(RefreshTrigger.MANUAL)
+        yield()
+        assertSame(manual, coordinator.request(RefreshTrigger.SCHEDULED))
+        assertSame(manual, coordinator.request(RefreshTrigger.MANUAL))
+        gate.complete(Unit)
+        manual.join()
+
+        assertEquals(1, count)
+        assertEquals(2L, coordinator.stats().coalesced)
+    }
+
+    @Test
+    fun `完了後の要求は新しい更新を実行する`() = runBlocking {
+        var count = 0
+        val coordinator = RefreshCoordinator(this) { count++ }
+
+        coordinator.request(RefreshTrigger.SCHEDULED).join()
+        coordinator.request(RefreshTrigger.SCHEDULED).join()
+
+        assertEquals(2, count)
+        assertEquals(0L, coordinator.stats().coalesced)
+    }
+
+    @Test
+    fun `上限時間を超えた更新は打ち切り通知する`() = runBlocking {
+        val exceeded = mutableListOf<RefreshTrigger>()
+        val coordinator = RefreshCoordinator(
+            scope = this,
+            deadlineMillis = 50L,
+            onDeadlineExceeded = { exceeded.add(it) }
+        ) { awaitCancellation() }
+
+        coordinator.request(RefreshTrigger.SCHEDULED).join()
+
+        assertEquals(listOf(RefreshTrigger.SCHEDULED), exceeded)
+        assertEquals(1L, coordinator.stats().timedOut)
+    }
+
+    @Test
+    fun `要求の処理結果を通知する`() = runBlocking {
+        val events = mutableListOf<RefreshEvent>()
+        val coordinator = RefreshCoordinator(
+            scope = this,
+            deadlineMillis = 50L,
+            onEvent = { events.add(it) }
+        ) { trigger ->
+            if (trigger == RefreshTrigger.SCHEDULED) yield() else awaitCancellation()
+        }
+
+        coordinator.request(RefreshTrigger.SCHEDULED)
+        coordinator.request(RefreshTrigger.WIDGET_UPDATE)
+        coordinator.request(RefreshTrigger.MANUAL).join()
+
+        assertEquals(
+            listOf(
+                RefreshEvent.STARTED,
+                RefreshEvent.COALESCED,
+                RefreshEvent.SUPERSEDED,
+                RefreshEvent.STARTED,
+                RefreshEvent.TIMED_OUT
+            ),
+            events
+        )
+    }
+
+    @Test
+    fun `合流率は要求のうち合流した割合`() {
+        val stats = RefreshCoordinatorStats(started = 3, coalesced = 1, superseded = 0, timedOut = 0)
+        assertEquals(0.25, stats.coalescedRate, 1e-9)
+        assertEquals(0.0, RefreshCoordinatorStats(0, 0, 0, 0).coalescedRate, 0.0)
+    }
+}
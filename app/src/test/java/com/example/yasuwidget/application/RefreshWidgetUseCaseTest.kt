@@ -0,0 +1,254 @@
+package com.example.yasuwidget.application
+
+import com.example.yasuwidget.domain.constants.LocationConstants
+import com.example.yasuwidget.domain.model.BusTimetable
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DirectionTimetable
+import com.example.yasuwidget.domain.model.GeoPoint
+import com.example.yasuwidget.domain.model.LineTimetable
+import com.example.yasuwidget.domain.model.StationTimetable
+import com.example.yasuwidget.domain.model.TrainTimetable
+import com.example.yasuwidget.infrastructure.location.LocationFix
+import com.example.yasuwidget.infrastructure.location.LocationPolicy
+import com.example.yasuwidget.infrastructure.location.LocationPriority
+import com.example.yasuwidget.infrastructure.location.LocationProvider
+import com.example.yasuwidget.infrastructure.store.RefreshStateStore
+import com.example.yasuwidget.infrastructure.time.TimeProvider
+import com.example.yasuwidget.infrastructure.timetable.CompiledTrainTimetable
+import com.example.yasuwidget.infrastructure.timetable.TimetableCache
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler
+import com.example.yasuwidget.infrastructure.timetable.TimetableIdentity
+import com.example.yasuwidget.infrastructure.timetable.TimetableSource
+import kotlinx.coroutines.runBlocking
+import org.junit.Assert.*
+import org.junit.Test
+import java.nio.ByteBuffer
+import java.time.LocalDate
+import java.time.LocalDateTime
+import java.time.LocalTime
+import java.time.ZoneOffset
+
+/**
+ * 描画タイムラインの再利用・作り直しのテスト（SYS-REQ-041）
+ *
+ * - 先読み範囲内で条件が変わらなければスナップショットを再利用する
+ * - 先読み範囲切れ・一定距離以上の移動・固定駅の変更・時刻表の変更・手動更新で作り直す
+ * - 位置取得・データに失敗した結果はタイムラインとして保持しない
+ * - 位置取得の失敗時は MAX_FALLBACK_AGE_MILLIS 以内に保存した位置だけを使う
+ */
+class RefreshWidgetUseCaseTest {
+
+    private class FakeTimeProvider(var now: LocalDateTime) : TimeProvider {
+        override fun now(): LocalDateTime = now
+        override fun currentDate(): LocalDate = now.toLocalDate()
+        override fun currentTime(): LocalTime = now.toLocalTime()
+        override fun currentEpochMillis(): Long = now.toInstant(ZoneOffset.ofHours(9)).toEpochMilli()
+    }
+
+    private class FakeLocationProvider(var point: GeoPoint?) : LocationProvider {
+        override suspend fun lastKnownFix(): LocationFix? =
+            point?.let { LocationFix(it, accuracyMeters = 10.0, ageMillis = 1_000L) }
+
+        override suspend fun requestFix(priority: LocationPriority, timeoutMillis: Long): LocationFix? =
+            point?.let { LocationFix(it, accuracyMeters = 10.0, ageMillis = 0L) }
+    }
+
+    private class FakeStateStore : RefreshStateStore {
+        override var lastUpdatedAtEpochMillis: Long = 0L
+        override var pinnedStationId: String? = null
+        var cached: GeoPoint? = null
+        var cachedAt: Long? = null
+
+        override fun getCachedLatitude(): Double? = cached?.latitude
+        override fun getCachedLongitude(): Double? = cached?.longitude
+        override fun getCachedAtEpochMillis(): Long? = cachedAt
+        override fun cacheLocation(lat: Double, lon: Double, atEpochMillis: Long) {
+            cached = GeoPoint(lat, lon)
+            cachedAt = atEpochMillis
+        }
+    }
+
+    private class FakeTimetableSource(var trainStamp: Long = 1L) : TimetableSource {
+        // 5:00〜23:50 の10分ごと
+        private val departures = (5..23).flatMap { hour ->
+            (0..50 step 10).map { minute -> Departure(LocalTime.of(hour, minute), "米原行") }
+        }
+        private val direction = DirectionTimetable(departures, departures)
+
+        private val timetable = TrainTimetable(
+            stations = listOf("Kusatsu", "Yasu").associateWith { id ->
+                StationTimetable(
+                    name = id,
+                    lines = mapOf("Tokaido" to LineTimetable("琵琶湖線", direction, direction))
+                )
+            }
+        )
+
+        override fun trainTimetableIdentity(): TimetableIdentity =
+            TimetableIdentity.InternalFile(sizeBytes = 100, lastModifiedMillis = trainStamp, contentHash = trainStamp)
+
+        override fun loadCompiledTrainTimetable(identity: TimetableIdentity): CompiledTrainTimetable =
+            CompiledTrainTimetable(ByteBuffer.wrap(TimetableCompiler.compileTrainTimetable(timetable, identity.stamp)))
+
+        override fun busTimetableIdentity(): TimetableIdentity = TimetableIdentity.Asset(apkVersion = 1)
+
+        override fun loadBusTimetable(): BusTimetable =
+            BusTimetable(routeName = "テスト", toYasu = direction, toMurata = direction)
+    }
+
+    private val kusatsu = LocationConstants.TOKAIDO_STATIONS.first { it.id == "Kusatsu" }.location
+    private val yasu = LocationConstants.TOKAIDO_STATIONS.first { it.id == "Yasu" }.location
+
+    private val time = FakeTimeProvider(LocalDateTime.of(2024, 1, 10, 7, 0, 30))
+    private val location = FakeLocationProvider(kusatsu)
+    private val stateStore = FakeStateStore()
+    private val source = FakeTimetableSource()
+    private val holder = RenderTimelineHolder()
+    private val useCase = RefreshWidgetUseCase(
+        timeProvider = time,
+        locationPolicy = LocationPolicy(location),
+        timetableCache = TimetableCache(source),
+        stateStore = stateStore,
+        timelineHolder = holder
+    )
+
+    private fun execute(forceRecompute: Boolean = false) = runBlocking { useCase.execute(forceRecompute) }
+
+    /** 初回の更新でタイムラインを作り、それを返す */
+    private fun buildTimeline(): RenderTimeline {
+        execute(forceRecompute = true)
+        return holder.current ?: throw AssertionError("タイムラインが保持されていません")
+    }
+
+    @Test
+    fun `先読み範囲内で条件が変わらなければスナップショットを再利用する`() {
+        val timeline = buildTimeline()
+        time.now = LocalDateTime.of(2024, 1, 10, 7, 59, 30)
+
+        val state = execute()
+
+        assertSame(timeline, holder.current)
+        assertEquals(LocalTime.of(7, 59, 1), state.currentTime)
+    }
+
+    @Test
+    fun `先読み範囲切れで作り直す`() {
+        val timeline = buildTimeline()
+        time.now = LocalDateTime.of(2024, 1, 10, 8, 0, 30)
+
+        val state = execute()
+
+        assertNotSame(timeline, holder.current)
+        assertEquals(LocalDateTime.of(2024, 1, 10, 8, 0), holder.current?.startsAt)
+        assertEquals(LocalTime.of(8, 0, 1), state.currentTime)
+    }
+
+    @Test
+    fun `移動距離が閾値以内なら再利用する`() {
+        val timeline = buildTimeline()
+        // 約100m 北
+        location.point = GeoPoint(kusatsu.latitude + 0.0009, kusatsu.longitude)
+
+        execute()
+
+        assertSame(timeline, holder.current)
+    }
+
+    @Test
+    fun `閾値を超えて移動したら作り直す`() {
+        val timeline = buildTimeline()
+        // 約300m 北
+        val moved = GeoPoint(kusatsu.latitude + 0.0027, kusatsu.longitude)
+        location.point = moved
+
+        execute()
+
+        assertNotSame(timeline, holder.current)
+        assertEquals(moved, holder.current?.anchorLocation)
+    }
+
+    @Test
+    fun `固定駅を変更したら作り直す`() {
+        val timeline = buildTimeline()
+        stateStore.pinnedStationId = "Yasu"
+
+        val state = execute()
+
+        assertNotSame(timeline, holder.current)
+        assertEquals("Yasu", holder.current?.pinnedStationId)
+        assertEquals("野洲", state.train?.stationName)
+    }
+
+    @Test
+    fun `時刻表が変わったら作り直す`() {
+        val timeline = buildTimeline()
+        source.trainStamp = 2L
+
+        execute()
+
+        assertNotSame(timeline, holder.current)
+        assertNotEquals(timeline.timetableStamp, holder.current?.timetableStamp)
+    }
+
+    @Test
+    fun `手動更新は条件が変わらなくても作り直す`() {
+        val timeline = buildTimeline()
+
+        execute(forceRecompute = true)
+
+        assertNotSame(timeline, holder.current)
+    }
+
+    @Test
+    fun `位置取得に失敗した結果は保持せず次回も作り直す`() {
+        location.point = null
+
+        val state = execute()
+
+        assertEquals("位置取得不可", state.statusMessage)
+        assertNull(holder.current)
+
+        // 位置が取れるようになった次の更新で作る
+        location.point = kusatsu
+        assertNull(execute().statusMessage)
+        assertNotNull(holder.current)
+    }
+
+    @Test
+    fun `位置取得に失敗したら最近保存した位置を使う`() {
+        location.point = yasu
+        buildTimeline()
+        location.point = null
+        time.now = LocalDateTime.of(2024, 1, 10, 7, 20, 30)
+
+        val state = execute(forceRecompute = true)
+
+        assertEquals("位置取得不可", state.statusMessage)
+        assertEquals("野洲", state.train?.stationName)
+    }
+
+    @Test
+    fun `古い保存済みの位置は位置取得の失敗時に使わない`() {
+        location.point = yasu
+        buildTimeline()
+        location.point = null
+        time.now = LocalDateTime.of(2024, 1, 10, 7, 40, 30)
+
+        val state = execute(forceRecompute = true)
+
+        // 位置なしなので時刻表の最初の駅になる
+        assertEquals("位置取得不可", state.statusMessage)
+        assertEquals("草津", state.train?.stationName)
+    }
+
+    @Test
+    fun `作り直しが必要になった時点で古いタイムラインは破棄する`() {
+        buildTimeline()
+        location.point = null
+        time.now = LocalDateTime.of(2024, 1, 10, 8, 0, 30)
+
+        execute()
+
+        assertNull(holder.current)
+    }
+}
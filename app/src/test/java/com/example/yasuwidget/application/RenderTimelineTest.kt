@@ -0,0 +1,56 @@
+package com.example.yasuwidget.application
+
+import com.example.yasuwidget.domain.model.DisplayMode
+import com.example.yasuwidget.domain.model.WidgetUiState
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertNull
+import org.junit.Test
+import java.time.LocalDateTime
+import java.time.LocalTime
+
+/**
+ * 描画タイムラインのテスト
+ *
+ * - 時刻を含む分のスナップショットを返す
+ * - 先読み範囲外は null（作り直しが必要）
+ */
+class RenderTimelineTest {
+
+    private val startsAt = LocalDateTime.of(2024, 1, 5, 7, 10)
+
+    private fun snapshot(minute: Int): WidgetUiState = WidgetUiState(
+        mode = DisplayMode.TRAIN_ONLY,
+        headerTitle = "最寄:野洲駅",
+        train = null,
+        bus = null,
+        lastUpdatedAtText = "更新 07:%02d".format(minute),
+        statusMessage = null,
+        currentTime = LocalTime.of(7, minute)
+    )
+
+    private val timeline = RenderTimeline(
+        startsAt = startsAt,
+        snapshots = List(3) { snapshot(10 + it) },
+        anchorLocation = null,
+        pinnedStationId = null,
+        timetableStamp = 1L
+    )
+
+    @Test
+    fun `分の途中でもその分のスナップショットを返す`() {
+        assertEquals(snapshot(10), timeline.snapshotAt(startsAt))
+        assertEquals(snapshot(11), timeline.snapshotAt(LocalDateTime.of(2024, 1, 5, 7, 11, 59)))
+        assertEquals(snapshot(12), timeline.snapshotAt(LocalDateTime.of(2024, 1, 5, 7, 12, 1)))
+    }
+
+    @Test
+    fun `先読み範囲の終端以降はnullを返す`() {
+        assertEquals(LocalDateTime.of(2024, 1, 5, 7, 13), timeline.endsAt)
+        assertNull(timeline.snapshotAt(LocalDateTime.of(2024, 1, 5, 7, 13)))
+    }
+
+    @Test
+    fun `先頭より前の時刻はnullを返す`() {
+        assertNull(timeline.snapshotAt(LocalDateTime.of(2024, 1, 5, 7, 9, 59)))
+    }
+}
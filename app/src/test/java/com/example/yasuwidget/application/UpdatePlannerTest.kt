@@ -0,0 +1,133 @@
+package com.example.yasuwidget.application
+
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DisplayMode
+import com.example.yasuwidget.domain.model.TrainSection
+import com.example.yasuwidget.domain.model.WidgetUiState
+import com.example.yasuwidget.infrastructure.time.TimeProvider
+import org.junit.Assert.assertEquals
+import org.junit.Test
+import java.time.LocalDate
+import java.time.LocalDateTime
+import java.time.LocalTime
+import java.time.ZoneOffset
+
+/**
+ * 次回更新時刻の計画テスト（SYS-REQ-041）
+ *
+ * - 直近の便が近ければ毎分更新
+ * - 遠ければ疎な更新、便が近づいた時点で毎分更新に戻る
+ * - 運行日の切り替わりで更新
+ * - 取得失敗時は次の分に再試行
+ */
+class UpdatePlannerTest {
+
+    private class FakeTimeProvider(private val now: LocalDateTime) : TimeProvider {
+        override fun now(): LocalDateTime = now
+        override fun currentDate(): LocalDate = now.toLocalDate()
+        override fun currentTime(): LocalTime = now.toLocalTime()
+        override fun currentEpochMillis(): Long = now.toInstant(ZoneOffset.ofHours(9)).toEpochMilli()
+    }
+
+    private fun stateWithTrains(vararg times: LocalTime): WidgetUiState = WidgetUiState(
+        mode = DisplayMode.TRAIN_ONLY,
+        headerTitle = "最寄:野洲駅",
+        train = TrainSection(
+            stationName = "野洲",
+            lineName = "琵琶湖線",
+            up = times.map { Departure(it, "米原行") },
+            down = emptyList()
+        ),
+        bus = null,
+        lastUpdatedAtText = "",
+        statusMessage = null,
+        currentTime = LocalTime.MIDNIGHT
+    )
+
+    private fun plan(now: LocalDateTime, state: WidgetUiState): UpdatePlan =
+        UpdatePlanner(FakeTimeProvider(now)).planNext(state)
+
+    @Test
+    fun `直近の便が近いときは次の分の境界で更新する`() {
+        val result = plan(
+            LocalDateTime.of(2024, 1, 5, 7, 10, 30),
+            stateWithTrains(LocalTime.of(7, 20))
+        )
+        assertEquals(LocalDateTime.of(2024, 1, 5, 7, 11, 1), result.triggerAt)
+        assertEquals(UpdateReason.COUNTDOWN, result.reason)
+        assertEquals(0, result.wakeupsAvoided)
+    }
+
+    @Test
+    fun `直近の便が遠いときは疎な間隔で更新する`() {
+        val result = plan(
+            LocalDateTime.of(2024, 1, 5, 7, 0),
+            stateWithTrains(LocalTime.of(8, 0))
+        )
+        assertEquals(LocalDateTime.of(2024, 1, 5, 7, 10, 1), result.triggerAt)
+        assertEquals(UpdateReason.SPARSE, result.reason)
+        assertEquals(9, result.wakeupsAvoided)
+    }
+
+    @Test
+    fun `便が毎分更新の範囲に入る時刻で更新する`() {
+        val result = plan(
+            LocalDateTime.of(2024, 1, 5, 7, 0),
+            stateWithTrains(LocalTime.of(7, 20))
+        )
+        assertEquals(LocalDateTime.of(2024, 1, 5, 7, 5, 1), result.triggerAt)
+        assertEquals(UpdateReason.NEAR_DEPARTURE, result.reason)
+    }
+
+    @Test
+    fun `終電後は運行日の切り替わりで更新する`() {
+        // 始発 5:08 より先に運行日が切り替わる
+        val result = plan(
+            LocalDateTime.of(2024, 1, 6, 2, 55),
+            stateWithTrains(LocalTime.of(5, 8))
+        )
+        assertEquals(LocalDateTime.of(2024, 1, 6, 3, 0, 1), result.triggerAt)
+        assertEquals(UpdateReason.SERVICE_DAY_ROLLOVER, result.reason)
+    }
+
+    @Test
+    fun `日付を跨ぐ便は翌日の発車時刻として扱う`() {
+        val result = plan(
+            LocalDateTime.of(2024, 1, 5, 23, 30),
+            stateWithTrains(LocalTime.of(0, 4))
+        )
+        // 0:04 - 15分 = 23:49 より前に疎な更新が来る
+        assertEquals(LocalDateTime.of(2024, 1, 5, 23, 40, 1), result.triggerAt)
+        assertEquals(UpdateReason.SPARSE, result.reason)
+    }
+
+    @Test
+    fun `表示する便がなければ疎な間隔で更新する`() {
+        val result = plan(
+            LocalDateTime.of(2024, 1, 5, 12, 0, 45),
+            stateWithTrains()
+        )
+        assertEquals(LocalDateTime.of(2024, 1, 5, 12, 10, 1), result.triggerAt)
+        assertEquals(556_000L, result.delayMillis)
+    }
+
+    @Test
+    fun `取得に失敗した状態は便が遠くても次の分に再試行する`() {
+        val result = plan(
+            LocalDateTime.of(2024, 1, 5, 7, 0, 30),
+            stateWithTrains(LocalTime.of(8, 0)).copy(statusMessage = "位置取得不可")
+        )
+        assertEquals(LocalDateTime.of(2024, 1, 5, 7, 1, 1), result.triggerAt)
+        assertEquals(UpdateReason.RETRY, result.reason)
+        assertEquals(0, result.wakeupsAvoided)
+    }
+
+    @Test
+    fun `データ未登録の状態は分の境界ちょうどでも次の分に再試行する`() {
+        val state = stateWithTrains().copy(train = null, statusMessage = "データ未登録")
+        val result = plan(LocalDateTime.of(2024, 1, 5, 12, 0), state)
+        assertEquals(LocalDateTime.of(2024, 1, 5, 12, 1, 1), result.triggerAt)
+        assertEquals(UpdateReason.RETRY, result.reason)
+        assertEquals(0, result.wakeupsAvoided)
+    }
+}
@@ -0,0 +1,51 @@
+package com.example.yasuwidget.domain.service
+
+import com.example.yasuwidget.domain.constants.LocationConstants
+import com.example.yasuwidget.domain.model.GeoPoint
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertTrue
+import org.junit.Test
+
+/**
+ * 判定境界までの余裕距離のテスト
+ *
+ * - 村田2km・野洲1kmの円の境界までの距離
+ * - 最寄り駅の判定が変わる境界（2駅の中間）までの距離
+ */
+class DecisionMarginCalculatorTest {
+
+    private val kyoto = LocationConstants.TOKAIDO_STATIONS.first { it.id == "Kyoto" }
+    private val nishiOji = LocationConstants.TOKAIDO_STATIONS.first { it.id == "NishiOji" }
+
+    @Test
+    fun `野洲駅では野洲1km円の境界までの距離になる`() {
+        val margin = DecisionMarginCalculator.marginMeters(LocationConstants.YASU_STATION, emptyList())
+        assertEquals(LocationConstants.YASU_RADIUS_METERS, margin, 1.0)
+    }
+
+    @Test
+    fun `固定駅なら円から遠い地点の余裕距離は大きい`() {
+        val margin = DecisionMarginCalculator.marginMeters(kyoto.location, emptyList())
+        assertTrue("margin=$margin", margin > 20_000.0)
+    }
+
+    @Test
+    fun `最寄り駅の判定対象があれば2駅の距離差の半分が上限になる`() {
+        val margin = DecisionMarginCalculator.marginMeters(
+            kyoto.location,
+            LocationConstants.TOKAIDO_STATIONS
+        )
+        val expected = GeoUtils.distanceMeters(kyoto.location, nishiOji.location) / 2
+        assertEquals(expected, margin, 1.0)
+    }
+
+    @Test
+    fun `2駅の中間では余裕距離がほぼ0になる`() {
+        val midpoint = GeoPoint(
+            (kyoto.location.latitude + nishiOji.location.latitude) / 2,
+            (kyoto.location.longitude + nishiOji.location.longitude) / 2
+        )
+        val margin = DecisionMarginCalculator.marginMeters(midpoint, LocationConstants.TOKAIDO_STATIONS)
+        assertEquals(0.0, margin, 10.0)
+    }
+}
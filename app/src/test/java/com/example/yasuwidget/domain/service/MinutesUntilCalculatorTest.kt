@@ -71,4 +71,29 @@ class MinutesUntilCalculatorTest {
         )
         assertEquals(0, result)
     }
+
+    @Test
+    fun `calculateUpcomingは日付を跨ぐ便を翌日として数える`() {
+        val result = MinutesUntilCalculator.calculateUpcoming(
+            LocalTime.of(23, 50), LocalTime.of(0, 4)
+        )
+        assertEquals(14, result)
+    }
+
+    @Test
+    fun `calculateUpcomingは秒の端数があっても日付を跨ぐ便を切り捨てで数える`() {
+        // 23:50:30 → 0:04:00 は 13分30秒
+        val result = MinutesUntilCalculator.calculateUpcoming(
+            LocalTime.of(23, 50, 30), LocalTime.of(0, 4)
+        )
+        assertEquals(13, result)
+    }
+
+    @Test
+    fun `calculateUpcomingは同日の便をcalculateと同じく数える`() {
+        val result = MinutesUntilCalculator.calculateUpcoming(
+            LocalTime.of(7, 12, 30), LocalTime.of(7, 15, 0)
+        )
+        assertEquals(2, result)
+    }
 }
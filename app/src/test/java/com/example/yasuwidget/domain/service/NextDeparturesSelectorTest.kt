@@ -5,6 +5,7 @@ import com.example.yasuwidget.domain.model.DirectionTimetable
 import com.example.yasuwidget.domain.model.ServiceDay
 import org.junit.Assert.assertEquals
 import org.junit.Test
+import java.time.LocalDateTime
 import java.time.LocalTime
 
 /**
@@ -100,4 +101,72 @@ class NextDeparturesSelectorTest {
         assertEquals(1, result.size)
         assertEquals(LocalTime.of(7, 12), result[0].time)
     }
+
+    @Test
+    fun `秒の端数がある場合は同じ分の便は発車済みとして除外する`() {
+        val result = NextDeparturesSelector.select(
+            timetable, ServiceDay.WEEKDAY, LocalTime.of(7, 12, 30), 1
+        )
+        assertEquals(LocalTime.of(7, 25), result[0].time)
+    }
+
+    // --- 日付を跨ぐ便 ---
+
+    private val lateNightTimetable = DirectionTimetable(
+        weekday = listOf(
+            Departure(LocalTime.of(0, 4), "米原行"),
+            Departure(LocalTime.of(0, 31), "米原行"),
+            Departure(LocalTime.of(5, 8), "米原行"),
+            Departure(LocalTime.of(23, 50), "米原行")
+        ),
+        holiday = listOf(
+            Departure(LocalTime.of(0, 4), "米原行"),
+            Departure(LocalTime.of(6, 0), "網干行")
+        )
+    )
+
+    @Test
+    fun `0時台の深夜便は当日の最終便の後に並ぶ`() {
+        val result = NextDeparturesSelector.select(
+            lateNightTimetable, ServiceDay.WEEKDAY, LocalTime.of(23, 45), 3
+        )
+        assertEquals(
+            listOf(LocalTime.of(23, 50), LocalTime.of(0, 4), LocalTime.of(0, 31)),
+            result.map { it.time }
+        )
+    }
+
+    @Test
+    fun `0時過ぎは前日の運行日の深夜便を返す`() {
+        // 2024-01-05(金) 00:10 → 運行日は 2024-01-04(木) = 平日
+        val result = NextDeparturesSelector.selectAcrossServiceDays(
+            lateNightTimetable, LocalDateTime.of(2024, 1, 5, 0, 10), 1
+        )
+        assertEquals(LocalTime.of(0, 31), result[0].time)
+    }
+
+    @Test
+    fun `当日の便が足りなければ翌運行日の始発から補う`() {
+        // 2024-01-05(金) 23:55 → 翌運行日は土曜 = 休日
+        val result = NextDeparturesSelector.selectAcrossServiceDays(
+            lateNightTimetable, LocalDateTime.of(2024, 1, 5, 23, 55), 3
+        )
+        assertEquals(
+            listOf(LocalTime.of(0, 4), LocalTime.of(0, 31), LocalTime.of(6, 0)),
+            result.map { it.time }
+        )
+        assertEquals("網干行", result[2].destination)
+    }
+
+    @Test
+    fun `終電後の深夜は翌運行日の始発を返す`() {
+        // 2024-01-06(土) 01:00 → 金曜の運行は終了、土曜(休日)の始発
+        val result = NextDeparturesSelector.selectAcrossServiceDays(
+            lateNightTimetable, LocalDateTime.of(2024, 1, 6, 1, 0), 2
+        )
+        assertEquals(
+            listOf(LocalTime.of(6, 0), LocalTime.of(0, 4)),
+            result.map { it.time }
+        )
+    }
 }
@@ -0,0 +1,201 @@
+package com.example.yasuwidget.infrastructure.location
+
+import com.example.yasuwidget.domain.constants.LocationConstants
+import com.example.yasuwidget.domain.model.GeoPoint
+import kotlinx.coroutines.awaitCancellation
+import kotlinx.coroutines.runBlocking
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * 位置取得方針のテスト（SYS-REQ-042）
+ *
+ * - 新しく精度の足りる直近の位置はそのまま使う
+ * - 判定境界までの余裕に応じて最も安い優先度を選ぶ
+ * - 能動的な取得は上限時間で打ち切り、保存済みの位置にフォールバックする
+ * - 取得した位置の精度が足りなければ1段高い優先度で取り直し、それでも足りなければ保存済みの位置よりその位置を使う
+ */
+class LocationPolicyTest {
+
+    private class FakeLocationProvider(
+        var lastKnown: LocationFix? = null,
+        var active: LocationFix? = null,
+        var hang: Boolean = false,
+        var activeByPriority: Map<LocationPriority, LocationFix> = emptyMap()
+    ) : LocationProvider {
+        val requestedPriorities = mutableListOf<LocationPriority>()
+
+        override suspend fun lastKnownFix(): LocationFix? = lastKnown
+
+        override suspend fun requestFix(priority: LocationPriority, timeoutMillis: Long): LocationFix? {
+            requestedPriorities.add(priority)
+            if (hang) awaitCancellation()
+            return activeByPriority[priority] ?: active
+        }
+    }
+
+    private val stations = LocationConstants.TOKAIDO_STATIONS
+    private val kyoto = stations.first { it.id == "Kyoto" }.location
+    private val nishiOji = stations.first { it.id == "NishiOji" }.location
+
+    /** 京都と西大路の中間（最寄り駅の判定境界上） */
+    private val midpoint = GeoPoint(
+        (kyoto.latitude + nishiOji.latitude) / 2,
+        (kyoto.longitude + nishiOji.longitude) / 2
+    )
+    private val cached = GeoPoint(35.0, 136.0)
+
+    private fun fix(point: GeoPoint, accuracyMeters: Double = 20.0, ageMillis: Long = 10_000L) =
+        LocationFix(point, accuracyMeters, ageMillis)
+
+    @Test
+    fun `新しく精度の足りる直近の位置はそのまま使う`() = runBlocking {
+        val provider = FakeLocationProvider(lastKnown = fix(kyoto))
+        val result = LocationPolicy(provider).acquire(stations) { cached }
+
+        assertEquals(kyoto, result.point)
+        assertEquals(LocationSource.LAST_KNOWN, result.source)
+        assertTrue(result.isFresh)
+        assertTrue(provider.requestedPriorities.isEmpty())
+    }
+
+    @Test
+    fun `精度が粗くても判定境界から十分遠ければ直近の位置を使う`() = runBlocking {
+        val provider = FakeLocationProvider(lastKnown = fix(kyoto, accuracyMeters = 1_500.0))
+        val result = LocationPolicy(provider).acquire(emptyList()) { cached }
+
+        assertEquals(LocationSource.LAST_KNOWN, result.source)
+    }
+
+    @Test
+    fun `精度が粗く判定境界に近ければ能動的に取得する`() = runBlocking {
+        val provider = FakeLocationProvider(
+            lastKnown = fix(LocationConstants.YASU_STATION, accuracyMeters = 1_500.0),
+            active = fix(LocationConstants.YASU_STATION, ageMillis = 0L)
+        )
+        val result = LocationPolicy(provider).acquire(emptyList()) { cached }
+
+        assertEquals(LocationSource.ACTIVE, result.source)
+        assertEquals(1, provider.requestedPriorities.size)
+    }
+
+    @Test
+    fun `古い直近の位置が判定境界から遠ければLOW_POWERで取得する`() = runBlocking {
+        val provider = FakeLocationProvider(
+            lastKnown = fix(kyoto, ageMillis = 3 * 60_000L),
+            active = fix(kyoto, ageMillis = 0L)
+        )
+        LocationPolicy(provider).acquire(emptyList()) { cached }
+
+        assertEquals(listOf(LocationPriority.LOW_POWER), provider.requestedPriorities)
+    }
+
+    @Test
+    fun `最寄り駅の判定境界に近ければHIGH_ACCURACYを選ぶ`() {
+        val policy = LocationPolicy(FakeLocationProvider())
+
+        assertEquals(
+            LocationPriority.HIGH_ACCURACY,
+            policy.choosePriority(fix(midpoint, ageMillis = 3 * 60_000L), stations)
+        )
+    }
+
+    @Test
+    fun `駅の判定が必要で境界まで余裕があればBALANCEDを選ぶ`() {
+        val policy = LocationPolicy(FakeLocationProvider())
+
+        assertEquals(
+            LocationPriority.BALANCED,
+            policy.choosePriority(fix(kyoto, ageMillis = 0L), stations)
+        )
+    }
+
+    @Test
+    fun `参考にできる直近の位置がなければBALANCEDを選ぶ`() {
+        val policy = LocationPolicy(FakeLocationProvider())
+
+        assertEquals(LocationPriority.BALANCED, policy.choosePriority(null, stations))
+        assertEquals(
+            LocationPriority.BALANCED,
+            policy.choosePriority(fix(kyoto, ageMillis = 60 * 60_000L), emptyList())
+        )
+    }
+
+    @Test
+    fun `能動的な取得が上限時間を超えたら保存済みの位置を使う`() = runBlocking {
+        val provider = FakeLocationProvider(hang = true)
+        val result = LocationPolicy(provider, activeTimeoutMillis = 50L).acquire(stations) { cached }
+
+        assertEquals(cached, result.point)
+        assertEquals(LocationSource.CACHED, result.source)
+        assertFalse(result.isFresh)
+    }
+
+    @Test
+    fun `保存済みの位置もなければ位置なし`() = runBlocking {
+        val result = LocationPolicy(FakeLocationProvider()).acquire(stations) { null }
+
+        assertNull(result.point)
+        assertEquals(LocationSource.NONE, result.source)
+    }
+
+    @Test
+    fun `取得した位置の精度が足りなければ1段高い優先度で取り直す`() = runBlocking {
+        val provider = FakeLocationProvider(
+            activeByPriority = mapOf(
+                LocationPriority.BALANCED to fix(midpoint, accuracyMeters = 5_000.0, ageMillis = 0L),
+                LocationPriority.HIGH_ACCURACY to fix(midpoint, accuracyMeters = 10.0, ageMillis = 0L)
+            )
+        )
+        val result = LocationPolicy(provider).acquire(stations) { cached }
+
+        assertEquals(listOf(LocationPriority.BALANCED, LocationPriority.HIGH_ACCURACY), provider.requestedPriorities)
+        assertEquals(LocationSource.ACTIVE, result.source)
+        assertEquals(LocationPriority.HIGH_ACCURACY, result.priority)
+    }
+
+    @Test
+    fun `精度の足りない位置しか取れず保存済みの位置もなければその位置を使う`() = runBlocking {
+        val provider = FakeLocationProvider(active = fix(midpoint, accuracyMeters = 5_000.0, ageMillis = 0L))
+        val result = LocationPolicy(provider).acquire(stations) { null }
+
+        assertEquals(midpoint, result.point)
+        assertEquals(LocationSource.ACTIVE, result.source)
+        assertTrue(result.isFresh)
+        assertEquals(listOf(LocationPriority.BALANCED, LocationPriority.HIGH_ACCURACY), provider.requestedPriorities)
+    }
+
+    @Test
+    fun `精度の足りない位置しか取れなくても保存済みの位置より優先する`() = runBlocking {
+        val provider = FakeLocationProvider(active = fix(midpoint, accuracyMeters = 5_000.0, ageMillis = 0L))
+        val result = LocationPolicy(provider).acquire(stations) { cached }
+
+        assertEquals(midpoint, result.point)
+        assertEquals(LocationSource.ACTIVE, result.source)
+        assertTrue(result.isFresh)
+    }
+
+    @Test
+    fun `取得元と所要時間を記録する`() = runBlocking {
+        var now = 0L
+        val policy = LocationPolicy(
+            FakeLocationProvider(lastKnown = fix(kyoto)),
+            nanoTime = { now += 2_000_000L; now }
+        )
+
+        val result = policy.acquire(stations) { cached }
+        policy.acquire(stations) { cached }
+
+        assertEquals(2L, result.latencyMillis)
+        val stats = policy.stats()
+        assertEquals(2L, stats.sourceCounts[LocationSource.LAST_KNOWN])
+        assertEquals(0L, stats.sourceCounts[LocationSource.ACTIVE])
+        assertEquals(4L, stats.totalLatencyMillis)
+        assertEquals(2.0, stats.averageLatencyMillis, 0.0)
+    }
+
+    @Test
+    fun `取得していなければ平均所要時間は0`() {
+        assertEquals(0.0, LocationPolicy(FakeLocationProvider()).stats().averageLatencyMillis, 0.0)
+    }
+}
@@ -0,0 +1,153 @@
+package com.example.yasuwidget.infrastructure.timetable
+
+import com.example.yasuwidget.domain.model.BusTimetable
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DirectionTimetable
+import com.example.yasuwidget.domain.model.LineTimetable
+import com.example.yasuwidget.domain.model.StationTimetable
+import com.example.yasuwidget.domain.model.TrainTimetable
+import org.junit.Assert.*
+import org.junit.Test
+import java.nio.ByteBuffer
+import java.time.LocalTime
+
+/**
+ * 時刻表キャッシュのテスト
+ * - 同一入力では再読込しない
+ * - 入力の内容が変わったら破棄する
+ * - メモリ上限を超えたら古い駅から破棄する
+ */
+class TimetableCacheTest {
+
+    private class FakeTimetableSource(var trainStamp: Long = 1L) : TimetableSource {
+        var compileCount = 0
+        var busLoadCount = 0
+
+        private val timetable = TrainTimetable(
+            stations = listOf("Kusatsu", "Moriyama", "Yasu").associateWith { id ->
+                val departures = List(10) { Departure(LocalTime.of(7, it), "米原行") }
+                StationTimetable(
+                    name = id,
+                    lines = mapOf(
+                        "Tokaido" to LineTimetable(
+                            name = "琵琶湖線",
+                            up = DirectionTimetable(departures, emptyList()),
+                            down = DirectionTimetable(emptyList(), emptyList())
+                        )
+                    )
+                )
+            }
+        )
+
+        override fun trainTimetableIdentity(): TimetableIdentity =
+            TimetableIdentity.InternalFile(sizeBytes = 100, lastModifiedMillis = trainStamp, contentHash = trainStamp)
+
+        override fun loadCompiledTrainTimetable(identity: TimetableIdentity): CompiledTrainTimetable {
+            compileCount++
+            val bytes = TimetableCompiler.compileTrainTimetable(timetable, identity.stamp)
+            return CompiledTrainTimetable(ByteBuffer.wrap(bytes))
+        }
+
+        override fun busTimetableIdentity(): TimetableIdentity = TimetableIdentity.Asset(apkVersion = 1)
+
+        override fun loadBusTimetable(): BusTimetable {
+            busLoadCount++
+            val empty = DirectionTimetable(emptyList(), emptyList())
+            return BusTimetable(routeName = "テスト", toYasu = empty, toMurata = empty)
+        }
+    }
+
+    @Test
+    fun `同一入力の2回目以降はヒットし再読込しない`() {
+        val source = FakeTimetableSource()
+        val cache = TimetableCache(source)
+
+        val first = cache.trainStation("Yasu")
+        val second = cache.trainStation("Yasu")
+        cache.busTimetable()
+        cache.busTimetable()
+
+        assertSame(first, second)
+        assertEquals(1, source.compileCount)
+        assertEquals(1, source.busLoadCount)
+        assertEquals(2L, cache.stats().hits)
+    }
+
+    @Test
+    fun `内容が変わると駅エントリを破棄して開き直す`() {
+        val source = FakeTimetableSource()
+        val cache = TimetableCache(source)
+
+        val first = cache.trainStation("Yasu")
+        source.trainStamp = 2L
+        val second = cache.trainStation("Yasu")
+
+        assertNotSame(first, second)
+        assertEquals(2, source.compileCount)
+        assertEquals(1, cache.stats().residentStations)
+    }
+
+    @Test
+    fun `上限を超えると最も古く参照された駅から破棄する`() {
+        // 1駅分（512 + 10 * 64 = 1152 バイト）の2倍強を上限にする
+        val cache = TimetableCache(FakeTimetableSource(), maxBytes = 2500)
+
+        cache.trainStation("Kusatsu")
+        cache.trainStation("Moriyama")
+        cache.trainStation("Kusatsu")
+        cache.trainStation("Yasu")
+
+        val stats = cache.stats()
+        assertEquals(2, stats.residentStations)
+        assertEquals(1L, stats.evictions)
+
+        // Moriyama が破棄されているので再デコードになる
+        val missesBefore = stats.misses
+        cache.trainStation("Kusatsu")
+        assertEquals(missesBefore, cache.stats().misses)
+        cache.trainStation("Moriyama")
+        assertEquals(missesBefore + 1, cache.stats().misses)
+    }
+
+    @Test
+    fun `ウォームアップ後の参照はヒットする`() {
+        val source = FakeTimetableSource()
+        val cache = TimetableCache(source)
+
+        cache.warmUp(listOf("Yasu"))
+        val missesAfterWarmUp = cache.stats().misses
+        cache.trainStation("Yasu")
+        cache.busTimetable()
+
+        assertEquals(missesAfterWarmUp, cache.stats().misses)
+        assertEquals(2L, cache.stats().hits)
+    }
+
+    @Test
+    fun `読込時間は注入した時計で計測する`() {
+        var now = 0L
+        val cache = TimetableCache(FakeTimetableSource(), nanoTime = { now += 5; now })
+
+        cache.busTimetable()
+
+        assertEquals(5L, cache.stats().loadTimeNanos)
+    }
+
+    @Test
+    fun `入力の同一性は読込せずに取得し内容が変わると変わる`() {
+        val source = FakeTimetableSource()
+        val cache = TimetableCache(source)
+
+        val before = cache.sourceStamp()
+        source.trainStamp = 2L
+
+        assertNotEquals(before, cache.sourceStamp())
+        assertEquals(0, source.compileCount)
+        assertEquals(0L, cache.stats().misses)
+    }
+
+    @Test
+    fun `参照がなければヒット率は0`() {
+        assertEquals(0.0, TimetableCache(FakeTimetableSource()).stats().hitRate, 0.0)
+    }
+}
@@ -0,0 +1,116 @@
+package com.example.yasuwidget.infrastructure.timetable
+
+import org.junit.Assert.*
+import org.junit.Test
+import java.nio.ByteBuffer
+import java.time.LocalTime
+
+/**
+ * 電車時刻表バイナリ形式のテスト（DATA-REQ-001）
+ * コンパイル → 読み出しでパース結果と同じ内容が得られること
+ */
+class TimetableCompilerTest {
+
+    private val json = """
+    {
+      "stations": {
+        "Moriyama": {
+          "name": "守山",
+          "lines": {
+            "Tokaido": {
+              "name": "琵琶湖線",
+              "up": {
+                "weekday": [
+                  { "time": "00:04", "destination": "米原行", "type": "快速" },
+                  { "time": "07:12", "destination": "米原行", "type": "新快速" }
+                ],
+                "holiday": []
+              },
+              "down": {
+                "weekday": [
+                  { "time": "23:59", "destination": "姫路行" }
+                ],
+                "holiday": [
+                  { "time": "08:00", "destination": "網干行", "type": "普通" }
+                ]
+              }
+            }
+          }
+        },
+        "Yasu": {
+          "name": "野洲",
+          "lines": {
+            "Tokaido": {
+              "name": "琵琶湖線",
+              "up": {
+                "weekday": [
+                  { "time": "07:20", "destination": "米原行", "type": "普通" }
+                ],
+                "holiday": []
+              },
+              "down": { "weekday": [], "holiday": [] }
+            }
+          }
+        }
+      }
+    }
+    """.trimIndent()
+
+    private fun compile(stamp: Long = 42L): CompiledTrainTimetable {
+        val bytes = TimetableCompiler.compileTrainTimetable(json, stamp)
+        return CompiledTrainTimetable(ByteBuffer.wrap(bytes))
+    }
+
+    @Test
+    fun `コンパイル結果から駅一覧とスタンプを読み出せる`() {
+        val compiled = compile(stamp = -123L)
+        assertEquals(listOf("Moriyama", "Yasu"), compiled.stationIds.toList())
+        assertEquals(-123L, compiled.sourceStamp)
+    }
+
+    @Test
+    fun `駅単位のデコード結果がパース結果と一致する`() {
+        val parsed = TimetableParser.parseTrainTimetable(json)
+        val compiled = compile()
+        assertEquals(parsed.stations["Moriyama"], compiled.loadStation("Moriyama"))
+        assertEquals(parsed.stations["Yasu"], compiled.loadStation("Yasu"))
+    }
+
+    @Test
+    fun `日付を跨ぐ時刻と省略された種別を保持する`() {
+        val tokaido = compile().loadStation("Moriyama")!!.lines["Tokaido"]!!
+        assertEquals(LocalTime.of(0, 4), tokaido.up.weekday[0].time)
+        assertEquals(LocalTime.of(23, 59), tokaido.down.weekday[0].time)
+        assertEquals("", tokaido.down.weekday[0].trainType)
+        assertEquals("普通", tokaido.down.holiday[0].trainType)
+    }
+
+    @Test
+    fun `存在しない駅はnullを返す`() {
+        assertNull(compile().loadStation("Kyoto"))
+    }
+
+    @Test
+    fun `不正なJSONはコンパイル時にエラー`() {
+        assertThrows(TimetableParseException::class.java) {
+            TimetableCompiler.compileTrainTimetable("""{ "stations": {} }""", 0L)
+        }
+    }
+
+    @Test
+    fun `magicが一致しないバイナリはエラー`() {
+        val bytes = TimetableCompiler.compileTrainTimetable(json, 0L)
+        bytes[0] = 0
+        assertThrows(TimetableParseException::class.java) {
+            CompiledTrainTimetable(ByteBuffer.wrap(bytes))
+        }
+    }
+
+    @Test
+    fun `途中で切れたバイナリはエラー`() {
+        val bytes = TimetableCompiler.compileTrainTimetable(json, 0L)
+        assertThrows(TimetableParseException::class.java) {
+            CompiledTrainTimetable(ByteBuffer.wrap(bytes.copyOf(30)))
+        }
+    }
+}
@@ -0,0 +1,116 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * 段階ごとの計測と集計のテスト
+ */
+class StageTimerTest {
+
+    private class RecordingSections : TraceSections {
+        val events = mutableListOf<String>()
+        override fun begin(name: String) {
+            events.add("begin:$name")
+        }
+        override fun end() {
+            events.add("end")
+        }
+        override fun beginAsync(name: String, cookie: Int) {
+            events.add("beginAsync:$name:$cookie")
+        }
+        override fun endAsync(name: String, cookie: Int) {
+            events.add("endAsync:$name:$cookie")
+        }
+    }
+
+    @Test
+    fun `同じ段階の計測は合計し実行しなかった段階はnull`() {
+        var now = 0L
+        val timer = StageTimer(nanoTime = { now })
+
+        timer.measure(TraceStage.TIMETABLE) { now += 100 }
+        timer.measure(TraceStage.TIMETABLE) { now += 50 }
+
+        assertEquals(150L, timer.stageNanos(TraceStage.TIMETABLE))
+        assertNull(timer.stageNanos(TraceStage.LOCATION))
+        assertEquals(150L, timer.elapsedNanos())
+    }
+
+    @Test
+    fun `中断する段階は同じcookieの非同期区間として出力する`() {
+        var now = 0L
+        val sections = RecordingSections()
+        val timer = StageTimer(sections, nanoTime = { now })
+
+        timer.measureSuspending(TraceStage.LOCATION) { now += 30 }
+        timer.measureSuspending(TraceStage.LOCATION) { now += 20 }
+
+        assertEquals(50L, timer.stageNanos(TraceStage.LOCATION))
+        val name = TraceStage.LOCATION.sectionName
+        val cookies = sections.events.map { it.substringAfterLast(':') }
+        assertEquals(
+            listOf("beginAsync:$name:${cookies[0]}", "endAsync:$name:${cookies[0]}",
+                   "beginAsync:$name:${cookies[2]}", "endAsync:$name:${cookies[2]}"),
+            sections.events
+        )
+        assertNotEquals(cookies[0], cookies[2])
+    }
+
+    @Test
+    fun `例外が発生しても計測しトレース区間を閉じる`() {
+        var now = 0L
+        val sections = RecordingSections()
+        val timer = StageTimer(sections, nanoTime = { now })
+
+        assertThrows(IllegalStateException::class.java) {
+            timer.measure(TraceStage.RENDER) {
+                now += 10
+                throw IllegalStateException()
+            }
+        }
+
+        assertEquals(10L, timer.stageNanos(TraceStage.RENDER))
+        assertEquals(listOf("begin:${TraceStage.RENDER.sectionName}", "end"), sections.events)
+    }
+
+    @Test
+    fun `分位点は最近接順位法で求める`() {
+        val values = (1L..20L).toList()
+        assertEquals(Percentiles(p50 = 10L, p95 = 19L), Percentiles.of(values))
+        assertEquals(Percentiles(p50 = 7L, p95 = 7L), Percentiles.of(listOf(7L)))
+        assertNull(Percentiles.of(emptyList()))
+    }
+
+    @Test
+    fun `集計は段階を実行した更新だけで求める`() {
+        val records = listOf(
+            TraceRecord(1L, alarmDriftMillis = 400L, totalMicros = 100L, stageMicros = mapOf(TraceStage.TIMELINE to 5L)),
+            TraceRecord(2L, alarmDriftMillis = null, totalMicros = 9_000L, stageMicros = mapOf(TraceStage.LOCATION to 8_000L))
+        )
+
+        val summary = TraceSummary.of(records)
+
+        assertEquals(2, summary.count)
+        assertEquals(Percentiles(5L, 5L), summary.stages[TraceStage.TIMELINE])
+        assertEquals(Percentiles(8_000L, 8_000L), summary.stages[TraceStage.LOCATION])
+        assertNull(summary.stages[TraceStage.SELECT])
+        assertEquals(Percentiles(400L, 400L), summary.alarmDrift)
+    }
+
+    @Test
+    fun `集計は失敗・打ち切りの更新も所要時間に含めて数える`() {
+        val records = listOf(
+            TraceRecord(1L, alarmDriftMillis = null, totalMicros = 100L, stageMicros = emptyMap()),
+            TraceRecord(2L, null, totalMicros = 200L, stageMicros = emptyMap(), outcome = TraceOutcome.FAILED),
+            TraceRecord(3L, null, totalMicros = 8_000_000L, stageMicros = emptyMap(), outcome = TraceOutcome.CANCELLED)
+        )
+
+        val summary = TraceSummary.of(records)
+
+        assertEquals(3, summary.count)
+        assertEquals(1, summary.failed)
+        assertEquals(1, summary.cancelled)
+        assertEquals(Percentiles(200L, 8_000_000L), summary.total)
+    }
+}
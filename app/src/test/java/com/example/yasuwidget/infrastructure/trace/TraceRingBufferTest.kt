@@ -0,0 +1,86 @@
+package com.example.yasuwidget.infrastructure.trace
+
+import org.junit.Assert.*
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+
+/**
+ * トレースのリングバッファのテスト
+ * - 追記したレコードを古い順に（更新の結果も含めて）読み出せる
+ * - 容量を超えたら最も古いレコードを上書きし、ファイルサイズは一定
+ * - 形式の違うファイルは空として扱い作り直す
+ */
+class TraceRingBufferTest {
+
+    @get:Rule
+    val tempFolder = TemporaryFolder()
+
+    private fun record(startedAt: Long, drift: Long? = null) = TraceRecord(
+        startedAtEpochMillis = startedAt,
+        alarmDriftMillis = drift,
+        totalMicros = 1_500L,
+        stageMicros = mapOf(TraceStage.TIMELINE to 20L, TraceStage.RENDER to 800L)
+    )
+
+    @Test
+    fun `追記したレコードを古い順に読み出せる`() {
+        val buffer = TraceRingBuffer(tempFolder.root.resolve("traces.bin"), capacity = 4)
+
+        buffer.append(record(1L, drift = 350L))
+        buffer.append(record(2L))
+
+        assertEquals(listOf(record(1L, drift = 350L), record(2L)), buffer.readAll())
+    }
+
+    @Test
+    fun `更新の結果を読み出せる`() {
+        val buffer = TraceRingBuffer(tempFolder.root.resolve("traces.bin"), capacity = 4)
+        val cancelled = record(1L).copy(outcome = TraceOutcome.CANCELLED)
+        val failed = record(2L).copy(outcome = TraceOutcome.FAILED)
+
+        buffer.append(cancelled)
+        buffer.append(failed)
+
+        assertEquals(listOf(cancelled, failed), buffer.readAll())
+    }
+
+    @Test
+    fun `容量を超えたら最も古いレコードから上書きする`() {
+        val file = tempFolder.root.resolve("traces.bin")
+        val buffer = TraceRingBuffer(file, capacity = 3)
+
+        buffer.append(record(1L))
+        val sizeAfterFirst = file.length()
+        (2L..5L).forEach { buffer.append(record(it)) }
+
+        assertEquals(listOf(3L, 4L, 5L), buffer.readAll().map { it.startedAtEpochMillis })
+        assertEquals(sizeAfterFirst, file.length())
+    }
+
+    @Test
+    fun `ファイルがなければ空`() {
+        val buffer = TraceRingBuffer(tempFolder.root.resolve("missing.bin"))
+        assertTrue(buffer.readAll().isEmpty())
+    }
+
+    @Test
+    fun `容量の違うファイルは空として扱い次の追記で作り直す`() {
+        val file = tempFolder.root.resolve("traces.bin")
+        TraceRingBuffer(file, capacity = 3).append(record(1L))
+
+        val resized = TraceRingBuffer(file, capacity = 5)
+        assertTrue(resized.readAll().isEmpty())
+
+        resized.append(record(2L))
+        assertEquals(listOf(record(2L)), resized.readAll())
+    }
+
+    @Test
+    fun `壊れたファイルは空として扱う`() {
+        val file = tempFolder.root.resolve("traces.bin")
+        file.writeBytes(ByteArray(8) { 0x7f })
+
+        assertTrue(TraceRingBuffer(file).readAll().isEmpty())
+    }
+}
@@ -0,0 +1,120 @@
+package com.example.yasuwidget.presentation
+
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DisplayMode
+import com.example.yasuwidget.domain.model.TrainSection
+import com.example.yasuwidget.domain.model.WidgetUiState
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertFalse
+import org.junit.Assert.assertNull
+import org.junit.Assert.assertNotNull
+import org.junit.Assert.assertTrue
+import org.junit.Test
+import java.time.LocalTime
+
+/**
+ * 描画指紋の差分判定テスト
+ *
+ * - 同一状態は差分なし（送信しない）
+ * - 残り分数だけが変わったら該当行のスロットのみ
+ * - 更新時刻の表示だけの変化は内容の変化として扱わない
+ * - 表示モード・行数が変わったらレイアウト変更（全体描画）
+ */
+class RenderFingerprintTest {
+
+    private fun state(
+        currentTime: LocalTime = LocalTime.of(7, 10),
+        mode: DisplayMode = DisplayMode.TRAIN_ONLY,
+        up: List<LocalTime> = listOf(LocalTime.of(7, 20), LocalTime.of(7, 35)),
+        lastUpdatedAtText: String = "更新 07:00"
+    ): WidgetUiState = WidgetUiState(
+        mode = mode,
+        headerTitle = "最寄:野洲駅",
+        train = TrainSection(
+            stationName = "野洲",
+            lineName = "琵琶湖線",
+            up = up.map { Departure(it, "米原行", trainType = "普通") },
+            down = emptyList()
+        ),
+        bus = null,
+        lastUpdatedAtText = lastUpdatedAtText,
+        statusMessage = null,
+        currentTime = currentTime
+    )
+
+    @Test
+    fun `同一状態は変更スロットなし`() {
+        val changed = RenderFingerprint.of(state()).changedSlots(RenderFingerprint.of(state()))
+        assertEquals(emptyList<RenderSlot>(), changed)
+    }
+
+    @Test
+    fun `分が進むと残り分数の行だけが変わる`() {
+        val previous = RenderFingerprint.of(state(currentTime = LocalTime.of(7, 10)))
+        val current = RenderFingerprint.of(state(currentTime = LocalTime.of(7, 11)))
+
+        assertEquals(
+            listOf(RenderSlot.TRAIN_UP_1, RenderSlot.TRAIN_UP_2),
+            current.changedSlots(previous)
+        )
+    }
+
+    @Test
+    fun `更新時刻の表示だけが変わると更新時刻のスロットのみで内容の変化なし`() {
+        val previous = RenderFingerprint.of(state(lastUpdatedAtText = "更新 07:00"))
+        val current = RenderFingerprint.of(state(lastUpdatedAtText = "更新 07:01"))
+
+        val changed = current.changedSlots(previous)
+        assertEquals(listOf(RenderSlot.LAST_UPDATED), changed)
+        assertFalse(current.hasContentChanges(changed!!))
+    }
+
+    @Test
+    fun `毎分の更新でヘッダーは変わらず残り分数の行と更新時刻だけが変わる`() {
+        val previous = RenderFingerprint.of(
+            state(currentTime = LocalTime.of(7, 10), lastUpdatedAtText = "更新 07:10")
+        )
+        val current = RenderFingerprint.of(
+            state(currentTime = LocalTime.of(7, 11), lastUpdatedAtText = "更新 07:11")
+        )
+
+        val changed = current.changedSlots(previous)
+        assertEquals(
+            listOf(RenderSlot.LAST_UPDATED, RenderSlot.TRAIN_UP_1, RenderSlot.TRAIN_UP_2),
+            changed
+        )
+        assertTrue(current.hasContentChanges(changed!!))
+    }
+
+    @Test
+    fun `表示モードが変わるとレイアウト変更`() {
+        val previous = RenderFingerprint.of(state(mode = DisplayMode.TRAIN_ONLY))
+        val current = RenderFingerprint.of(state(mode = DisplayMode.TRAIN_AND_BUS))
+
+        assertNull(current.changedSlots(previous))
+    }
+
+    @Test
+    fun `行数が変わるとレイアウト変更`() {
+        val previous = RenderFingerprint.of(state(up = listOf(LocalTime.of(7, 20), LocalTime.of(7, 35))))
+        val current = RenderFingerprint.of(state(up = listOf(LocalTime.of(7, 35))))
+
+        assertNull(current.changedSlots(previous))
+    }
+
+    @Test
+    fun `永続化した文字列から復元すると差分なし`() {
+        val fingerprint = RenderFingerprint.of(state())
+        val decoded = RenderFingerprint.decode(fingerprint.encode())
+
+        assertNotNull(decoded)
+        assertEquals(emptyList<RenderSlot>(), fingerprint.changedSlots(decoded!!))
+    }
+
+    @Test
+    fun `形式不正の文字列は復元しない`() {
+        assertNull(RenderFingerprint.decode(""))
+        assertNull(RenderFingerprint.decode("1:2,3"))
+        assertNull(RenderFingerprint.decode("x:" + List(RenderSlot.entries.size) { "0" }.joinToString(",")))
+    }
+}
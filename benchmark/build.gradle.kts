@@ -0,0 +1,305 @@
+import groovy.json.JsonOutput
+import groovy.json.JsonSlurper
+
+plugins {
+    alias(libs.plugins.kotlin.jvm)
+    alias(libs.plugins.kotlin.allopen)
+    alias(libs.plugins.kotlinx.benchmark)
+}
+
+/** benchmark でコンパイルする app のソースの場所 */
+val appSourceDir = file("../app/src/main/java")
+
+/**
+ * benchmark でコンパイルする app のソース（appSourceDir からの相対パス）
+ *
+ * app のうち Android に依存しない部分（ドメイン・アプリケーション層、時刻表・位置・計測の純Kotlin部分）。
+ * app 側でこれらが参照するファイルを追加・移動したらここも更新する。
+ * 列挙したファイルの有無と Android API への依存は checkSharedSources がコンパイル前に検査する。
+ */
+val sharedAppSources = listOf(
+    "com/example/yasuwidget/domain/**",
+    "com/example/yasuwidget/application/**",
+    "com/example/yasuwidget/infrastructure/location/LocationPolicy.kt",
+    "com/example/yasuwidget/infrastructure/location/LocationProvider.kt",
+    "com/example/yasuwidget/infrastructure/store/RefreshStateStore.kt",
+    "com/example/yasuwidget/infrastructure/time/TimeProvider.kt",
+    "com/example/yasuwidget/infrastructure/timetable/CompiledTrainTimetable.kt",
+    "com/example/yasuwidget/infrastructure/timetable/TimetableCache.kt",
+    "com/example/yasuwidget/infrastructure/timetable/TimetableCompiler.kt",
+    "com/example/yasuwidget/infrastructure/timetable/TimetableParser.kt",
+    "com/example/yasuwidget/infrastructure/timetable/TimetableSource.kt",
+    "com/example/yasuwidget/infrastructure/trace/StageTimer.kt",
+    "com/example/yasuwidget/infrastructure/trace/TraceRecord.kt"
+)
+
+kotlin {
+    jvmToolchain(17)
+
+    // app のソースをそのままコンパイルして計測する。assets の時刻表JSONはクラスパスから読む。
+    // include は全ソースディレクトリに効くので、benchmark 自身のソースも含める。
+    sourceSets.named("main") {
+        kotlin.srcDir(appSourceDir)
+        kotlin.include("com/example/yasuwidget/benchmark/**")
+        kotlin.include(sharedAppSources)
+        resources.srcDir("../app/src/main/assets")
+    }
+}
+
+/** JVM ではコンパイルできない参照（Android API・リソースクラス） */
+val androidReference = Regex("""^import\s+(android|androidx|com\.google\.android|com\.example\.yasuwidget\.R)\b.*""", RegexOption.MULTILINE)
+
+val checkSharedSources by tasks.registering {
+    group = "verification"
+    description = "sharedAppSources が存在し、Android API に依存していないことを確認する"
+    doLast {
+        val failures = mutableListOf<String>()
+        for (pattern in sharedAppSources) {
+            val files = fileTree(appSourceDir) { include(pattern) }.files
+            if (files.isEmpty()) {
+                failures += "$pattern: 該当するファイルがありません（移動・削除した場合は sharedAppSources を更新してください）"
+            }
+            for (file in files.sorted()) {
+                androidReference.find(file.readText())?.let {
+                    failures += "${file.relativeTo(appSourceDir)}: ${it.value.trim()}"
+                }
+            }
+        }
+        if (failures.isNotEmpty()) {
+            throw GradleException(
+                "benchmark で共有する app のソースが JVM でコンパイルできません:\n" + failures.joinToString("\n")
+            )
+        }
+    }
+}
+
+tasks.named("compileKotlin") {
+    dependsOn(checkSharedSources)
+}
+
+// JMH は @State クラスを継承して計測コードを生成するため final を外す
+allOpen {
+    annotation("org.openjdk.jmh.annotations.State")
+}
+
+dependencies {
+    implementation(libs.kotlinx.benchmark.runtime)
+    implementation(libs.jmh.core)
+    implementation(libs.kotlinx.coroutines.core)
+    implementation(libs.org.json)
+}
+
+benchmark {
+    targets {
+        register("main")
+    }
+    configurations {
+        // 定常状態（ウォーム）: ./gradlew -p benchmark mainBenchmark
+        named("main") {
+            exclude("ColdStartBenchmark")
+            warmups = 3
+            iterations = 3
+            iterationTime = 300
+            iterationTimeUnit = "ms"
+            reportFormat = "json"
+            advanced("jvmForks", 1)
+            advanced("jvmProfiler", "gc")
+        }
+        // 新しいJVMでの初回実行（コールド）: ./gradlew -p benchmark mainColdBenchmark
+        // 反復・フォーク数は ColdStartBenchmark のアノテーションに従う
+        register("cold") {
+            include("ColdStartBenchmark")
+            reportFormat = "json"
+            advanced("jvmProfiler", "gc")
+        }
+        // 動作確認用の短い実行: ./gradlew -p benchmark mainSmokeBenchmark
+        register("smoke") {
+            exclude("ColdStartBenchmark")
+            warmups = 1
+            iterations = 1
+            iterationTime = 200
+            iterationTimeUnit = "ms"
+            reportFormat = "json"
+            advanced("jvmForks", 1)
+        }
+    }
+}
+
+// --- ベースライン比較（CI） ---
+
+/**
+ * 比較基準のファイル（-PbenchmarkBaseline=<パス> で差し替え可能）
+ * CI では PR のベース側を同じランナーで計測した結果を渡す
+ */
+val baselineFile = providers.gradleProperty("benchmarkBaseline")
+    .map { file(it) }
+    .getOrElse(layout.projectDirectory.file("baseline.json").asFile)
+
+/** ベースラインと比較する設定（smoke は反復が少なく比較しない） */
+val baselineConfigurations = listOf("main", "cold")
+
+/**
+ * JMH の結果1件
+ * @property key ベンチマーク名とパラメーター（例: SelectBenchmark.select[serviceDay=WEEKDAY,...]）
+ */
+data class BenchmarkScore(
+    val key: String,
+    val score: Double,
+    val unit: String,
+    val allocBytesPerOp: Double?
+)
+
+/** 設定ごとの最新のレポート（reports/benchmarks/<設定>/<日時>/main.json） */
+fun latestReports(): List<File> = baselineConfigurations.mapNotNull { configuration ->
+    layout.buildDirectory.dir("reports/benchmarks/$configuration").get().asFile
+        .listFiles { file -> file.isDirectory }
+        ?.maxByOrNull { it.name }
+        ?.resolve("main.json")
+        ?.takeIf { it.exists() }
+}
+
+@Suppress("UNCHECKED_CAST")
+fun readResults(report: File): List<Map<String, Any?>> =
+    JsonSlurper().parse(report) as List<Map<String, Any?>>
+
+@Suppress("UNCHECKED_CAST")
+fun readScores(report: File): List<BenchmarkScore> = readResults(report).map { result ->
+    val method = (result["benchmark"] as String).split('.').takeLast(2).joinToString(".")
+    val params = (result["params"] as Map<String, Any?>?)
+        ?.toSortedMap()
+        ?.entries
+        ?.joinToString(",", "[", "]") { "${it.key}=${it.value}" }
+        .orEmpty()
+    val primary = result["primaryMetric"] as Map<String, Any?>
+    val secondary = result["secondaryMetrics"] as Map<String, Map<String, Any?>>? ?: emptyMap()
+    // JMH のバージョンにより "·gc.alloc.rate.norm" / "gc.alloc.rate.norm"
+    val alloc = secondary.entries
+        .firstOrNull { it.key.removePrefix("·") == "gc.alloc.rate.norm" }
+        ?.value?.get("score") as Number?
+    BenchmarkScore(
+        key = method + params,
+        score = (primary["score"] as Number).toDouble(),
+        unit = primary["scoreUnit"] as String,
+        allocBytesPerOp = alloc?.toDouble()
+    )
+}
+
+fun collectScores(): List<BenchmarkScore> {
+    val reports = latestReports()
+    if (reports.isEmpty()) {
+        throw GradleException("ベンチマーク結果がありません。先に mainBenchmark / mainColdBenchmark を実行してください")
+    }
+    return reports.flatMap(::readScores)
+}
+
+/**
+ * 計測した環境（JVM はレポート、ハードウェアはこのビルドを実行したマシンから取る）
+ * 時間の比較は同じ環境で計測した baseline でなければ意味がないため、baseline に残す
+ */
+fun measuredEnvironment(): Map<String, Any?> {
+    val result = latestReports().firstOrNull()?.let(::readResults)?.firstOrNull().orEmpty()
+    val cpuInfo = File("/proc/cpuinfo").takeIf { it.canRead() }?.readLines().orEmpty()
+    val memInfo = File("/proc/meminfo").takeIf { it.canRead() }?.readLines().orEmpty()
+    return sortedMapOf(
+        "jdkVersion" to result["jdkVersion"],
+        "vmName" to result["vmName"],
+        "vmVersion" to result["vmVersion"],
+        "os" to "${System.getProperty("os.name")} ${System.getProperty("os.version")}",
+        "arch" to System.getProperty("os.arch"),
+        "processors" to Runtime.getRuntime().availableProcessors(),
+        "cpu" to cpuInfo.firstOrNull { it.startsWith("model name") }?.substringAfter(':')?.trim(),
+        "memory" to memInfo.firstOrNull { it.startsWith("MemTotal") }?.substringAfter(':')?.trim()
+    )
+}
+
+tasks.register("checkBenchmarkBaseline") {
+    group = "verification"
+    description = "最新のベンチマーク結果を baseline と比較し、許容幅を超えた時間・割り当てがあれば失敗する"
+    doLast {
+        // 見積もりの値では回帰を検出できないので、計測した baseline でなければ比較しない
+        if (!baselineFile.exists()) {
+            throw GradleException(
+                "${baselineFile.name} がありません。比較に使う環境で計測し updateBenchmarkBaseline で作成してください"
+            )
+        }
+        @Suppress("UNCHECKED_CAST")
+        val baseline = JsonSlurper().parse(baselineFile) as Map<String, Any?>
+        if (baseline["source"] != "measured") {
+            throw GradleException("${baselineFile.name} は計測値ではありません（source=${baseline["source"]}）")
+        }
+        val tolerance = (baseline["tolerance"] as Number).toDouble()
+        // 割り当ては実行ごとのぶれが小さいので、時間より狭い許容幅で比較する
+        val allocTolerance = (baseline["allocTolerance"] as Number?)?.toDouble() ?: tolerance
+        @Suppress("UNCHECKED_CAST")
+        val entries = baseline["benchmarks"] as Map<String, Map<String, Any?>>
+
+        val recorded = baseline["environment"] as Map<*, *>?
+        val current = measuredEnvironment()
+        val differs = listOf("jdkVersion", "vmName", "cpu", "processors")
+            .filter { recorded?.get(it)?.toString() != current[it]?.toString() }
+        if (differs.isNotEmpty()) {
+            logger.warn("baseline と計測環境が異なります（${differs.joinToString()}）。時間の比較は参考値です")
+        }
+
+        val failures = mutableListOf<String>()
+        for (score in collectScores()) {
+            // パラメーターの組み合わせごとに比較する（1駅・1時間帯の遅れが他の組み合わせに埋もれないように）
+            val entry = entries[score.key]
+            if (entry == null) {
+                logger.warn("baseline なし: ${score.key}")
+                continue
+            }
+            val unit = entry["unit"] as String
+            if (unit != score.unit) {
+                failures += "${score.key}: 単位が異なります（結果 ${score.unit} / baseline $unit）"
+                continue
+            }
+            val scoreLimit = (entry["score"] as Number).toDouble() * (1 + tolerance)
+            if (score.score > scoreLimit) {
+                failures += "${score.key}: ${"%.3f".format(score.score)} $unit > 上限 ${"%.3f".format(scoreLimit)} $unit"
+            }
+            val allocBudget = (entry["allocBytesPerOp"] as Number?)?.toDouble()
+            val alloc = score.allocBytesPerOp
+            if (allocBudget != null && alloc != null && alloc > allocBudget * (1 + allocTolerance)) {
+                failures += "${score.key}: 割り当て ${alloc.toLong()} B/op > 上限 ${(allocBudget * (1 + allocTolerance)).toLong()} B/op"
+            }
+        }
+
+        if (failures.isNotEmpty()) {
+            throw GradleException("ベンチマークが baseline を超えました:\n" + failures.joinToString("\n"))
+        }
+        logger.lifecycle(
+            "ベンチマークは baseline の範囲内です" +
+                "（時間 ${(tolerance * 100).toInt()}% / 割り当て ${(allocTolerance * 100).toInt()}%）"
+        )
+    }
+}
+
+tasks.register("updateBenchmarkBaseline") {
+    group = "verification"
+    description = "最新のベンチマーク結果と計測環境で baseline を書き換える（許容幅は維持する）"
+    doLast {
+        @Suppress("UNCHECKED_CAST")
+        val previous = baselineFile.takeIf { it.exists() }
+            ?.let { JsonSlurper().parse(it) as Map<String, Any?> }
+            .orEmpty()
+        val entries = collectScores().associate { score ->
+            score.key to buildMap<String, Any> {
+                put("score", score.score)
+                put("unit", score.unit)
+                score.allocBytesPerOp?.let { put("allocBytesPerOp", it.toLong()) }
+            }
+        }.toSortedMap()
+        val baseline = mapOf(
+            "description" to "checkBenchmarkBaseline の比較基準。" +
+                "score を (1 + tolerance) 倍、allocBytesPerOp を (1 + allocTolerance) 倍した値を上限とする",
+            "source" to "measured",
+            "tolerance" to (previous["tolerance"] ?: 0.3),
+            "allocTolerance" to (previous["allocTolerance"] ?: 0.1),
+            "environment" to measuredEnvironment(),
+            "benchmarks" to entries
+        )
+        baselineFile.writeText(JsonOutput.prettyPrint(JsonOutput.toJson(baseline)) + "\n")
+        logger.lifecycle("${baselineFile.name} を ${entries.size} 件で更新しました")
+    }
+}
@@ -0,0 +1,25 @@
+// APK のビルド（AGP）とは別の独立したビルド: ./gradlew -p benchmark <タスク>
+// ルートの settings に含めないので、assembleDebug は kotlin-jvm / kotlinx-benchmark を構成しない。
+pluginManagement {
+    repositories {
+        mavenCentral()
+        gradlePluginPortal()
+    }
+}
+plugins {
+    id("org.gradle.toolchains.foojay-resolver-convention") version "1.0.0"
+}
+dependencyResolutionManagement {
+    repositoriesMode.set(RepositoriesMode.FAIL_ON_PROJECT_REPOS)
+    repositories {
+        mavenCentral()
+    }
+    // バージョンは app と共通のカタログで管理する
+    versionCatalogs {
+        create("libs") {
+            from(files("../gradle/libs.versions.toml"))
+        }
+    }
+}
+
+rootProject.name = "YasuWidget-benchmark"
@@ -0,0 +1,179 @@
+package com.example.yasuwidget.benchmark
+
+import com.example.yasuwidget.domain.model.BusTimetable
+import com.example.yasuwidget.domain.model.Departure
+import com.example.yasuwidget.domain.model.DirectionTimetable
+import com.example.yasuwidget.domain.model.GeoPoint
+import com.example.yasuwidget.domain.model.LineTimetable
+import com.example.yasuwidget.domain.model.ServiceDay
+import com.example.yasuwidget.domain.model.TrainTimetable
+import com.example.yasuwidget.infrastructure.location.LocationFix
+import com.example.yasuwidget.infrastructure.location.LocationPriority
+import com.example.yasuwidget.infrastructure.location.LocationProvider
+import com.example.yasuwidget.infrastructure.store.RefreshStateStore
+import com.example.yasuwidget.infrastructure.time.TimeProvider
+import com.example.yasuwidget.infrastructure.timetable.CompiledTrainTimetable
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler
+import com.example.yasuwidget.infrastructure.timetable.TimetableIdentity
+import com.example.yasuwidget.infrastructure.timetable.TimetableParser
+import com.example.yasuwidget.infrastructure.timetable.TimetableSource
+import java.nio.ByteBuffer
+import java.time.LocalDate
+import java.time.LocalDateTime
+import java.time.LocalTime
+import java.time.ZoneOffset
+
+/**
+ * ベンチマーク共通の入力データと差し替え実装
+ *
+ * 時刻表はアプリ同梱の assets（クラスパス上の train_timetable.json / bus_timetable.json）を使う。
+ */
+object BenchmarkFixtures {
+
+    /** 平日の運行日（水曜） */
+    private val WEEKDAY_SERVICE_DATE = LocalDate.of(2024, 1, 10)
+
+    /** 休日の運行日（土曜） */
+    private val HOLIDAY_SERVICE_DATE = LocalDate.of(2024, 1, 13)
+
+    val trainJson: String by lazy { readResource("/train_timetable.json") }
+    val busJson: String by lazy { readResource("/bus_timetable.json") }
+
+    fun readResource(path: String): String {
+        val stream = BenchmarkFixtures::class.java.getResourceAsStream(path)
+            ?: throw IllegalStateException("リソースがありません: $path")
+        return stream.bufferedReader().use { it.readText() }
+    }
+
+    /**
+     * 曜日種別と時間帯に対応する日時
+     * 深夜（3:00 より前）は運行日の翌日の日付になる
+     */
+    fun dateTimeOf(serviceDay: ServiceDay, timeOfDay: TimeOfDay): LocalDateTime {
+        val serviceDate = when (serviceDay) {
+            ServiceDay.WEEKDAY -> WEEKDAY_SERVICE_DATE
+            ServiceDay.HOLIDAY -> HOLIDAY_SERVICE_DATE
+        }
+        val date = if (timeOfDay.isAfterMidnight) serviceDate.plusDays(1) else serviceDate
+        return date.atTime(timeOfDay.time)
+    }
+
+    /**
+     * 駅を scale 倍に複製した電車時刻表（路線網の拡大を模す）
+     * 元の駅IDはそのまま残し、複製には "<駅ID>#<番号>" を付ける
+     */
+    fun scaleStations(timetable: TrainTimetable, scale: Int): TrainTimetable {
+        val stations = LinkedHashMap(timetable.stations)
+        for (copy in 1 until scale) {
+            timetable.stations.forEach { (id, station) -> stations["$id#$copy"] = station }
+        }
+        return TrainTimetable(stations)
+    }
+
+    /**
+     * 各便を scale 倍に複製した路線（運転本数の増加を模す）
+     * 複製した便は行先を変え、同じ分に scale 本が並ぶようにする
+     */
+    fun densify(line: LineTimetable, scale: Int): LineTimetable = line.copy(
+        up = densify(line.up, scale),
+        down = densify(line.down, scale)
+    )
+
+    private fun densify(timetable: DirectionTimetable, scale: Int): DirectionTimetable =
+        DirectionTimetable(
+            weekday = densify(timetable.weekday, scale),
+            holiday = densify(timetable.holiday, scale)
+        )
+
+    private fun densify(departures: List<Departure>, scale: Int): List<Departure> =
+        departures.flatMap { departure ->
+            List(scale) { copy ->
+                if (copy == 0) departure else departure.copy(destination = "${departure.destination}$copy")
+            }
+        }
+}
+
+/**
+ * 計測する時間帯
+ * @property isAfterMidnight true なら前日の運行日の続き（0時台の深夜便が対象）
+ */
+enum class TimeOfDay(val time: LocalTime, val isAfterMidnight: Boolean) {
+    /** 始発前後 */
+    EARLY_MORNING(LocalTime.of(5, 10), false),
+    /** 朝の通勤時間帯 */
+    PEAK(LocalTime.of(7, 45), false),
+    /** 終電前後（0時台の便と翌運行日の始発を跨ぐ） */
+    LATE_NIGHT(LocalTime.of(0, 20), true)
+}
+
+/**
+ * 固定時刻の TimeProvider（JST）
+ */
+class FixedTimeProvider(var now: LocalDateTime) : TimeProvider {
+    override fun now(): LocalDateTime = now
+    override fun currentDate(): LocalDate = now.toLocalDate()
+    override fun currentTime(): LocalTime = now.toLocalTime()
+    override fun currentEpochMillis(): Long = now.toInstant(ZoneOffset.ofHours(9)).toEpochMilli()
+}
+
+/**
+ * 常に同じ位置を返す LocationProvider
+ * 直近の位置が新しく精度も十分なので、LocationPolicy は能動的な取得を行わない
+ */
+class FixedLocationProvider(var point: GeoPoint) : LocationProvider {
+    override suspend fun lastKnownFix(): LocationFix =
+        LocationFix(point, accuracyMeters = 20.0, ageMillis = 10_000L)
+
+    override suspend fun requestFix(priority: LocationPriority, timeoutMillis: Long): LocationFix =
+        LocationFix(point, accuracyMeters = 20.0, ageMillis = 0L)
+}
+
+/**
+ * メモリ上の RefreshStateStore
+ */
+class InMemoryStateStore(override var pinnedStationId: String? = null) : RefreshStateStore {
+    override var lastUpdatedAtEpochMillis: Long = 0L
+    private var cachedLatitude: Double? = null
+    private var cachedLongitude: Double? = null
+    private var cachedAtEpochMillis: Long? = null
+
+    override fun getCachedLatitude(): Double? = cachedLatitude
+    override fun getCachedLongitude(): Double? = cachedLongitude
+    override fun getCachedAtEpochMillis(): Long? = cachedAtEpochMillis
+
+    override fun cacheLocation(lat: Double, lon: Double, atEpochMillis: Long) {
+        cachedLatitude = lat
+        cachedLongitude = lon
+        cachedAtEpochMillis = atEpochMillis
+    }
+}
+
+/**
+ * メモリ上の時刻表JSONを供給する TimetableSource
+ *
+ * 端末では初回にコンパイルしたファイルを以降はメモリマップで開くので、
+ * コンパイル結果は初回だけ作って保持する（ファイルの代わり）。
+ */
+class InMemoryTimetableSource(
+    private val trainJson: String,
+    private val busJson: String
+) : TimetableSource {
+
+    private var compiled: ByteArray? = null
+
+    override fun trainTimetableIdentity(): TimetableIdentity = TimetableIdentity.InternalFile(
+        sizeBytes = trainJson.length.toLong(),
+        lastModifiedMillis = 0L,
+        contentHash = trainJson.hashCode().toLong()
+    )
+
+    override fun loadCompiledTrainTimetable(identity: TimetableIdentity): CompiledTrainTimetable {
+        val bytes = compiled ?: TimetableCompiler.compileTrainTimetable(trainJson, identity.stamp)
+            .also { compiled = it }
+        return CompiledTrainTimetable(ByteBuffer.wrap(bytes))
+    }
+
+    override fun busTimetableIdentity(): TimetableIdentity = TimetableIdentity.Asset(apkVersion = 1)
+
+    override fun loadBusTimetable(): BusTimetable = TimetableParser.parseBusTimetable(busJson)
+}
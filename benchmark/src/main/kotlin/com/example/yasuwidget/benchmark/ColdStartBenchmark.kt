@@ -0,0 +1,66 @@
+package com.example.yasuwidget.benchmark
+
+import com.example.yasuwidget.application.RefreshWidgetUseCase
+import com.example.yasuwidget.application.RenderTimelineHolder
+import com.example.yasuwidget.domain.constants.LocationConstants
+import com.example.yasuwidget.domain.model.ServiceDay
+import com.example.yasuwidget.domain.model.TrainTimetable
+import com.example.yasuwidget.domain.model.WidgetUiState
+import com.example.yasuwidget.infrastructure.location.LocationPolicy
+import com.example.yasuwidget.infrastructure.timetable.TimetableCache
+import com.example.yasuwidget.infrastructure.timetable.TimetableParser
+import kotlinx.coroutines.runBlocking
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.BenchmarkMode
+import org.openjdk.jmh.annotations.Fork
+import org.openjdk.jmh.annotations.Measurement
+import org.openjdk.jmh.annotations.Mode
+import org.openjdk.jmh.annotations.OutputTimeUnit
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.annotations.Warmup
+import java.util.concurrent.TimeUnit
+
+/**
+ * 新しいJVMでの初回実行のコスト（プロセス起動直後の更新を模す）
+ *
+ * フォークごとに1回だけ実行し、クラスロード・JIT前の実行・時刻表のコンパイルを含めて計測する。
+ * 時刻表JSONの読み出し（I/O）は Setup で済ませ、計測に含めない。
+ * 定常状態の値は RefreshPipelineBenchmark / TimetableParseBenchmark と比較する。
+ */
+@State(Scope.Thread)
+@BenchmarkMode(Mode.SingleShotTime)
+@OutputTimeUnit(TimeUnit.MILLISECONDS)
+@Warmup(iterations = 0)
+@Measurement(iterations = 1)
+@Fork(10)
+class ColdStartBenchmark {
+
+    private lateinit var trainJson: String
+    private lateinit var busJson: String
+
+    @Setup
+    fun setUp() {
+        trainJson = BenchmarkFixtures.trainJson
+        busJson = BenchmarkFixtures.busJson
+    }
+
+    /** 初回の更新（時刻表のコンパイル・バス時刻表のパースを含む） */
+    @Benchmark
+    fun firstRefresh(): WidgetUiState {
+        val yasu = LocationConstants.TOKAIDO_STATIONS.first { it.id == "Yasu" }
+        val useCase = RefreshWidgetUseCase(
+            timeProvider = FixedTimeProvider(BenchmarkFixtures.dateTimeOf(ServiceDay.WEEKDAY, TimeOfDay.PEAK)),
+            locationPolicy = LocationPolicy(FixedLocationProvider(yasu.location)),
+            timetableCache = TimetableCache(InMemoryTimetableSource(trainJson, busJson)),
+            stateStore = InMemoryStateStore(),
+            timelineHolder = RenderTimelineHolder()
+        )
+        return runBlocking { useCase.execute() }
+    }
+
+    /** 初回の電車時刻表JSONのパース */
+    @Benchmark
+    fun firstParse(): TrainTimetable = TimetableParser.parseTrainTimetable(trainJson)
+}
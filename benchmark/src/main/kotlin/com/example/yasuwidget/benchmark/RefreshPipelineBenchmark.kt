@@ -0,0 +1,70 @@
+package com.example.yasuwidget.benchmark
+
+import com.example.yasuwidget.application.RefreshWidgetUseCase
+import com.example.yasuwidget.application.RenderTimelineHolder
+import com.example.yasuwidget.domain.constants.LocationConstants
+import com.example.yasuwidget.domain.model.ServiceDay
+import com.example.yasuwidget.domain.model.WidgetUiState
+import com.example.yasuwidget.infrastructure.location.LocationPolicy
+import com.example.yasuwidget.infrastructure.timetable.TimetableCache
+import kotlinx.coroutines.runBlocking
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.BenchmarkMode
+import org.openjdk.jmh.annotations.Mode
+import org.openjdk.jmh.annotations.OutputTimeUnit
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import java.util.concurrent.TimeUnit
+
+/**
+ * 更新1回の通しのコスト（SYS-REQ-040〜044, NFR-001: 1回の更新 50ms 以内）
+ *
+ * 時刻・位置・状態の保存先・時刻表の供給元を差し替えた RefreshWidgetUseCase.execute() を計測する。
+ * 時刻表キャッシュは Setup で読込済み（プロセス常駐中の定常状態）。
+ * - recompute: 手動更新（位置取得・判定・先読み60分ぶんのスナップショット構築）
+ * - timelineTick: 自動更新（先読み済みタイムラインの再利用）
+ *
+ * execute() は suspend 関数のため runBlocking のコスト（数µs）を含む。
+ * 新しいJVMでの初回実行は ColdStartBenchmark で計測する。
+ */
+@State(Scope.Thread)
+@BenchmarkMode(Mode.AverageTime)
+@OutputTimeUnit(TimeUnit.MICROSECONDS)
+class RefreshPipelineBenchmark {
+
+    /** 現在地とする駅（野洲は電車とバスの両方を表示する） */
+    @Param("Kyoto", "Kusatsu", "Yasu")
+    lateinit var stationId: String
+
+    @Param("WEEKDAY", "HOLIDAY")
+    lateinit var serviceDay: ServiceDay
+
+    @Param("EARLY_MORNING", "PEAK", "LATE_NIGHT")
+    lateinit var timeOfDay: TimeOfDay
+
+    private lateinit var useCase: RefreshWidgetUseCase
+
+    @Setup
+    fun setUp() {
+        val station = LocationConstants.TOKAIDO_STATIONS.first { it.id == stationId }
+        val source = InMemoryTimetableSource(BenchmarkFixtures.trainJson, BenchmarkFixtures.busJson)
+        useCase = RefreshWidgetUseCase(
+            timeProvider = FixedTimeProvider(BenchmarkFixtures.dateTimeOf(serviceDay, timeOfDay)),
+            locationPolicy = LocationPolicy(FixedLocationProvider(station.location)),
+            timetableCache = TimetableCache(source),
+            stateStore = InMemoryStateStore(),
+            timelineHolder = RenderTimelineHolder()
+        )
+        // 時刻表キャッシュとタイムラインを用意する
+        val state = runBlocking { useCase.execute(forceRecompute = true) }
+        check(state.statusMessage == null) { "初回更新に失敗しました: ${state.statusMessage}" }
+    }
+
+    @Benchmark
+    fun recompute(): WidgetUiState = runBlocking { useCase.execute(forceRecompute = true) }
+
+    @Benchmark
+    fun timelineTick(): WidgetUiState = runBlocking { useCase.execute() }
+}
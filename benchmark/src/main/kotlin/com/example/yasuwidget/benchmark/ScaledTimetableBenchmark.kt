@@ -0,0 +1,78 @@
+package com.example.yasuwidget.benchmark
+
+import com.example.yasuwidget.domain.model.DepartureIndex
+import com.example.yasuwidget.domain.model.LineTimetable
+import com.example.yasuwidget.domain.model.ServiceDay
+import com.example.yasuwidget.domain.model.StationTimetable
+import com.example.yasuwidget.domain.model.TrainTimetable
+import com.example.yasuwidget.domain.service.NextDeparturesSelector
+import com.example.yasuwidget.infrastructure.timetable.CompiledTrainTimetable
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler
+import com.example.yasuwidget.infrastructure.timetable.TimetableParser
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.BenchmarkMode
+import org.openjdk.jmh.annotations.Mode
+import org.openjdk.jmh.annotations.OutputTimeUnit
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.infra.Blackhole
+import java.nio.ByteBuffer
+import java.time.LocalDateTime
+import java.util.concurrent.TimeUnit
+
+/**
+ * 時刻表の規模に対するコストの伸び
+ *
+ * 同梱の時刻表を scale 倍に拡大した合成データで計測する:
+ * - 駅数を scale 倍（路線網の拡大）: コンパイル、コンパイル済み形式を開いて1駅をデコード
+ * - 1駅の便数を scale 倍（運転本数の増加）: 発車インデックスの構築、次便抽出
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.AverageTime)
+@OutputTimeUnit(TimeUnit.MICROSECONDS)
+class ScaledTimetableBenchmark {
+
+    companion object {
+        private const val COUNT = 3
+    }
+
+    @Param("1", "10", "100")
+    var scale: Int = 1
+
+    private lateinit var network: TrainTimetable
+    private lateinit var compiled: ByteArray
+    private lateinit var lastStationId: String
+    private lateinit var denseLine: LineTimetable
+    private lateinit var now: LocalDateTime
+
+    @Setup
+    fun setUp() {
+        val timetable = TimetableParser.parseTrainTimetable(BenchmarkFixtures.trainJson)
+        network = BenchmarkFixtures.scaleStations(timetable, scale)
+        compiled = TimetableCompiler.compileTrainTimetable(network, sourceStamp = 1L)
+        // 駅表の末尾の駅（駅IDの検索が最も遠い）
+        lastStationId = network.stations.keys.last()
+
+        denseLine = BenchmarkFixtures.densify(timetable.stations.getValue("Yasu").lines.values.first(), scale)
+        denseLine.up.index(ServiceDay.WEEKDAY)
+        denseLine.up.index(ServiceDay.HOLIDAY)
+        now = BenchmarkFixtures.dateTimeOf(ServiceDay.WEEKDAY, TimeOfDay.PEAK)
+    }
+
+    @Benchmark
+    fun compileNetwork(): ByteArray = TimetableCompiler.compileTrainTimetable(network, sourceStamp = 1L)
+
+    @Benchmark
+    fun openAndLoadStation(): StationTimetable? =
+        CompiledTrainTimetable(ByteBuffer.wrap(compiled)).loadStation(lastStationId)
+
+    @Benchmark
+    fun buildDenseIndex(): DepartureIndex = DepartureIndex.build(denseLine.up.weekday)
+
+    @Benchmark
+    fun selectDense(blackhole: Blackhole) {
+        blackhole.consume(NextDeparturesSelector.selectAcrossServiceDays(denseLine.up, now, COUNT))
+    }
+}
@@ -0,0 +1,80 @@
+package com.example.yasuwidget.benchmark
+
+import com.example.yasuwidget.domain.model.DirectionTimetable
+import com.example.yasuwidget.domain.model.ServiceDay
+import com.example.yasuwidget.domain.service.NextDeparturesSelector
+import com.example.yasuwidget.infrastructure.timetable.TimetableParser
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.BenchmarkMode
+import org.openjdk.jmh.annotations.Mode
+import org.openjdk.jmh.annotations.OutputTimeUnit
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.infra.Blackhole
+import java.time.LocalDateTime
+import java.time.LocalTime
+import java.util.concurrent.TimeUnit
+
+/**
+ * 次便抽出のコスト（SYS-REQ-001/002/003）
+ *
+ * 全駅 × 平日/休日 × 時間帯（始発前後・朝・0時台の深夜）の組み合わせで、その駅の全路線・上下の両方向を計測する。
+ * 発車インデックスは Setup で構築済み（更新ごとの定常状態）。
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.AverageTime)
+@OutputTimeUnit(TimeUnit.MICROSECONDS)
+class SelectBenchmark {
+
+    companion object {
+        private const val COUNT = 3
+    }
+
+    @Param(
+        "Nagaokakyo", "Mukomachi", "Katsuragawa", "NishiOji", "Kyoto",
+        "Yamashina", "Otsu", "Zeze", "Ishiyama", "Seta",
+        "MinamiKusatsu", "Kusatsu", "Ritto", "Moriyama", "Yasu"
+    )
+    lateinit var stationId: String
+
+    @Param("WEEKDAY", "HOLIDAY")
+    lateinit var serviceDay: ServiceDay
+
+    @Param("EARLY_MORNING", "PEAK", "LATE_NIGHT")
+    lateinit var timeOfDay: TimeOfDay
+
+    /** 駅の全路線の上り・下り */
+    private lateinit var directions: List<DirectionTimetable>
+    private lateinit var now: LocalDateTime
+    private lateinit var currentTime: LocalTime
+
+    @Setup
+    fun setUp() {
+        val timetable = TimetableParser.parseTrainTimetable(BenchmarkFixtures.trainJson)
+        directions = timetable.stations.getValue(stationId).lines.values.flatMap { listOf(it.up, it.down) }
+        now = BenchmarkFixtures.dateTimeOf(serviceDay, timeOfDay)
+        currentTime = now.toLocalTime()
+        // インデックスを構築しておく
+        for (direction in directions) {
+            for (day in ServiceDay.entries) direction.index(day)
+        }
+    }
+
+    /** 1運行日内の次便（全路線・上下） */
+    @Benchmark
+    fun select(blackhole: Blackhole) {
+        for (direction in directions) {
+            blackhole.consume(NextDeparturesSelector.select(direction, serviceDay, currentTime, COUNT))
+        }
+    }
+
+    /** 運行日を跨ぐ次便（全路線・上下、Widget 1分ぶん） */
+    @Benchmark
+    fun selectAcrossServiceDays(blackhole: Blackhole) {
+        for (direction in directions) {
+            blackhole.consume(NextDeparturesSelector.selectAcrossServiceDays(direction, now, COUNT))
+        }
+    }
+}
@@ -0,0 +1,64 @@
+package com.example.yasuwidget.benchmark
+
+import com.example.yasuwidget.domain.model.BusTimetable
+import com.example.yasuwidget.domain.model.DepartureIndex
+import com.example.yasuwidget.domain.model.StationTimetable
+import com.example.yasuwidget.domain.model.TrainTimetable
+import com.example.yasuwidget.infrastructure.timetable.CompiledTrainTimetable
+import com.example.yasuwidget.infrastructure.timetable.TimetableCompiler
+import com.example.yasuwidget.infrastructure.timetable.TimetableParser
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.BenchmarkMode
+import org.openjdk.jmh.annotations.Mode
+import org.openjdk.jmh.annotations.OutputTimeUnit
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import java.nio.ByteBuffer
+import java.util.concurrent.TimeUnit
+
+/**
+ * 時刻表の読込コスト（DATA-REQ-001/002）
+ *
+ * - 同梱JSON（電車 約1MB・バス）のパース
+ * - バイナリ形式へのコンパイル（初回・時刻表差し替え時）
+ * - コンパイル済み形式を開いて1駅をデコード（更新ごとのキャッシュミス時）
+ * - 発車インデックスの構築（1方向・1曜日種別）
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.AverageTime)
+@OutputTimeUnit(TimeUnit.MICROSECONDS)
+class TimetableParseBenchmark {
+
+    private lateinit var trainJson: String
+    private lateinit var busJson: String
+    private lateinit var timetable: TrainTimetable
+    private lateinit var compiled: ByteArray
+
+    @Setup
+    fun setUp() {
+        trainJson = BenchmarkFixtures.trainJson
+        busJson = BenchmarkFixtures.busJson
+        timetable = TimetableParser.parseTrainTimetable(trainJson)
+        compiled = TimetableCompiler.compileTrainTimetable(timetable, sourceStamp = 1L)
+    }
+
+    @Benchmark
+    fun parseTrainTimetable(): TrainTimetable = TimetableParser.parseTrainTimetable(trainJson)
+
+    @Benchmark
+    fun parseBusTimetable(): BusTimetable = TimetableParser.parseBusTimetable(busJson)
+
+    @Benchmark
+    fun compileTrainTimetable(): ByteArray = TimetableCompiler.compileTrainTimetable(trainJson, sourceStamp = 1L)
+
+    @Benchmark
+    fun openAndLoadStation(): StationTimetable? =
+        CompiledTrainTimetable(ByteBuffer.wrap(compiled)).loadStation("Yasu")
+
+    @Benchmark
+    fun buildDepartureIndex(): DepartureIndex {
+        val line = timetable.stations.getValue("Yasu").lines.values.first()
+        return DepartureIndex.build(line.up.weekday)
+    }
+}